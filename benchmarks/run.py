@@ -0,0 +1,121 @@
+"""
+Run the scaling benchmarks.
+
+    python -m benchmarks.run --sizes 100,1000 --output results.json
+    python -m benchmarks.run --sizes 100,1000 --baseline results.json --threshold 0.25
+
+Exits with a non-zero status if any phase regressed by more than the threshold compared to the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable
+
+from benchmarks.synthetic import generate_types
+from typtyp.extractors import default_struct_extractors
+from typtyp.typescript import get_struct_types, write_ts
+from typtyp.world import World
+
+SIZES = (100, 1_000, 10_000, 50_000)
+PHASES = ("add_many", "get_struct_types", "write_ts")
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_benchmark(
+    size: int,
+    *,
+    seed: int = 0,
+    kinds: tuple[str, ...] | None = None,
+    repeat: int = 3,
+) -> dict[str, float]:
+    """
+    Time each phase for a synthetic world of `size` types; returns the best time (in seconds) of each phase.
+    """
+    types = generate_types(size, seed=seed, kinds=kinds)
+    struct_types = [typ for typ in types if default_struct_extractors.is_struct(typ)]
+    best = dict.fromkeys(PHASES, float("inf"))
+    for _ in range(repeat):
+        world = World()
+        # DRF serializer fields are cached per class, which would hide their cost in repeated runs
+        world.clear_caches()
+        timings = {
+            "add_many": _timed(lambda: world.add_many(types)),
+            "get_struct_types": _timed(lambda: [list(get_struct_types(typ)) for typ in struct_types]),
+        }
+        # Introspect the world's types beforehand, so only rendering is timed below
+        for type_info in world:
+            world.get_struct_fields(type_info.type)
+        timings["write_ts"] = _timed(lambda: write_ts(io.StringIO(), world))
+        for phase, timing in timings.items():
+            best[phase] = min(best[phase], timing)
+    return best
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    *,
+    threshold: float,
+    min_seconds: float = 0.01,
+) -> list[str]:
+    """
+    Compare results to a baseline; returns descriptions of phases that were slower by more than `threshold`.
+
+    Phases taking less than `min_seconds` in both runs are too noisy to compare, and are ignored.
+    """
+    regressions = []
+    for size, timings in results.items():
+        for phase, timing in timings.items():
+            base = baseline.get(size, {}).get(phase)
+            if base is None or max(base, timing) < min_seconds:
+                continue
+            if timing > base * (1 + threshold):
+                regressions.append(
+                    f"{phase} @ {size}: {timing:.4f}s vs. baseline {base:.4f}s (+{timing / base - 1:.0%})",
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Run typtyp scaling benchmarks.")
+    ap.add_argument("--sizes", default=",".join(str(size) for size in SIZES[:3]), help="comma-separated world sizes")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--kinds", help="comma-separated kinds of types to generate (default: all available)")
+    ap.add_argument("--repeat", type=int, default=3, help="repeat each benchmark this many times; best time is used")
+    ap.add_argument("--output", help="write results to this JSON file")
+    ap.add_argument("--baseline", help="compare results to this JSON file")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown relative to baseline")
+    args = ap.parse_args(argv)
+
+    kinds = tuple(args.kinds.split(",")) if args.kinds else None
+    results: dict[str, dict[str, float]] = {}
+    for size in (int(size) for size in args.sizes.split(",")):
+        results[str(size)] = timings = run_benchmark(size, seed=args.seed, kinds=kinds, repeat=args.repeat)
+        sys.stdout.write(f"{size:>6} types: " + ", ".join(f"{k} {v:.4f}s" for k, v in timings.items()) + "\n")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "seed": args.seed, "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        if regressions := find_regressions(results, baseline, threshold=args.threshold):
+            sys.stderr.write("Regressions:\n" + "".join(f"  {r}\n" for r in regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Deterministic generator for synthetic worlds of types, for benchmarking.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import enum
+import importlib.util
+import itertools
+import random
+import uuid
+from decimal import Decimal
+from typing import Any, Literal, TypedDict
+
+KINDS = ("dataclass", "typeddict", "pydantic", "django", "drf", "enum")
+
+# Kinds that need an optional dependency, and the module they need.
+KIND_REQUIREMENTS = {
+    "pydantic": "pydantic",
+    "django": "django",
+    "drf": "rest_framework",
+}
+
+# Kinds of types plain-Python types may refer to.
+# (Pydantic doesn't grok `typing.TypedDict` on all supported Python versions, even via a dataclass,
+# so Pydantic models only refer to a subset.)
+PYDANTIC_REFERRABLE_KINDS = ("pydantic", "enum")
+REFERRABLE_KINDS = (*PYDANTIC_REFERRABLE_KINDS, "dataclass", "typeddict")
+
+SCALARS = (int, str, float, bool, uuid.UUID, datetime.datetime, datetime.date, Decimal)
+
+# Django models need an unique app label per generation, as model classes can't be re-registered.
+_django_app_counter = itertools.count()
+
+
+def get_available_kinds() -> tuple[str, ...]:
+    return tuple(
+        kind
+        for kind in KINDS
+        if kind not in KIND_REQUIREMENTS or importlib.util.find_spec(KIND_REQUIREMENTS[kind]) is not None
+    )
+
+
+def ensure_django() -> None:
+    """
+    Configure a minimal Django setup, unless Django is already configured.
+    """
+    import django
+    from django.conf import settings
+
+    if not settings.configured:
+        settings.configure(
+            INSTALLED_APPS=["django.contrib.auth", "django.contrib.contenttypes"],
+            DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
+        )
+        django.setup()
+
+
+class _Generator:
+    def __init__(self, *, seed: int, kinds: tuple[str, ...], max_depth: int, module: str) -> None:
+        self.rng = random.Random(seed)
+        self.kinds = kinds
+        self.max_depth = max_depth
+        self.module = module
+        self.types_by_kind: dict[str, list[type]] = {kind: [] for kind in kinds}
+        self.django_app_label = f"typtyp_bench_{next(_django_app_counter)}"
+
+    def pick_reference(self, kinds: tuple[str, ...]) -> type | None:
+        candidates = [kind for kind in kinds if self.types_by_kind.get(kind)]
+        if not candidates:
+            return None
+        # Prefer recently generated types, so the reference graph is deep rather than a star.
+        types = self.types_by_kind[self.rng.choice(candidates)]
+        return types[max(0, len(types) - 1 - int(self.rng.expovariate(0.1)))]
+
+    def make_annotation(self, ref_kinds: tuple[str, ...], depth: int = 0) -> Any:
+        roll = self.rng.random()
+        if depth >= self.max_depth or roll < 0.35:
+            return self.rng.choice(SCALARS)
+        if roll < 0.55 and (ref := self.pick_reference(ref_kinds)) is not None:
+            return ref
+        inner = self.make_annotation(ref_kinds, depth + 1)
+        shape = self.rng.randrange(6)
+        if shape == 0:
+            return list[inner]  # type: ignore[valid-type]
+        if shape == 1:
+            return dict[str, inner]  # type: ignore[valid-type]
+        if shape == 2:
+            return tuple[inner, ...]  # type: ignore[valid-type]
+        if shape == 3:
+            return tuple[inner, self.make_annotation(ref_kinds, depth + 1)]  # type: ignore[misc]
+        if shape == 4:
+            return Literal["a", "b", "c"] | inner
+        return inner | None
+
+    def make_fields(self, ref_kinds: tuple[str, ...]) -> list[tuple[str, Any]]:
+        return [(f"field_{i}", self.make_annotation(ref_kinds)) for i in range(self.rng.randint(3, 8))]
+
+    def make_dataclass(self, name: str) -> type:
+        typ = dataclasses.make_dataclass(name, self.make_fields(REFERRABLE_KINDS))
+        typ.__module__ = self.module
+        return typ
+
+    def make_typeddict(self, name: str) -> type:
+        typ = TypedDict(name, dict(self.make_fields(REFERRABLE_KINDS)))  # type: ignore[operator]
+        typ.__module__ = self.module
+        return typ
+
+    def make_pydantic(self, name: str) -> type:
+        from pydantic import create_model
+
+        fields = {name: (annotation, ...) for name, annotation in self.make_fields(PYDANTIC_REFERRABLE_KINDS)}
+        return create_model(name, __module__=self.module, **fields)  # type: ignore[call-overload]
+
+    def make_enum(self, name: str) -> type:
+        member_names = [f"MEMBER_{i}" for i in range(self.rng.randint(2, 10))]
+        enum_type: type[enum.Enum]
+        if self.rng.random() < 0.5:
+            enum_type = enum.Enum(name, [(n, n.lower()) for n in member_names], module=self.module)  # type: ignore[assignment]
+        else:
+            enum_type = enum.IntEnum(name, member_names, module=self.module)  # type: ignore[assignment]
+        if self.rng.random() < 0.5:
+            # (Read by typtyp per the default `enum_labels_field`.)
+            enum_type.Labels = {n: f"Label for {n.lower()}" for n in member_names}  # type: ignore[attr-defined]
+        return enum_type
+
+    def make_django(self, name: str) -> type:
+        from django.db import models
+
+        attrs: dict[str, Any] = {
+            "__module__": self.module,
+            "Meta": type("Meta", (), {"app_label": self.django_app_label}),
+        }
+        for i in range(self.rng.randint(3, 8)):
+            null = self.rng.random() < 0.3
+            roll = self.rng.randrange(8)
+            related = self.pick_reference(("django",))
+            if roll == 0 and related is not None:
+                field = models.ForeignKey(related, on_delete=models.CASCADE, related_name="+", null=null)
+            elif roll == 1 and related is not None:
+                field = models.ManyToManyField(related, related_name="+")
+            elif roll == 2:
+                field = models.CharField(max_length=10, choices=[("a", "A"), ("b", "B")], null=null)
+            else:
+                field = self.rng.choice(
+                    (
+                        lambda: models.CharField(max_length=100, null=null),
+                        lambda: models.IntegerField(null=null),
+                        lambda: models.DateTimeField(null=null),
+                        lambda: models.DecimalField(max_digits=10, decimal_places=2, null=null),
+                        lambda: models.UUIDField(null=null),
+                        lambda: models.BooleanField(null=null),
+                        lambda: models.TextField(null=null, help_text="Some text"),
+                    ),
+                )()
+            attrs[f"field_{i}"] = field
+        return type(name, (models.Model,), attrs)
+
+    def make_drf(self, name: str) -> type:
+        from rest_framework import serializers
+
+        attrs: dict[str, Any] = {"__module__": self.module}
+        for i in range(self.rng.randint(3, 8)):
+            roll = self.rng.randrange(8)
+            related = self.pick_reference(("drf",))
+            if roll == 0 and related is not None:
+                field = related()
+            elif roll == 1 and related is not None:
+                field = related(many=True)
+            elif roll == 2:
+                field = serializers.ChoiceField(choices=["x", "y", "z"])
+            elif roll == 3:
+                field = serializers.ListField(child=serializers.IntegerField())
+            elif roll == 4:
+                field = serializers.DictField(child=serializers.CharField())
+            else:
+                field = self.rng.choice(
+                    (
+                        lambda: serializers.CharField(),
+                        lambda: serializers.IntegerField(help_text="A number"),
+                        lambda: serializers.DateTimeField(),
+                        lambda: serializers.UUIDField(),
+                        lambda: serializers.BooleanField(),
+                    ),
+                )()
+            attrs[f"field_{i}"] = field
+        return type(name, (serializers.Serializer,), attrs)
+
+    def generate(self, count: int) -> list[type]:
+        types = []
+        for i in range(count):
+            kind = self.rng.choice(self.kinds)
+            typ = getattr(self, f"make_{kind}")(f"{kind.title()}{i:05d}")
+            self.types_by_kind[kind].append(typ)
+            types.append(typ)
+        return types
+
+
+def generate_types(
+    count: int,
+    *,
+    seed: int = 0,
+    kinds: tuple[str, ...] | None = None,
+    max_depth: int = 4,
+    module: str = "benchmarks.synthetic_types",
+) -> list[type]:
+    """
+    Generate `count` synthetic types of the given kinds (by default, all kinds whose dependencies are available).
+
+    The same arguments always generate the same types (as far as their TypeScript representation is concerned).
+    Types only refer to types generated before them, so the list is in dependency order.
+    """
+    if kinds is None:
+        kinds = get_available_kinds()
+    if unknown_kinds := set(kinds) - set(KINDS):
+        raise ValueError(f"Unknown kinds: {sorted(unknown_kinds)}")
+    if {"django", "drf"} & set(kinds):
+        ensure_django()
+    return _Generator(seed=seed, kinds=tuple(kinds), max_depth=max_depth, module=module).generate(count)
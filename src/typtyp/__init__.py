@@ -1,6 +1,15 @@
-from typtyp.field_info import FieldInfo, FieldInfoDict
-from typtyp.type_configuration import TypeConfiguration
-from typtyp.world import World
+from __future__ import annotations
+
+import importlib
+
+# (Not imported from `typing`, which is comparatively slow to import.)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from typtyp.field_info import FieldInfo, FieldInfoDict
+    from typtyp.type_configuration import TypeConfiguration
+    from typtyp.world import World
 
 __all__ = [
     "FieldInfo",
@@ -8,3 +17,25 @@ __all__ = [
     "TypeConfiguration",
     "World",
 ]
+
+# The public names are imported from their modules on first access,
+# so e.g. an `apps.py` importing typtyp doesn't pay for importing all of it.
+_LAZY_ATTRIBUTES = {
+    "FieldInfo": "typtyp.field_info",
+    "FieldInfoDict": "typtyp.field_info",
+    "TypeConfiguration": "typtyp.type_configuration",
+    "World": "typtyp.world",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = getattr(importlib.import_module(module_name), name)
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,5 @@
+import sys
+
+from typtyp.cli import main
+
+sys.exit(main())
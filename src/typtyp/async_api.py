@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import io
+import threading
+import weakref
+from collections.abc import AsyncIterator
+from typing import Any, Callable
+
+from typtyp.world import World
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+@dataclasses.dataclass
+class _AsyncState:
+    # Serializes generations for the world, since they share its caches
+    lock: threading.Lock = dataclasses.field(default_factory=threading.Lock)
+    # Generated outputs by argument key, valid as long as the world's version is `results_version`
+    results: dict[str, str] = dataclasses.field(default_factory=dict)
+    results_version: int = -1
+    # Generations in progress, by argument key
+    pending: dict[str, asyncio.Future[str]] = dataclasses.field(default_factory=dict)
+
+    def get_result(self, world: World, key: str) -> str | None:
+        if self.results_version != world._version:
+            self.results.clear()
+            self.results_version = world._version
+        return self.results.get(key)
+
+
+_states: weakref.WeakKeyDictionary[World, _AsyncState] = weakref.WeakKeyDictionary()
+
+
+def _get_state(world: World) -> _AsyncState:
+    if (state := _states.get(world)) is None:
+        state = _states[world] = _AsyncState()
+    return state
+
+
+_PLAIN_TYPES = (type(None), bool, int, float, str)
+
+
+def _get_key(write_ts_kwargs: dict[str, Any]) -> tuple[str, bool]:
+    """
+    Get a key for generation arguments, and whether the result for them may be cached.
+
+    Plain values (and containers and dataclasses of them) are keyed by value. Anything else, e.g. a function
+    (whose behavior may depend on its closure), is keyed by identity, which is only meaningful while the object
+    is alive, so such results aren't cached; concurrent generations with the same objects are still coalesced.
+    """
+    cacheable = True
+
+    def get_value_key(value: Any) -> str:
+        nonlocal cacheable
+        if isinstance(value, _PLAIN_TYPES):
+            return repr(value)
+        if isinstance(value, (list, tuple)):
+            return "[" + ", ".join(get_value_key(v) for v in value) + "]"
+        if isinstance(value, (set, frozenset)):
+            return "{" + ", ".join(sorted(get_value_key(v) for v in value)) + "}"
+        if isinstance(value, dict):
+            return "{" + ", ".join(f"{get_value_key(k)}: {get_value_key(v)}" for k, v in value.items()) + "}"
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            fields = ", ".join(f"{f.name}={get_value_key(getattr(value, f.name))}" for f in dataclasses.fields(value))
+            return f"{type(value).__qualname__}({fields})"
+        cacheable = False
+        return f"<{type(value).__qualname__} at {id(value):#x}>"
+
+    return get_value_key(sorted(write_ts_kwargs.items())), cacheable
+
+
+class _ChunkingWriter(io.StringIO):
+    """
+    A StringIO that also passes what's written to `on_chunk`, in chunks of at least `chunk_size` characters.
+    """
+
+    def __init__(self, on_chunk: Callable[[str], object], chunk_size: int) -> None:
+        super().__init__()
+        self._on_chunk = on_chunk
+        self._chunk_size = chunk_size
+        self._parts: list[str] = []
+        self._parts_size = 0
+
+    def write(self, s: str) -> int:
+        self._parts.append(s)
+        self._parts_size += len(s)
+        if self._parts_size >= self._chunk_size:
+            self.flush_chunk()
+        return super().write(s)
+
+    def flush_chunk(self) -> None:
+        if self._parts:
+            self._on_chunk("".join(self._parts))
+            self._parts.clear()
+            self._parts_size = 0
+
+
+def _generate(world: World, state: _AsyncState, write_ts_kwargs: dict[str, Any], fp: io.StringIO | None) -> str:
+    from typtyp.typescript import write_ts
+
+    with state.lock:
+        if fp is None:
+            return world.get_typescript(**write_ts_kwargs)
+        write_ts_kwargs.setdefault("fragment_cache", world.fragment_cache)
+        write_ts(fp, world, **write_ts_kwargs)
+        return fp.getvalue()
+
+
+def _start(
+    world: World,
+    key: str,
+    write_ts_kwargs: dict[str, Any],
+    *,
+    executor: concurrent.futures.Executor | None,
+    cacheable: bool,
+    fp: io.StringIO | None = None,
+) -> asyncio.Future[str]:
+    state = _get_state(world)
+    version = world._version
+    future = asyncio.get_running_loop().run_in_executor(executor, _generate, world, state, dict(write_ts_kwargs), fp)
+
+    def finish(future: asyncio.Future[str]) -> None:
+        if state.pending.get(key) is future:
+            del state.pending[key]
+        if cacheable and not future.cancelled() and future.exception() is None and world._version == version:
+            state.get_result(world, key)  # (clears stale results)
+            state.results[key] = future.result()
+
+    future.add_done_callback(finish)
+    state.pending[key] = future
+    return future
+
+
+async def aget_typescript(
+    world: World,
+    *,
+    executor: concurrent.futures.Executor | None = None,
+    **write_ts_kwargs,
+) -> str:
+    """
+    Generate TypeScript for the world (see `World.get_typescript`) in an executor (by default, the event loop's),
+    so the event loop isn't blocked.
+
+    Concurrent calls with identical arguments share a single generation. If the arguments are plain values
+    (e.g. options without functions), its result is also reused until the world's types change
+    (or `World.clear_caches` is called).
+    """
+    state = _get_state(world)
+    key, cacheable = _get_key(write_ts_kwargs)
+    if cacheable and (result := state.get_result(world, key)) is not None:
+        return result
+    future = state.pending.get(key) or _start(world, key, write_ts_kwargs, executor=executor, cacheable=cacheable)
+    # Shielded, so one caller being cancelled doesn't cancel the generation for the others
+    return await asyncio.shield(future)
+
+
+async def aiter_typescript(
+    world: World,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: concurrent.futures.Executor | None = None,
+    **write_ts_kwargs,
+) -> AsyncIterator[str]:
+    """
+    Like `aget_typescript`, but yield the output in chunks (of about `chunk_size` characters) as it's generated,
+    e.g. to stream it in a response.
+
+    If an identical generation is already in progress or done, its result is chunked instead.
+    """
+    state = _get_state(world)
+    key, cacheable = _get_key(write_ts_kwargs)
+    result = state.get_result(world, key) if cacheable else None
+    if result is None and (pending := state.pending.get(key)) is not None:
+        result = await asyncio.shield(pending)
+    if result is not None:
+        for start in range(0, len(result), chunk_size):
+            yield result[start : start + chunk_size]
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+    writer = _ChunkingWriter(lambda chunk: loop.call_soon_threadsafe(queue.put_nowait, chunk), chunk_size)
+    future = _start(world, key, write_ts_kwargs, executor=executor, cacheable=cacheable, fp=writer)
+
+    def flush(future: asyncio.Future[str]) -> None:
+        if not future.cancelled() and future.exception() is None:
+            writer.flush_chunk()  # (the executor is done with the writer, so this is safe here)
+        loop.call_soon(queue.put_nowait, None)  # after the chunks
+
+    future.add_done_callback(flush)
+    while (chunk := await queue.get()) is not None:
+        yield chunk
+    await future  # Raise any errors
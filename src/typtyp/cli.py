@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import importlib
+import os
+import pathlib
+import sys
+import time
+import tomllib
+from collections.abc import Iterable
+from typing import Any, Callable
+
+from typtyp.excs import ConfigError
+from typtyp.field_info import FieldInfo
+from typtyp.output import has_content, write_if_changed
+from typtyp.typescript import TypeScriptOptions
+from typtyp.world import World
+
+CONFIG_FILE_NAME = "pyproject.toml"
+
+# Options that can't be expressed in TOML.
+UNCONFIGURABLE_OPTIONS = {"order_by", "order_fields_by", "scalars"}
+
+
+def _is_bool(value: Any) -> bool:
+    return isinstance(value, bool)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_strings(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+# What the configurable options must be, and how to check for it.
+OPTION_TYPES: dict[str, tuple[str, Callable[[Any], bool]]] = {
+    "exported_types": ("a boolean or a list of strings", lambda value: _is_bool(value) or _is_strings(value)),
+    "translation_cache_size": ("an integer", _is_int),
+    "type_only_imports": ("a boolean", _is_bool),
+    "roots": ("a list of strings", _is_strings),
+    "hoist_min_occurrences": ("an integer", _is_int),
+    "hoist_min_length": ("an integer", _is_int),
+    "dependency_order": ("a boolean", _is_bool),
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class WorldConfig:
+    name: str
+    # Modules whose types are added (see `World.add_module`).
+    modules: tuple[str, ...] = ()
+    # Packages whose types are added (see `World.add_package`).
+    packages: tuple[str, ...] = ()
+    # Individual types to add, as `module:QualifiedName`.
+    types: tuple[str, ...] = ()
+    follow_references: bool = False
+    # Write the world into this file...
+    output: pathlib.Path | None = None
+    # ... or into one file per module in this directory (see `typtyp.multi_file`).
+    output_dir: pathlib.Path | None = None
+    options: TypeScriptOptions = dataclasses.field(default_factory=TypeScriptOptions)
+
+
+@dataclasses.dataclass(frozen=True)
+class Config:
+    path: pathlib.Path
+    worlds: tuple[WorldConfig, ...]
+    python_path: tuple[pathlib.Path, ...] = ()
+    django_settings: str | None = None
+    index_path: pathlib.Path | None = None
+    cache_dir: pathlib.Path | None = None
+
+
+def find_config(start: str | os.PathLike[str] = ".") -> pathlib.Path:
+    """
+    Find the nearest `pyproject.toml` with a `[tool.typtyp]` table in `start` or its parents.
+    """
+    start = pathlib.Path(start).resolve()
+    for directory in (start, *start.parents):
+        path = directory / CONFIG_FILE_NAME
+        if path.is_file() and "typtyp" in _read_toml(path).get("tool", {}):
+            return path
+    raise ConfigError(f"No {CONFIG_FILE_NAME} with a [tool.typtyp] table found in {start} or its parents")
+
+
+def _read_toml(path: pathlib.Path) -> dict[str, Any]:
+    try:
+        with path.open("rb") as f:
+            return tomllib.load(f)
+    except tomllib.TOMLDecodeError as exc:
+        raise ConfigError(f"{path}: {exc}") from exc
+
+
+def _get_strings(table: dict[str, Any], key: str, where: str) -> tuple[str, ...]:
+    value = table.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ConfigError(f"{where}: {key} must be a list of strings")
+    return tuple(value)
+
+
+def _get_bool(table: dict[str, Any], key: str, where: str) -> bool:
+    value = table.get(key, False)
+    if not _is_bool(value):
+        raise ConfigError(f"{where}: {key} must be a boolean")
+    return value
+
+
+def _get_path(table: dict[str, Any], key: str, where: str, base: pathlib.Path) -> pathlib.Path | None:
+    value = table.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ConfigError(f"{where}: {key} must be a string")
+    return base / value
+
+
+def parse_options(table: dict[str, Any], where: str) -> TypeScriptOptions:
+    fields = {field.name for field in dataclasses.fields(TypeScriptOptions)} - UNCONFIGURABLE_OPTIONS
+    if unknown := set(table) - fields:
+        raise ConfigError(f"{where}: unknown or unsupported options: {', '.join(sorted(unknown))}")
+    values = {}
+    for name, value in table.items():
+        description, check = OPTION_TYPES[name]
+        if not check(value):
+            raise ConfigError(f"{where}: {name} must be {description}")
+        if isinstance(value, list):
+            value = set(value)
+        values[name] = value
+    return TypeScriptOptions(**values)
+
+
+def parse_world_config(name: str, table: dict[str, Any], base: pathlib.Path) -> WorldConfig:
+    where = f"[tool.typtyp.worlds.{name}]"
+    known = {field.name for field in dataclasses.fields(WorldConfig)} - {"name"}
+    if unknown := set(table) - known:
+        raise ConfigError(f"{where}: unknown keys: {', '.join(sorted(unknown))}")
+    if ("output" in table) == ("output_dir" in table):
+        raise ConfigError(f"{where}: exactly one of output or output_dir must be set")
+    if not isinstance(options := table.get("options", {}), dict):
+        raise ConfigError(f"{where}: options must be a table")
+    return WorldConfig(
+        name=name,
+        modules=_get_strings(table, "modules", where),
+        packages=_get_strings(table, "packages", where),
+        types=_get_strings(table, "types", where),
+        follow_references=_get_bool(table, "follow_references", where),
+        output=_get_path(table, "output", where, base),
+        output_dir=_get_path(table, "output_dir", where, base),
+        options=parse_options(options, f"{where} options"),
+    )
+
+
+def load_config(path: str | os.PathLike[str]) -> Config:
+    """
+    Load the `[tool.typtyp]` table from a `pyproject.toml` file.
+
+    Relative paths in the configuration are relative to the file's directory.
+    """
+    path = pathlib.Path(path).resolve()
+    table = _read_toml(path).get("tool", {}).get("typtyp")
+    if table is None:
+        raise ConfigError(f"{path}: no [tool.typtyp] table")
+    worlds = table.get("worlds")
+    if not isinstance(worlds, dict) or not worlds:
+        raise ConfigError(f"{path}: [tool.typtyp.worlds] must declare at least one world")
+    base = path.parent
+    django_settings = table.get("django_settings")
+    if django_settings is not None and not isinstance(django_settings, str):
+        raise ConfigError(f"{path}: django_settings must be a string")
+    return Config(
+        path=path,
+        worlds=tuple(parse_world_config(name, world_table, base) for name, world_table in worlds.items()),
+        python_path=tuple(base / entry for entry in _get_strings(table, "python_path", "[tool.typtyp]") or (".",)),
+        django_settings=django_settings,
+        index_path=_get_path(table, "index", "[tool.typtyp]", base),
+        cache_dir=_get_path(table, "cache_dir", "[tool.typtyp]", base),
+    )
+
+
+def prepare_environment(config: Config) -> None:
+    """
+    Make the configured modules importable (and set up Django, if configured).
+    """
+    for entry in reversed(config.python_path):
+        if str(entry) not in sys.path:
+            sys.path.insert(0, str(entry))
+    if config.django_settings:
+        import django
+
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", config.django_settings)
+        django.setup()
+
+
+def _import_type(spec: str) -> type:
+    module_name, sep, qualname = spec.partition(":")
+    if not sep:
+        raise ConfigError(f"Type {spec!r} must be given as module:QualifiedName")
+    obj: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def build_world(
+    world_config: WorldConfig,
+    *,
+    introspection_cache: dict[Any, list[FieldInfo] | None] | None = None,
+    index_path: pathlib.Path | None = None,
+    incremental: bool = False,
+    read_only: bool = False,
+) -> World:
+    """
+    Build the world a world configuration describes.
+
+    If `read_only` is set, the discovery index (if any) is only read from.
+    """
+    world = World(incremental=incremental, introspection_cache=introspection_cache)
+    for module in world_config.modules:
+        world.add_module(module, follow_references=world_config.follow_references)
+    for package in world_config.packages:
+        world.add_package(
+            package,
+            index_path=index_path,
+            index_read_only=read_only,
+            follow_references=world_config.follow_references,
+        )
+    types = [_import_type(spec) for spec in world_config.types]
+    world.add_many(
+        [typ for typ in types if typ not in world._types_by_type],
+        follow_references=world_config.follow_references,
+    )
+    return world
+
+
+def render_world(world: World, world_config: WorldConfig, **write_ts_kwargs) -> dict[pathlib.Path, str]:
+    """
+    Render a world into the output file(s) it's configured to be written to, mapped to their content.
+    """
+    if world_config.output_dir is not None:
+        files = world.get_typescript_files(options=world_config.options)
+        return {world_config.output_dir / name: content for name, content in files.items()}
+    assert world_config.output is not None
+    return {world_config.output: world.get_typescript(options=world_config.options, **write_ts_kwargs)}
+
+
+def select_worlds(config: Config, world_names: Iterable[str] | None = None) -> tuple[WorldConfig, ...]:
+    if world_names is None:
+        return config.worlds
+    world_names = set(world_names)
+    if unknown := world_names - {wc.name for wc in config.worlds}:
+        raise ConfigError(f"Unknown worlds: {', '.join(sorted(unknown))}")
+    return tuple(wc for wc in config.worlds if wc.name in world_names)
+
+
+def generate(
+    config: Config,
+    *,
+    world_names: Iterable[str] | None = None,
+    read_only: bool = False,
+) -> dict[pathlib.Path, str]:
+    """
+    Build and render the configured worlds (or those named) in this process, mapping output files to their content.
+
+    Worlds share introspection results, so types common to several of them are only introspected once.
+    If `read_only` is set, caches are only read from, so nothing is written at all.
+    """
+    from typtyp.disk_cache import DiskCache
+
+    world_configs = select_worlds(config, world_names)
+    disk_cache = DiskCache(config.cache_dir, read_only=read_only) if config.cache_dir is not None else None
+    introspection_cache: dict[Any, list[FieldInfo] | None] = {}
+    outputs: dict[pathlib.Path, str] = {}
+    for world_config in world_configs:
+        world = build_world(
+            world_config,
+            introspection_cache=introspection_cache,
+            index_path=config.index_path,
+            read_only=read_only,
+        )
+        outputs.update(render_world(world, world_config, disk_cache=disk_cache))
+    return outputs
+
+
+def find_stale(outputs: dict[pathlib.Path, str]) -> list[pathlib.Path]:
+    """
+    Find the output files that don't exist or whose content differs from what would be generated.
+    """
+    return [path for path, content in outputs.items() if not has_content(path, content)]
+
+
+def display_path(path: pathlib.Path) -> str:
+    try:
+        return os.path.relpath(path)
+    except ValueError:  # On another drive on Windows
+        return str(path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="typtyp", description="Generate TypeScript for the worlds in [tool.typtyp].")
+    ap.add_argument("--config", help=f"configuration file (default: the nearest {CONFIG_FILE_NAME})")
+    ap.add_argument("--world", action="append", dest="worlds", help="only generate this world (may be repeated)")
+    ap.add_argument("--check", action="store_true", help="don't write anything; exit with 1 if any output is stale")
+    ap.add_argument("-q", "--quiet", action="store_true", help="don't list written files")
+    ap.add_argument("--watch", action="store_true", help="keep running, and regenerate outputs when sources change")
+    args = ap.parse_args(argv)
+
+    if args.watch:
+        return _watch(args)
+
+    try:
+        config = load_config(args.config or find_config())
+        prepare_environment(config)
+        outputs = generate(config, world_names=args.worlds, read_only=args.check)
+    except ConfigError as exc:
+        sys.stderr.write(f"typtyp: {exc}\n")
+        return 2
+
+    if args.check:
+        if stale := find_stale(outputs):
+            sys.stderr.write("".join(f"Out of date: {display_path(path)}\n" for path in stale))
+            return 1
+        return 0
+
+    for path, content in outputs.items():
+        if write_if_changed(path, content) and not args.quiet:
+            sys.stdout.write(f"Wrote {display_path(path)}\n")
+    return 0
+
+
+def _watch(args: argparse.Namespace) -> int:
+    from typtyp.watch import Watcher
+
+    def report(written: dict[pathlib.Path, bool], duration: float) -> None:
+        if not args.quiet:
+            for path in (path for path, was_written in written.items() if was_written):
+                sys.stdout.write(f"Wrote {display_path(path)}\n")
+        sys.stdout.write(f"Regenerated {len(written)} file(s) in {duration:.3f}s\n")
+        sys.stdout.flush()
+
+    def report_error(exc: Exception) -> None:
+        sys.stderr.write(f"typtyp: {type(exc).__name__}: {exc}\n")
+
+    try:
+        config = load_config(args.config or find_config())
+        prepare_environment(config)
+        watcher = Watcher(config, world_names=args.worlds)
+        start = time.perf_counter()
+        report(watcher.build(), time.perf_counter() - start)
+    except ConfigError as exc:
+        sys.stderr.write(f"typtyp: {exc}\n")
+        return 2
+    sys.stdout.write(f"Watching {len(watcher.file_stats)} source file(s) for changes...\n")
+    sys.stdout.flush()
+    try:
+        watcher.run(on_refresh=report, on_error=report_error)
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import dataclasses
+import enum
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import pathlib
+import pkgutil
+import sys
+import types
+from collections.abc import Iterator
+from importlib.machinery import ModuleSpec
+from typing import Any, Callable
+
+from typtyp.output import write_if_changed
+
+INDEX_VERSION = 1
+
+
+def is_discoverable_type(obj: Any) -> bool:
+    """
+    Check whether an object is a type typtyp knows how to convert (a struct-like type or an enum).
+    """
+    from typtyp.extractors import default_struct_extractors
+
+    if not isinstance(obj, type) or obj.__name__.startswith("_"):
+        return False
+    if issubclass(obj, enum.Enum):
+        return bool(obj.__members__)
+    return default_struct_extractors.is_struct(obj)
+
+
+def discover_module_types(module: types.ModuleType) -> list[type]:
+    """
+    Find the convertible types defined in (not just imported into) a module, in definition order.
+    """
+    return [
+        obj
+        for obj in vars(module).values()
+        if isinstance(obj, type) and obj.__module__ == module.__name__ and is_discoverable_type(obj)
+    ]
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexEntry:
+    mtime_ns: int
+    size: int
+    sha256: str
+    # Whether the module, when last imported, defined any discoverable types
+    has_types: bool
+
+
+def _hash_file(path: pathlib.Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class DiscoveryIndex:
+    """
+    Remembers which source files define no discoverable types, so they need not be imported again
+    as long as they're unchanged.
+
+    Files are considered unchanged if their modification time and size match; failing that, if their hash does.
+    A read-only index is never saved.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None, *, read_only: bool = False) -> None:
+        self.path = pathlib.Path(path) if path is not None else None
+        self.read_only = read_only
+        self.entries: dict[str, IndexEntry] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:  # Corrupt index; start over
+                data = {}
+            if data.get("version") == INDEX_VERSION:
+                self.entries = {name: IndexEntry(**entry) for name, entry in data["modules"].items()}
+
+    def is_known_empty(self, module_name: str, origin: pathlib.Path) -> bool:
+        """
+        Check whether a module is known to define no discoverable types, without importing it.
+        """
+        entry = self.entries.get(module_name)
+        if entry is None or entry.has_types:
+            return False
+        try:
+            stat = origin.stat()
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == (entry.mtime_ns, entry.size):
+            return True
+        if stat.st_size == entry.size and _hash_file(origin) == entry.sha256:
+            # Touched, but not changed
+            self.entries[module_name] = dataclasses.replace(entry, mtime_ns=stat.st_mtime_ns)
+            return True
+        return False
+
+    def update(self, module_name: str, origin: pathlib.Path, *, has_types: bool) -> None:
+        stat = origin.stat()
+        entry = self.entries.get(module_name)
+        if entry is not None and (entry.mtime_ns, entry.size, entry.has_types) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+            has_types,
+        ):
+            return
+        self.entries[module_name] = IndexEntry(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            sha256=_hash_file(origin),
+            has_types=has_types,
+        )
+
+    def save(self) -> None:
+        if self.path is None or self.read_only:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "modules": {name: dataclasses.asdict(entry) for name, entry in sorted(self.entries.items())},
+        }
+        write_if_changed(self.path, json.dumps(data, indent=1) + "\n")
+
+
+def _spec_origin(spec: ModuleSpec | None) -> pathlib.Path | None:
+    if spec is None or not spec.has_location or not spec.origin:
+        return None
+    return pathlib.Path(spec.origin)
+
+
+def _iter_package_modules(
+    package_name: str,
+    spec: ModuleSpec | None = None,
+) -> Iterator[tuple[str, pathlib.Path | None]]:
+    """
+    Yield the names and source files of a package and all of its submodules, recursively, without importing them.
+
+    (Python will naturally import a package when one of its submodules is imported, though.)
+    """
+    if spec is None:
+        spec = importlib.util.find_spec(package_name)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named {package_name!r}", name=package_name)
+    yield package_name, _spec_origin(spec)
+    if spec.submodule_search_locations is None:  # Not a package
+        return
+    for module_info in sorted(pkgutil.iter_modules(spec.submodule_search_locations), key=lambda mi: mi.name):
+        name = f"{package_name}.{module_info.name}"
+        sub_spec = module_info.module_finder.find_spec(name, None)  # type: ignore[call-arg]
+        if module_info.ispkg:
+            yield from _iter_package_modules(name, sub_spec)
+        else:
+            yield name, _spec_origin(sub_spec)
+
+
+def discover_package_types(
+    package_name: str,
+    *,
+    index: DiscoveryIndex | None = None,
+    module_predicate: Callable[[str], bool] | None = None,
+) -> list[type]:
+    """
+    Find the convertible types defined in a package and its submodules.
+
+    Modules the index knows to define no types are not imported (unless they already have been).
+    """
+    found = []
+    for module_name, origin in _iter_package_modules(package_name):
+        if module_predicate is not None and not module_predicate(module_name):
+            continue
+        module = sys.modules.get(module_name)
+        if module is None:
+            if index is not None and origin is not None and index.is_known_empty(module_name, origin):
+                continue
+            module = importlib.import_module(module_name)
+        module_types = discover_module_types(module)
+        if index is not None and origin is not None:
+            index.update(module_name, origin, has_types=bool(module_types))
+        found.extend(module_types)
+    if index is not None:
+        index.save()
+    return found
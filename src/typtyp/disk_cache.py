@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import ast
+import dataclasses
+import hashlib
+import importlib.metadata
+import importlib.util
+import os
+import pathlib
+import pickle
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+from typtyp.incremental import Fragment, FragmentCache, describe, get_local_fingerprint
+from typtyp.instrumentation import TypeStats
+from typtyp.references import iter_annotation_leaves, iter_field_leaves
+from typtyp.type_info import TypeInfo
+
+if TYPE_CHECKING:
+    from typtyp.typescript import TypeScriptContext
+
+MAGIC = b"TYPTYP\x00\x03"
+
+_PLAIN_TYPES = (type(None), bool, int, float, str)
+
+_module_hash_memo: dict[tuple[str, int, int], str] = {}
+_module_imports_memo: dict[tuple[str, str], tuple[str, ...]] = {}
+
+
+def _hash_file(path: str) -> str | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    memo_key = (path, stat.st_mtime_ns, stat.st_size)
+    if (digest := _module_hash_memo.get(memo_key)) is None:
+        with open(path, "rb") as f:
+            digest = _module_hash_memo[memo_key] = hashlib.sha256(f.read()).hexdigest()
+    return digest
+
+
+def get_module_source_hash(module_name: str) -> str | None:
+    """
+    Hash the source file of a module (without importing it, if it isn't already), or None if it has none.
+    """
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    if path is None and module is None:
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is not None and spec.has_location:
+            path = spec.origin
+    return _hash_file(path) if path else None
+
+
+def _is_environment_module(module_name: str) -> bool:
+    """
+    Check whether a module is part of the standard library or typtyp (both versioned in the environment key).
+    """
+    top_level = module_name.partition(".")[0]
+    return top_level in sys.stdlib_module_names or top_level == "typtyp"
+
+
+def _is_third_party_module(module_name: str) -> bool:
+    path = getattr(sys.modules.get(module_name), "__file__", None) or ""
+    return not {"site-packages", "dist-packages"}.isdisjoint(pathlib.Path(path).parts)
+
+
+def _get_imported_module_names(module_name: str) -> tuple[str, ...]:
+    """
+    Get the names of the modules a module's source imports (or imports anything from), by parsing it;
+    unlike looking at the module's namespace, this also finds where plain values (e.g. type aliases) came from.
+    """
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    if not path or (source_hash := _hash_file(path)) is None:
+        return ()
+    memo_key = (module_name, source_hash)
+    if (names := _module_imports_memo.get(memo_key)) is None:
+        try:
+            with open(path, "rb") as f:
+                tree = ast.parse(f.read())
+        except (SyntaxError, ValueError):
+            tree = ast.Module(body=[], type_ignores=[])
+        package = getattr(module, "__package__", None)
+        found: set[str] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                found.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                try:
+                    base = importlib.util.resolve_name("." * node.level + (node.module or ""), package)
+                except (ImportError, ValueError):
+                    continue
+                found.add(base)
+                found.update(f"{base}.{alias.name}" for alias in node.names)  # (in case they're modules)
+        names = _module_imports_memo[memo_key] = tuple(sorted(found))
+    return names
+
+
+def _is_plain(value: Any) -> bool:
+    """
+    Check whether a value is described completely by `describe`, i.e. it's a plain value,
+    or a container or dataclass of plain values (unlike e.g. a function, whose behavior may depend on its closure).
+    """
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_plain(k) and _is_plain(v) for k, v in value.items())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return all(_is_plain(getattr(value, f.name)) for f in dataclasses.fields(value))
+    return False
+
+
+def _get_typtyp_version() -> str:
+    try:
+        version = importlib.metadata.version("typtyp")
+    except importlib.metadata.PackageNotFoundError:  # pragma: no cover
+        version = "unknown"
+    # Hash the sources too, so development versions don't mix up their caches.
+    package_dir = pathlib.Path(__file__).parent
+    hasher = hashlib.sha256()
+    for path in sorted(package_dir.glob("*.py")):
+        hasher.update(path.name.encode())
+        hasher.update((_hash_file(str(path)) or "").encode())
+    return f"{version}+{hasher.hexdigest()[:16]}"
+
+
+@dataclasses.dataclass(frozen=True)
+class StoredFragment:
+    # Local fingerprint of the type's configuration, without its fields (see `get_local_fingerprint`).
+    source_key: str
+    # Source hashes of the modules that contributed to the type's fields.
+    module_hashes: tuple[tuple[str, str], ...]
+    # Names of the types referred to, and descriptions of the types they were registered for.
+    references: tuple[tuple[str, str], ...]
+    text: str
+    utility_types: dict[str, type]
+
+
+class DiskCache:
+    """
+    Persistent cache of rendered per-type fragments, in a local directory.
+
+    A stored fragment is reused as long as the type's configuration, the source files of the modules
+    its fields came from (and of the first-party modules those import from, so e.g. type aliases are covered),
+    the names of the types it refers to, typtyp's version and the options are unchanged.
+    Reusing fragments requires no introspection at all, so if every fragment is reused,
+    no models are introspected.
+
+    Options that can't be described by value (e.g. `order_by` functions, whose closures may differ between runs)
+    bypass the cache altogether.
+
+    Changes that aren't visible in those inputs, e.g. registering custom scalars or field types
+    under the same options, or types defined in modules without source files, aren't detected;
+    call `clear()` in those cases.
+
+    If `read_only` is set, the cache is only read from, never written to (e.g. for checking outputs).
+
+    The cache files are pickles, so the directory must not be writable by untrusted parties.
+    Corrupt or partially written cache files are detected and discarded.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], *, read_only: bool = False) -> None:
+        self.directory = pathlib.Path(directory)
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.typtyp-cache"):
+            path.unlink(missing_ok=True)
+
+    def get_environment_key(self, ctx: TypeScriptContext) -> str | None:
+        """
+        Get the key of the stored fragments for a context, or None if the context's options can't be keyed.
+        """
+        options = ctx.options
+        lines = [
+            f"typtyp={_get_typtyp_version()}",
+            f"python={sys.version_info[:2]}",
+            f"scalars={describe(ctx.scalars._mappings)}",
+            f"aliases={sorted((repr(key), name) for key, name in ctx.type_aliases.items())}",
+        ]
+        for field in dataclasses.fields(options):
+            if field.name != "scalars":
+                if not _is_plain(getattr(options, field.name)):
+                    return None
+                lines.append(f"{field.name}={describe(getattr(options, field.name))}")
+        return hashlib.sha256("\n".join(lines).encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _get_path(self, environment_key: str) -> pathlib.Path:
+        return self.directory / f"{environment_key[:32]}.typtyp-cache"
+
+    def load(self, environment_key: str) -> dict[str, bytes]:
+        """
+        Load the (still pickled) stored fragments for an environment; a corrupt cache file is deleted
+        (unless the cache is read-only).
+        """
+        path = self._get_path(environment_key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return {}
+        header_size = len(MAGIC) + 32
+        payload = data[header_size:]
+        try:
+            if data[: len(MAGIC)] != MAGIC or hashlib.sha256(payload).digest() != data[len(MAGIC) : header_size]:
+                raise ValueError("Bad header or checksum")
+            entries = pickle.loads(payload)
+            if not isinstance(entries, dict):
+                raise TypeError("Bad payload")
+        except Exception:
+            if not self.read_only:
+                path.unlink(missing_ok=True)
+            return {}
+        return entries
+
+    def save(self, environment_key: str, entries: dict[str, bytes]) -> None:
+        """
+        Atomically write the stored fragments for an environment.
+        """
+        payload = pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC + hashlib.sha256(payload).digest() + payload)
+            os.replace(tmp_name, self._get_path(environment_key))
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    def _get_dependency_modules(self, ctx: TypeScriptContext, type_info: TypeInfo) -> set[str]:
+        typ = type_info.type
+        objects: list[Any] = list(getattr(typ, "__mro__", ()))
+        fields = ctx.world.get_struct_fields(typ)
+        objects.extend(iter_annotation_leaves(typ) if fields is None else iter_field_leaves(fields))
+        pending = {getattr(obj, "__module__", None) for obj in objects}
+        modules = set()
+        while pending:
+            module = pending.pop()
+            if not isinstance(module, str) or module in modules or _is_environment_module(module):
+                continue
+            modules.add(module)
+            if not _is_third_party_module(module):
+                # Follow the imports of first-party modules (that have been imported)
+                pending.update(name for name in _get_imported_module_names(module) if name in sys.modules)
+        return modules
+
+    def _store(self, ctx: TypeScriptContext, type_info: TypeInfo, fragment: Fragment) -> bytes | None:
+        module_hashes = []
+        if not type_info.import_from:
+            for module in sorted(self._get_dependency_modules(ctx, type_info)):
+                if (module_hash := get_module_source_hash(module)) is None:
+                    return None  # Can't tell whether this type changes, so don't store it
+                module_hashes.append((module, module_hash))
+        stored = StoredFragment(
+            source_key=get_local_fingerprint(type_info, None),
+            module_hashes=tuple(module_hashes),
+            references=tuple(
+                (name, describe(ctx.world.get_type_info(name).type))
+                for name in ctx.world.get_referenced_names(type_info)
+            ),
+            text=fragment.text,
+            utility_types=fragment.utility_types,
+        )
+        try:
+            return pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # e.g. unpicklable utility types
+            return None
+
+    def _load_valid(self, ctx: TypeScriptContext, type_info: TypeInfo, data: bytes | None) -> StoredFragment | None:
+        if data is None:
+            return None
+        try:
+            stored = pickle.loads(data)
+        except Exception:
+            return None
+        if not isinstance(stored, StoredFragment) or stored.source_key != get_local_fingerprint(type_info, None):
+            return None
+        for module, module_hash in stored.module_hashes:
+            if get_module_source_hash(module) != module_hash:
+                return None
+        types_by_name = ctx.world._types_by_name
+        for name, type_description in stored.references:
+            if (ref_info := types_by_name.get(name)) is None or describe(ref_info.type) != type_description:
+                return None
+        return stored
+
+    def render_fragments(
+        self,
+        ctx: TypeScriptContext,
+        type_infos: list[TypeInfo],
+        *,
+        fragment_cache: FragmentCache | None = None,
+        jobs: int = 1,
+    ) -> list[Fragment]:
+        """
+        Like `typtyp.typescript.render_fragments`, but reusing fragments stored on disk by previous runs,
+        and storing newly rendered ones (unless the cache is read-only).
+        """
+        from typtyp.typescript import render_fragments
+
+        environment_key = self.get_environment_key(ctx)
+        if environment_key is None:
+            self.misses += len(type_infos)
+            return render_fragments(ctx, type_infos, fragment_cache=fragment_cache, jobs=jobs)
+        entries = self.load(environment_key)
+        fragments: list[Fragment | None] = []
+        for type_info in type_infos:
+            stored = self._load_valid(ctx, type_info, entries.get(type_info.name))
+            if stored is None:
+                fragments.append(None)
+                continue
+            fragments.append(Fragment(fingerprint="", text=stored.text, utility_types=stored.utility_types))
+            if ctx.observer is not None:
+                ctx.observer.type_written(
+                    TypeStats(
+                        name=type_info.name,
+                        introspection_time=0.0,
+                        render_time=0.0,
+                        output_bytes=len(stored.text.encode("utf-8")),
+                        depth=0,
+                        cached=True,
+                    ),
+                )
+        dirty = [i for i, fragment in enumerate(fragments) if fragment is None]
+        self.hits += len(type_infos) - len(dirty)
+        self.misses += len(dirty)
+        if dirty:
+            rendered = render_fragments(ctx, [type_infos[i] for i in dirty], fragment_cache=fragment_cache, jobs=jobs)
+            for i, fragment in zip(dirty, rendered):
+                fragments[i] = fragment
+                type_info = type_infos[i]
+                if (data := self._store(ctx, type_info, fragment)) is not None:
+                    entries[type_info.name] = data
+                else:
+                    entries.pop(type_info.name, None)
+            # Forget types no longer in the world
+            for name in [name for name in entries if name not in ctx.world._types_by_name]:
+                del entries[name]
+            if not self.read_only:
+                self.save(environment_key, entries)
+        return fragments  # type: ignore[return-value]
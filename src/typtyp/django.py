@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 import uuid
 from decimal import Decimal
-from typing import Annotated, Any, Iterable, Literal, Optional, Union
+from typing import Annotated, Any, Callable, Iterable, Literal, Optional, Union
 
 from django.db import models
 
@@ -36,30 +36,103 @@ SIMPLE_FIELD_TYPES = {
 }
 
 
+# Resolves a field to a (type, comment) tuple, or None if the field should be skipped.
+FieldTypeResolver = Callable[[models.Field, type[models.Model]], Optional[tuple[Any, Optional[str]]]]
+
+
 def get_referred_model_type(field: models.Field, model_type: type[models.Model]):
     if field.related_model == "self":
         return model_type  # self-referential relation
     return field.related_model
 
 
+def _fixed_type(typ: Any, comment: str | None = None) -> FieldTypeResolver:
+    return lambda field, model_type: (typ, comment)
+
+
+def _resolve_array_field(field, model_type):
+    base_type = get_django_field_type(field.base_field, model_type=model_type)
+    return (list[base_type[0] if base_type else Any], None)
+
+
+# Field classes (or their dotted paths, for classes that can't always be imported) mapped to resolvers.
+# The resolver of the nearest registered class in a field class's MRO is used.
+FIELD_TYPE_RESOLVERS: dict[type | str, FieldTypeResolver | None] = {
+    **{field_type: _fixed_type(str) for field_type in STRINGLIKE_FIELDS},
+    **{field_type: _fixed_type(typ) for field_type, typ in SIMPLE_FIELD_TYPES.items()},
+    # Skip reverse relations for now.
+    models.ManyToManyRel: None,
+    models.ManyToOneRel: None,
+    models.ManyToManyField: lambda field, model_type: (
+        list[get_referred_model_type(field, model_type)],
+        "many-to-many relation",
+    ),
+    models.OneToOneField: lambda field, model_type: (
+        get_referred_model_type(field, model_type),
+        "one-to-one relation",
+    ),
+    models.ForeignKey: lambda field, model_type: (
+        get_referred_model_type(field, model_type),
+        "foreign key relation",
+    ),
+    "django.contrib.postgres.fields.array.ArrayField": _resolve_array_field,
+    "django.contrib.postgres.fields.hstore.HStoreField": _fixed_type(dict[str, Optional[str]]),
+}
+
+# Resolvers per concrete field class, as found by walking the class's MRO.
+_resolver_cache: dict[type, FieldTypeResolver | None] = {}
+
+
+def register_field_type(
+    field_class: type[models.Field] | str,
+    typ: Any = None,
+    *,
+    comment: str | None = None,
+    resolver: FieldTypeResolver | None = None,
+) -> None:
+    """
+    Register the type to use for fields of `field_class` (or its subclasses).
+
+    `field_class` may also be a dotted path to a field class, for classes that can't always be imported.
+    Either pass the Python type to use (and optionally a comment), or a resolver function that
+    gets passed the field and the model type, and returns a (type, comment) tuple (or None to skip the field).
+    """
+    if (typ is None) == (resolver is None):
+        raise TypeError("Pass exactly one of `typ` and `resolver`")
+    FIELD_TYPE_RESOLVERS[field_class] = resolver if resolver is not None else _fixed_type(typ, comment)
+    _resolver_cache.clear()
+
+
+def get_field_type_resolver(field_class: type) -> FieldTypeResolver | None:
+    try:
+        return _resolver_cache[field_class]
+    except KeyError:
+        pass
+    resolver = None
+    for klass in field_class.__mro__:
+        if klass in FIELD_TYPE_RESOLVERS:
+            resolver = FIELD_TYPE_RESOLVERS[klass]
+            break
+        if (path := f"{klass.__module__}.{klass.__qualname__}") in FIELD_TYPE_RESOLVERS:
+            resolver = FIELD_TYPE_RESOLVERS[path]
+            break
+    else:
+        resolver = _unsupported
+    _resolver_cache[field_class] = resolver
+    return resolver
+
+
+def _unsupported(field, model_type):
+    raise NotImplementedError(f"Unsupported Django field type ({type(field).__name__}): {field!r}")  # pragma: no cover
+
+
 def get_django_field_type(field: models.Field, *, model_type: type[models.Model]) -> tuple[type, str | None] | None:
     if flatchoices := getattr(field, "flatchoices", None):
         return (Union[*(Literal[c[0]] for c in flatchoices)], None)
-    if isinstance(field, STRINGLIKE_FIELDS):
-        return (str, None)
-    for field_type, typ in SIMPLE_FIELD_TYPES.items():
-        if isinstance(field, field_type):
-            return (typ, None)
-    if isinstance(field, (models.ManyToManyRel, models.ManyToOneRel)):
-        # Skip reverse relations for now.
+    resolver = get_field_type_resolver(type(field))
+    if resolver is None:
         return None
-    if isinstance(field, models.ManyToManyField):
-        return (list[get_referred_model_type(field, model_type)], "many-to-many relation")
-    if isinstance(field, models.OneToOneField):
-        return (get_referred_model_type(field, model_type), "one-to-one relation")
-    if isinstance(field, models.ForeignKey):
-        return (get_referred_model_type(field, model_type), "foreign key relation")
-    raise NotImplementedError(f"Unsupported Django field type ({type(field).__name__}): {field!r}")  # pragma: no cover
+    return resolver(field, model_type)
 
 
 def is_django_model(t) -> bool:
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class TyptypConfig(AppConfig):
+    name = "typtyp.django_app"
+    label = "typtyp"
+    verbose_name = "typtyp"
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import dataclasses
+import pathlib
+import time
+from typing import Any
+
+from django.apps import AppConfig, apps
+from django.core.management.base import BaseCommand, CommandError
+
+from typtyp.cli import (
+    build_world,
+    display_path,
+    find_stale,
+    load_config,
+    prepare_environment,
+    render_world,
+    select_worlds,
+)
+from typtyp.excs import ConfigError
+from typtyp.field_info import FieldInfo
+from typtyp.output import write_if_changed
+from typtyp.type_info import TypeInfo
+from typtyp.world import World
+
+
+def partition_by_app(type_info: TypeInfo) -> str:
+    """
+    Group types by the Django app they're defined in.
+    """
+    module = getattr(type_info.type, "__module__", None) or ""
+    app_config = apps.get_containing_app_config(module)
+    return app_config.label if app_config is not None else "types"
+
+
+def build_app_world(
+    app_configs: list[AppConfig],
+    *,
+    introspection_cache: dict[Any, list[FieldInfo] | None] | None = None,
+) -> World:
+    """
+    Build a world of the models of the given apps, and the types they refer to (e.g. models in other apps).
+    """
+    world = World(introspection_cache=introspection_cache)
+    world.add_many([model for app_config in app_configs for model in app_config.get_models()], follow_references=True)
+    return world
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate TypeScript definitions for the models of the given apps (one file per app), "
+        "or for the worlds declared in [tool.typtyp] with --config. "
+        "The app registry is loaded once, and model introspection is shared between all outputs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("app_labels", nargs="*", metavar="app_label", help="apps to generate (default: all)")
+        parser.add_argument("--output-dir", help="directory to write one file per app into")
+        parser.add_argument("--config", help="generate the worlds declared in this pyproject.toml instead")
+        parser.add_argument("--world", action="append", dest="worlds", help="with --config, only this world")
+        parser.add_argument("--check", action="store_true", help="don't write anything; fail if any output is stale")
+
+    def handle(self, *args, app_labels, output_dir, config, worlds, check, verbosity, **options):
+        start = time.perf_counter()
+        introspection_cache: dict[Any, list[FieldInfo] | None] = {}
+        timings: list[tuple[str, float]] = []
+        outputs: dict[pathlib.Path, str] = {}
+
+        if config is not None:
+            if app_labels or output_dir:
+                raise CommandError("App labels and --output-dir can't be used with --config")
+            try:
+                typtyp_config = load_config(config)
+                # Django is already set up; only make the configured modules importable.
+                prepare_environment(dataclasses.replace(typtyp_config, django_settings=None))
+                for world_config in select_worlds(typtyp_config, worlds):
+                    world_start = time.perf_counter()
+                    world = build_world(
+                        world_config,
+                        introspection_cache=introspection_cache,
+                        index_path=typtyp_config.index_path,
+                        read_only=check,
+                    )
+                    outputs.update(render_world(world, world_config))
+                    timings.append((world_config.name, time.perf_counter() - world_start))
+            except ConfigError as exc:
+                raise CommandError(str(exc)) from exc
+            except KeyError as exc:  # e.g. types with clashing names
+                raise CommandError(exc.args[0]) from exc
+        else:
+            if output_dir is None:
+                raise CommandError("Either --output-dir or --config is required")
+            try:
+                app_configs = [apps.get_app_config(label) for label in app_labels] or list(apps.get_app_configs())
+            except LookupError as exc:
+                raise CommandError(str(exc)) from exc
+            try:
+                world = build_app_world(app_configs, introspection_cache=introspection_cache)
+            except KeyError as exc:  # e.g. models with the same name in different apps
+                raise CommandError(exc.args[0]) from exc
+            files = world.get_typescript_files(partition=partition_by_app)
+            outputs.update({pathlib.Path(output_dir) / name: content for name, content in files.items()})
+            timings.append((", ".join(app_config.label for app_config in app_configs), time.perf_counter() - start))
+
+        if verbosity >= 2:
+            for name, duration in timings:
+                self.stdout.write(f"Generated {name} in {duration:.3f}s")
+
+        if check:
+            if stale := find_stale(outputs):
+                raise CommandError("Out of date: " + ", ".join(display_path(path) for path in stale))
+            return
+
+        written = [path for path, content in outputs.items() if write_if_changed(path, content)]
+        if verbosity >= 1:
+            for path in written:
+                self.stdout.write(f"Wrote {display_path(path)}")
+            self.stdout.write(
+                f"Generated {len(outputs)} file(s) ({len(written)} written, {len(outputs) - len(written)} unchanged, "
+                f"{len(introspection_cache)} types introspected) in {time.perf_counter() - start:.3f}s",
+            )
@@ -3,6 +3,7 @@ from __future__ import annotations
 import datetime
 import inspect
 import uuid
+import weakref
 from decimal import Decimal
 from typing import Annotated, Any, Iterable, Literal, Union
 
@@ -55,7 +56,18 @@ def is_drf_serializer(t) -> bool:
         return False
 
 
-def get_drf_field_type(field: fields.Field) -> type:
+def get_drf_field_type(
+    field: fields.Field,
+    *,
+    serializer_type: type[serializers.Serializer] | None = None,
+    field_name: str | None = None,
+) -> type:
+    """
+    Get the Python type for a serializer field.
+
+    `serializer_type` and `field_name` are needed for `SerializerMethodField`s
+    that haven't been bound to a serializer instance.
+    """
     if isinstance(field, serializers.DictField):
         return dict[Any, get_drf_field_type(field.child)]
     if isinstance(field, fields._UnvalidatedField):
@@ -71,7 +83,9 @@ def get_drf_field_type(field: fields.Field) -> type:
             return derived_enum
         return Union[*(Literal[choice] for choice in field.choices)]  # iterate over keys only
     if isinstance(field, serializers.SerializerMethodField):
-        method = getattr(field.parent, field.method_name)
+        # Unbound fields have no parent, and maybe no method name yet; see `SerializerMethodField.bind`.
+        owner = getattr(field, "parent", None) or serializer_type
+        method = getattr(owner, field.method_name or f"get_{field.field_name or field_name}")
         rtype = inspect.get_annotations(method).get("return", Any)
         if isinstance(rtype, str):
             # If the return type is a string, assume it's a forward reference
@@ -88,11 +102,51 @@ def get_drf_field_type(field: fields.Field) -> type:
     raise NotImplementedError(f"Unsupported DRF field type ({type(field).__name__}): {field!r}")  # pragma: no cover
 
 
+# Introspected fields per serializer class.
+_serializer_fields_cache: weakref.WeakKeyDictionary[type, tuple[FieldInfo, ...]] = weakref.WeakKeyDictionary()
+
+
+def can_use_declared_fields(ser_type: type[serializers.Serializer]) -> bool:
+    """
+    Check whether a serializer's fields are exactly its declared fields,
+    i.e. whether they can be read without instantiating the serializer.
+    """
+    return (
+        not issubclass(ser_type, serializers.ModelSerializer)
+        and ser_type.get_fields is serializers.Serializer.get_fields
+        and ser_type.__init__ is serializers.BaseSerializer.__init__  # type: ignore[misc]
+    )
+
+
 def get_serializer_fields(ser_type: type[serializers.Serializer]) -> Iterable[FieldInfo]:
-    context = {"request": None}
-    for name, field in sorted(ser_type(context=context).fields.items(), key=lambda item: item[0]):
-        yield FieldInfo(
+    """
+    Get the fields of a serializer class.
+
+    Plain serializers are introspected from their declared fields, without instantiating them;
+    others (e.g. `ModelSerializer`s, whose fields are built from the model) are instantiated once.
+    The result is cached per serializer class.
+    """
+    try:
+        return _serializer_fields_cache[ser_type]
+    except KeyError:
+        pass
+    if can_use_declared_fields(ser_type):
+        ser_fields = ser_type._declared_fields  # type: ignore[attr-defined]
+    else:
+        ser_fields = ser_type(context={"request": None}).fields
+    field_infos = _serializer_fields_cache[ser_type] = tuple(
+        FieldInfo(
             name=name,
-            type=get_drf_field_type(field),
+            type=get_drf_field_type(field, serializer_type=ser_type, field_name=name),
             doc=str(field.help_text) if field.help_text else None,
         )
+        for name, field in sorted(ser_fields.items(), key=lambda item: item[0])
+    )
+    return field_infos
+
+
+def clear_serializer_fields_cache() -> None:
+    """
+    Forget cached serializer fields, e.g. if serializer classes have been modified in place.
+    """
+    _serializer_fields_cache.clear()
@@ -1,2 +1,6 @@
 class UnreferrableTypeError(ValueError):
     pass
+
+
+class ConfigError(ValueError):
+    pass
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import sys
+import typing
+import warnings
+from typing import Any, Callable, Iterable
+
+from typtyp.field_info import FieldInfo
+
+ENTRY_POINT_GROUP = "typtyp.struct_extractors"
+
+
+@dataclasses.dataclass
+class StructExtractor:
+    """
+    Extracts the fields of a kind of struct-like type (e.g. dataclasses, Pydantic models).
+
+    `is_struct` and `get_fields` are either callables, or names of callables in `module`,
+    which is imported only when the extractor is first needed. If that import fails,
+    the extractor is disabled for the rest of the process.
+    """
+
+    name: str
+    is_struct: Callable[[Any], bool] | str
+    get_fields: Callable[[Any], Iterable[FieldInfo]] | str
+    module: str | None = None
+
+    # A module that must already have been imported (by someone) for a type to possibly be
+    # handled by this extractor; e.g. there can't be Pydantic models if `pydantic` isn't loaded.
+    # This is checked first, so unrelated backends are never imported.
+    requires_module: str | None = None
+
+    _available: bool | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def available(self) -> bool:
+        if self._available is None:
+            self._available = self._load()
+        return self._available
+
+    def _load(self) -> bool:
+        if self.module is None:
+            return True
+        try:
+            module = importlib.import_module(self.module)
+        except ImportError:
+            return False
+        if isinstance(self.is_struct, str):
+            self.is_struct = getattr(module, self.is_struct)
+        if isinstance(self.get_fields, str):
+            self.get_fields = getattr(module, self.get_fields)
+        return True
+
+    def handles(self, tp: Any) -> bool:
+        if self.requires_module is not None and self.requires_module not in sys.modules:
+            return False
+        if not self.available:
+            return False
+        return self.is_struct(tp)  # type: ignore[operator]
+
+
+class StructExtractorRegistry:
+    def __init__(self, extractors: Iterable[StructExtractor] = (), *, load_entry_points: bool = True) -> None:
+        self._extractors = list(extractors)
+        self._entry_points_loaded = not load_entry_points
+
+    def register(self, extractor: StructExtractor, *, first: bool = False) -> None:
+        if first:
+            self._extractors.insert(0, extractor)
+        else:
+            self._extractors.append(extractor)
+
+    def _load_entry_points(self) -> None:
+        from importlib.metadata import entry_points
+
+        self._entry_points_loaded = True
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            try:
+                extractor = entry_point.load()
+            except Exception as exc:
+                warnings.warn(f"Could not load struct extractor {entry_point.name!r}: {exc}", stacklevel=2)
+                continue
+            self.register(extractor)
+
+    def __iter__(self) -> typing.Iterator[StructExtractor]:
+        if not self._entry_points_loaded:
+            self._load_entry_points()
+        return iter(self._extractors)
+
+    def find(self, tp: Any) -> StructExtractor | None:
+        for extractor in self:
+            if extractor.handles(tp):
+                return extractor
+        return None
+
+    def is_struct(self, tp: Any) -> bool:
+        return self.find(tp) is not None
+
+    def get_fields(self, tp: Any) -> list[FieldInfo] | None:
+        if extractor := self.find(tp):
+            return list(extractor.get_fields(tp))  # type: ignore[operator]
+        return None
+
+
+def get_dataclass_fields(tp) -> Iterable[FieldInfo]:
+    try:
+        # Resolve string annotations (e.g. forward references, or `from __future__ import annotations`)
+        hints = typing.get_type_hints(tp, include_extras=True)
+    except Exception:  # Unresolvable; use the annotations as-is
+        hints = {}
+    return [FieldInfo(name=f.name, type=hints.get(f.name, f.type)) for f in dataclasses.fields(tp)]
+
+
+def get_typeddict_fields(tp) -> Iterable[FieldInfo]:
+    # TODO: support __total__
+    # TODO: support __required_keys__
+    # TODO: support __optional_keys__
+    return [FieldInfo(name=name, type=type) for (name, type) in typing.get_type_hints(tp, include_extras=True).items()]
+
+
+# Cheapest checks first; the optional backends are only imported
+# once their underlying library has been imported.
+default_struct_extractors = StructExtractorRegistry(
+    [
+        StructExtractor("dataclass", is_struct=dataclasses.is_dataclass, get_fields=get_dataclass_fields),
+        StructExtractor("typeddict", is_struct=typing.is_typeddict, get_fields=get_typeddict_fields),
+        StructExtractor(
+            "pydantic",
+            module="typtyp.pydantic",
+            is_struct="is_pydantic_model",
+            get_fields="get_pydantic_fields",
+            requires_module="pydantic",
+        ),
+        StructExtractor(
+            "drf",
+            module="typtyp.drf",
+            is_struct="is_drf_serializer",
+            get_fields="get_serializer_fields",
+            requires_module="rest_framework",
+        ),
+        StructExtractor(
+            "django",
+            module="typtyp.django",
+            is_struct="is_django_model",
+            get_fields="get_model_fields",
+            requires_module="django.db.models",
+        ),
+    ],
+)
+
+
+def register_struct_extractor(extractor: StructExtractor, *, first: bool = False) -> None:
+    """
+    Register a struct extractor in the default registry.
+
+    Third-party packages can also provide extractors via the `typtyp.struct_extractors` entry point group.
+    """
+    default_struct_extractors.register(extractor, first=first)
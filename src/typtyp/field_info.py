@@ -1,5 +1,5 @@
 import dataclasses
-from typing import TypedDict
+from typing import Iterable, TypedDict
 
 
 @dataclasses.dataclass(frozen=True)
@@ -13,3 +13,24 @@ class FieldInfoDict(TypedDict, total=False):
     name: str
     type: type
     doc: str | None
+
+
+def merge_overrides(
+    field_infos: Iterable[FieldInfo],
+    field_overrides: dict[str, FieldInfo | FieldInfoDict | None],
+) -> Iterable[FieldInfo]:
+    for fi in field_infos:
+        try:
+            override = field_overrides[fi.name]
+        except KeyError:
+            yield fi  # No override
+        else:
+            if override is None:  # Skip the field
+                continue
+            if isinstance(override, FieldInfo):  # Full override
+                yield override
+                continue
+            if isinstance(override, dict):  # Merge override
+                yield dataclasses.replace(fi, **override)
+                continue
+            raise TypeError(f"Expected FieldInfo or FieldInfoDict, got {override!r} for field {fi.name!r}")
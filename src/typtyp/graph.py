@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+from collections.abc import Iterable
+
+
+@dataclasses.dataclass(frozen=True)
+class DependencyGraph:
+    """
+    The reference graph of a world's types; each type name maps to the names of the types it refers to.
+    """
+
+    edges: dict[str, tuple[str, ...]]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.edges
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def dependencies(self, name: str) -> tuple[str, ...]:
+        return self.edges[name]
+
+    @functools.cached_property
+    def _reverse_edges(self) -> dict[str, list[str]]:
+        reverse_edges: dict[str, list[str]] = {name: [] for name in self.edges}
+        for name, deps in self.edges.items():
+            for dep in deps:
+                reverse_edges[dep].append(name)
+        return reverse_edges
+
+    def dependents(self, name: str) -> list[str]:
+        return self._reverse_edges[name]
+
+    def strongly_connected_components(self, names: Iterable[str] | None = None) -> list[list[str]]:
+        """
+        Find the strongly connected components (i.e. groups of mutually dependent types) of the graph,
+        or of the subgraph of the given names, using Tarjan's algorithm.
+
+        Components are returned in dependency order: each comes after the components it depends on.
+        Runs in O(V + E), iteratively, so deep graphs don't hit the recursion limit.
+        """
+        roots = list(self.edges if names is None else names)
+        members = set(roots)
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components: list[list[str]] = []
+
+        def visit(node: str) -> None:
+            index[node] = lowlink[node] = len(index)
+            stack.append(node)
+            on_stack.add(node)
+
+        for root in roots:
+            if root in index:
+                continue
+            visit(root)
+            work = [(root, iter(self.edges[root]))]
+            while work:
+                node, successors = work[-1]
+                for succ in successors:
+                    if succ not in members:
+                        continue
+                    if succ not in index:
+                        visit(succ)
+                        work.append((succ, iter(self.edges[succ])))
+                        break
+                    if succ in on_stack:
+                        lowlink[node] = min(lowlink[node], index[succ])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    def topological_order(self, names: Iterable[str] | None = None) -> list[str]:
+        """
+        Order the given names (by default, all of them) so types come after the types they depend on.
+
+        The order is stable: mutually dependent types, and types that don't depend on each other,
+        keep their relative order where possible.
+        """
+        names = list(self.edges if names is None else names)
+        position = {name: i for i, name in enumerate(names)}
+        return [
+            name
+            for component in self.strongly_connected_components(names)
+            for name in sorted(component, key=position.__getitem__)
+        ]
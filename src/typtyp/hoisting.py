@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import dataclasses
+import types
+import typing
+from collections.abc import Hashable, Iterable
+from typing import Any, Callable, Union
+
+from typtyp.field_info import FieldInfo
+from typtyp.references import iter_annotation_leaves
+from typtyp.translation_cache import get_cache_key
+from typtyp.type_info import TypeInfo
+
+
+@dataclasses.dataclass(frozen=True)
+class HoistedType:
+    # Name of the generated type alias.
+    name: str
+    # The anonymous type annotation the alias stands for.
+    type: Any
+    # Whether `None` in the annotation means `undefined` (see `TypeConfiguration.null_is_undefined`).
+    null_is_undefined: bool
+
+
+def get_alias_key(annotation: Any, null_is_undefined: bool) -> Hashable:
+    return (get_cache_key(annotation), null_is_undefined)
+
+
+def strip_none(annotation: Any) -> Any | None:
+    """
+    For an optional type (e.g. `Literal["a", "b"] | None`), return the type without `None`.
+    """
+    if typing.get_origin(annotation) not in (Union, types.UnionType):
+        return None
+    args = typing.get_args(annotation)
+    rest = tuple(arg for arg in args if arg is not type(None))
+    if len(rest) == len(args):
+        return None
+    return rest[0] if len(rest) == 1 else Union[rest]
+
+
+def is_anonymous(annotation: Any) -> bool:
+    """
+    Check whether an annotation is a composite type (e.g. a union, a literal or a generic collection),
+    which would be rendered inline in TypeScript.
+    """
+    return typing.get_origin(annotation) is not None
+
+
+def _involves_none(annotation: Any) -> bool:
+    return any(leaf is type(None) for leaf in iter_annotation_leaves(annotation))
+
+
+def _pascal_case(name: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in name.split("_"))
+
+
+def _get_anonymous_parts(annotation: Any) -> list[Any]:
+    """
+    Get the outermost anonymous types among an annotation's type arguments (without `None`, if optional).
+    """
+    parts = []
+    for arg in typing.get_args(annotation):
+        candidate = strip_none(arg) or arg
+        if is_anonymous(candidate):
+            parts.append(candidate)
+    return parts
+
+
+def find_repeated_types(  # noqa: C901
+    structs: Iterable[tuple[TypeInfo, Iterable[FieldInfo]]],
+    *,
+    min_occurrences: int,
+    min_length: int,
+    measure: Callable[[Any, bool], int],
+    taken_names: set[str],
+) -> dict[Hashable, HoistedType]:
+    """
+    Find structurally identical anonymous types that occur at least `min_occurrences` times
+    in the given struct types' fields, at any depth, and whose rendering (as measured by `measure`)
+    is at least `min_length` long.
+
+    For optional types, the type without `None` is considered instead.
+    Occurrences within hoisted types are counted only once (as the alias declaration contains them once),
+    so e.g. the item type of a hoisted list type is only hoisted if it's also repeated elsewhere.
+    Each such type is given an alias name based on the first field it occurs in.
+    Returns a mapping of alias keys (see `get_alias_key`) to hoisted types; types that don't involve `None`
+    render the same regardless of `null_is_undefined`, so they're mapped by both variants of their key.
+    """
+    counts: dict[Hashable, int] = {}
+    first_seen: dict[Hashable, tuple[str, Any, bool]] = {}
+    # The anonymous parts of each type, by key (with repetitions)
+    parts: dict[Hashable, list[Hashable]] = {}
+    depths: dict[Hashable, int] = {}
+
+    def visit(annotation: Any, name: str, type_info: TypeInfo) -> tuple[Hashable, int] | None:
+        null_is_undefined = type_info.null_is_undefined and _involves_none(annotation)
+        try:
+            key = get_alias_key(annotation, null_is_undefined)
+            counts[key] = counts.get(key, 0) + 1
+        except TypeError:  # Unhashable annotation
+            return None
+        if key not in first_seen:
+            first_seen[key] = (name, annotation, null_is_undefined)
+        part_keys = []
+        depth = 0
+        for part in _get_anonymous_parts(annotation):
+            if (visited := visit(part, f"{name}Item", type_info)) is not None:
+                part_keys.append(visited[0])
+                depth = max(depth, visited[1])
+        parts[key] = part_keys
+        depths[key] = depth + 1
+        return key, depth + 1
+
+    for type_info, fields in structs:
+        for fi in fields:
+            annotation = strip_none(fi.type) or fi.type
+            if is_anonymous(annotation):
+                visit(annotation, f"{type_info.name}{_pascal_case(fi.name)}", type_info)
+
+    def discount(key: Hashable, count: int) -> None:
+        for part_key in parts[key]:
+            counts[part_key] -= count
+            discount(part_key, count)
+
+    # Outer types first, so the occurrences of their parts can be discounted when they're hoisted
+    to_hoist = set()
+    for key in sorted(counts, key=lambda key: -depths[key]):
+        count = counts[key]
+        if count < min_occurrences:
+            continue
+        _, annotation, null_is_undefined = first_seen[key]
+        if measure(annotation, null_is_undefined) < min_length:
+            continue
+        to_hoist.add(key)
+        discount(key, count - 1)
+
+    hoisted: dict[Hashable, HoistedType] = {}
+    taken_names = set(taken_names)
+    for key in [key for key in first_seen if key in to_hoist]:
+        base_name, annotation, null_is_undefined = first_seen[key]
+        name = base_name
+        suffix = 2
+        while name in taken_names:
+            name = f"{base_name}{suffix}"
+            suffix += 1
+        taken_names.add(name)
+        hoisted[key] = hoisted_type = HoistedType(name=name, type=annotation, null_is_undefined=null_is_undefined)
+        if not _involves_none(annotation):
+            hoisted[get_alias_key(annotation, True)] = hoisted_type
+    return hoisted
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import dataclasses
+import enum
+import hashlib
+import types
+from collections.abc import Iterable
+from typing import Any
+
+from typtyp.enums import get_enum_labels, get_enum_members
+from typtyp.field_info import FieldInfo
+from typtyp.type_configuration import TypeConfiguration
+from typtyp.type_info import TypeInfo
+
+_FUNCTION_TYPES = (types.FunctionType, types.BuiltinFunctionType, types.MethodType, types.BuiltinMethodType)
+
+
+def describe(value: Any) -> str:
+    """
+    Describe a value for fingerprinting.
+
+    This is `repr()`, except functions are described by their qualified names (and a hash of their code,
+    to tell e.g. lambdas apart), since their reprs contain memory addresses, and set members are sorted,
+    since their order may vary between processes.
+    """
+    if isinstance(value, _FUNCTION_TYPES):
+        code = getattr(value, "__code__", None)
+        code_hash = hashlib.sha256(code.co_code + repr(code.co_names).encode()).hexdigest()[:12] if code else ""
+        return f"{value.__module__}.{value.__qualname__}:{code_hash}"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{describe(k)}: {describe(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(describe(v) for v in value) + "]"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(describe(v) for v in value)) + "}"
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = ", ".join(f"{f.name}={describe(getattr(value, f.name))}" for f in dataclasses.fields(value))
+        return f"{type(value).__qualname__}({fields})"
+    return repr(value)
+
+
+def _hash_lines(lines: Iterable[str]) -> str:
+    hasher = hashlib.sha256()
+    for line in lines:
+        hasher.update(line.encode("utf-8", "surrogatepass"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+def _iter_local_fingerprint_lines(type_info: TypeInfo, fields: list[FieldInfo] | None) -> Iterable[str]:
+    yield f"name={type_info.name}"
+    yield f"type={describe(type_info.type)}"
+    yield f"doc={type_info.doc!r}"
+    for config_field in dataclasses.fields(TypeConfiguration):
+        yield f"{config_field.name}={describe(getattr(type_info, config_field.name))}"
+    if fields is not None:
+        for fi in fields:
+            yield f"field={fi.name!r}:{describe(fi.type)}:{fi.doc!r}"
+    if isinstance(type_info.type, type) and issubclass(type_info.type, enum.Enum):
+        for name, member in get_enum_members(type_info.type):
+            yield f"member={name}:{member.value!r}"
+        if type_info.enum_labels_field:
+            yield f"labels={describe(get_enum_labels(type_info.type, type_info.enum_labels_field))}"
+
+
+def get_local_fingerprint(type_info: TypeInfo, fields: list[FieldInfo] | None) -> str:
+    """
+    Fingerprint a type by its name, type, documentation, configuration and (struct) fields.
+    """
+    return _hash_lines(_iter_local_fingerprint_lines(type_info, fields))
+
+
+def combine_fingerprints(local_fingerprint: str, references: Iterable[tuple[str, str]]) -> str:
+    """
+    Combine a type's local fingerprint with the (name, local fingerprint) pairs of the types it references.
+    """
+    return _hash_lines([local_fingerprint, *(f"{name}={fingerprint}" for name, fingerprint in references)])
+
+
+@dataclasses.dataclass(frozen=True)
+class Fragment:
+    fingerprint: str
+    text: str
+    utility_types: dict[str, type]
+
+
+class FragmentCache:
+    """
+    Rendered output fragments per type name, reusable for as long as the type's fingerprint
+    and the rendering environment (e.g. options) stay the same.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._fragments: dict[str, Fragment] = {}
+        self._environment: Any = None
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def set_environment(self, environment: Any) -> None:
+        """
+        Set the environment the fragments are rendered in; if it changed, all fragments are discarded.
+        """
+        if environment != self._environment:
+            self._fragments.clear()
+            self._environment = environment
+
+    def get(self, name: str, fingerprint: str) -> Fragment | None:
+        fragment = self._fragments.get(name)
+        if fragment is None or fragment.fingerprint != fingerprint:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return fragment
+
+    def peek(self, name: str) -> Fragment | None:
+        """
+        Get the stored fragment for a type, whatever its fingerprint, without counting a hit or miss.
+        """
+        return self._fragments.get(name)
+
+    def put(self, name: str, fragment: Fragment) -> None:
+        self._fragments[name] = fragment
+
+    def prune(self, names: Iterable[str]) -> None:
+        """
+        Discard fragments for types other than those named.
+        """
+        keep = set(names)
+        for name in [name for name in self._fragments if name not in keep]:
+            del self._fragments[name]
+
+    def clear(self) -> None:
+        self._fragments.clear()
+        self._environment = None
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+from typing import TextIO
+
+
+@dataclasses.dataclass(frozen=True)
+class TypeStats:
+    name: str
+    # Seconds spent introspecting the type's fields (when it was first introspected; introspection is memoized).
+    introspection_time: float
+    # Seconds spent rendering the type (e.g. translating field types with `to_ts_type`).
+    render_time: float
+    # Size of the rendered output, in UTF-8 bytes.
+    output_bytes: int
+    # Maximum nesting depth of the type's annotations (i.e. the recursion depth of `to_ts_type`).
+    depth: int
+    # Whether a previously rendered fragment was reused (in which case nothing was rendered).
+    cached: bool = False
+
+    @property
+    def total_time(self) -> float:
+        return self.introspection_time + self.render_time
+
+
+@dataclasses.dataclass(frozen=True)
+class GenerationStats:
+    type_count: int
+    total_time: float
+    # Translation cache statistics; these only cover the main process when rendering with `jobs` > 1.
+    translation_cache_hits: int
+    translation_cache_misses: int
+    # Fragment cache statistics for this generation, if incremental generation is enabled.
+    fragment_cache_hits: int
+    fragment_cache_misses: int
+    # Number of types whose introspection results are memoized in the world.
+    introspection_cache_size: int
+
+
+class WriteObserver:
+    """
+    Base class for objects observing TypeScript generation (see `write_ts`'s `observer` argument).
+    """
+
+    def type_written(self, stats: TypeStats) -> None:
+        """
+        Called after each type has been written (or reused from the fragment cache).
+        """
+
+    def generation_finished(self, stats: GenerationStats) -> None:
+        """
+        Called once all types have been written.
+        """
+
+
+class StatsCollector(WriteObserver):
+    """
+    Collects the statistics of all written types.
+    """
+
+    def __init__(self) -> None:
+        self.type_stats: list[TypeStats] = []
+        self.generation_stats: GenerationStats | None = None
+
+    def type_written(self, stats: TypeStats) -> None:
+        self.type_stats.append(stats)
+
+    def generation_finished(self, stats: GenerationStats) -> None:
+        self.generation_stats = stats
+
+
+class TimingReporter(StatsCollector):
+    """
+    Writes a report of the slowest types and cache statistics once generation is finished.
+    """
+
+    def __init__(self, *, top_n: int = 10, file: TextIO | None = None) -> None:
+        super().__init__()
+        self.top_n = top_n
+        self.file = file
+
+    def format_report(self) -> str:
+        slowest = sorted(self.type_stats, key=lambda stats: stats.total_time, reverse=True)[: self.top_n]
+        name_width = max((len(stats.name) for stats in slowest), default=0)
+        lines = [f"Slowest {len(slowest)} of {len(self.type_stats)} types:"]
+        for stats in slowest:
+            lines.append(
+                f"  {stats.name:<{name_width}}  "
+                f"total {stats.total_time * 1000:8.3f} ms  "
+                f"introspection {stats.introspection_time * 1000:8.3f} ms  "
+                f"render {stats.render_time * 1000:8.3f} ms  "
+                f"{stats.output_bytes:>7} bytes  "
+                f"depth {stats.depth:>2}" + ("  (cached)" if stats.cached else ""),
+            )
+        if gs := self.generation_stats:
+            lines.append(f"Generated {gs.type_count} types in {gs.total_time * 1000:.3f} ms")
+            lines.append(f"  translation cache: {gs.translation_cache_hits} hits, {gs.translation_cache_misses} misses")
+            lines.append(f"  fragment cache: {gs.fragment_cache_hits} hits, {gs.fragment_cache_misses} misses")
+            lines.append(f"  introspection cache: {gs.introspection_cache_size} types")
+        return "\n".join(lines) + "\n"
+
+    def generation_finished(self, stats: GenerationStats) -> None:
+        super().generation_finished(stats)
+        (self.file or sys.stderr).write(self.format_report())
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import dataclasses
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Union
+
+from typtyp.graph import DependencyGraph
+
+# Type expressions
+
+
+@dataclasses.dataclass(frozen=True)
+class Null:
+    """
+    `None`; rendered as `null`, or as `undefined` for types configured with `null_is_undefined`.
+    """
+
+
+@dataclasses.dataclass(frozen=True)
+class Keyword:
+    # A built-in or utility type name, e.g. `number`, `unknown` or `UUID`.
+    name: str
+
+
+@dataclasses.dataclass(frozen=True)
+class Reference:
+    # Name of a declared type (or a hoisted type alias).
+    name: str
+
+
+@dataclasses.dataclass(frozen=True)
+class Literal:
+    # JSON-encoded literal values, without duplicates.
+    values: tuple[str, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class UnionType:
+    members: tuple[TypeNode, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class Array:
+    element: TypeNode
+
+
+@dataclasses.dataclass(frozen=True)
+class Tuple:
+    elements: tuple[TypeNode, ...]
+    # If set, the tuple is variable-length, of elements of this type.
+    rest: TypeNode | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class Record:
+    key: TypeNode
+    value: TypeNode
+
+
+@dataclasses.dataclass(frozen=True)
+class Function:
+    parameters: tuple[TypeNode, ...]
+    returns: TypeNode
+
+
+@dataclasses.dataclass(frozen=True)
+class Commented:
+    type: TypeNode
+    comments: tuple[str, ...]
+
+
+TypeNode = Union[Null, Keyword, Reference, Literal, UnionType, Array, Tuple, Record, Function, Commented]
+
+# Declarations
+
+
+@dataclasses.dataclass(frozen=True)
+class FieldDecl:
+    name: str
+    type: TypeNode
+    doc: str | None = None
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Decl:
+    name: str
+    doc: str | None = None
+    # Names of the utility types (e.g. `UUID`) the declaration requires.
+    utility_types: tuple[str, ...] = ()
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class StructDecl(Decl):
+    fields: tuple[FieldDecl, ...]
+    null_is_undefined: bool = False
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class EnumDecl(Decl):
+    # Member names and JSON-encoded values.
+    members: tuple[tuple[str, str], ...]
+    # Name of the label mapping to declare, and the member names and JSON-encoded labels, if any.
+    labels_name: str | None = None
+    labels: tuple[tuple[str, str], ...] = ()
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class AliasDecl(Decl):
+    type: TypeNode
+    null_is_undefined: bool = False
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ImportDecl(Decl):
+    module: str
+    original_name: str
+
+
+def iter_references(node: TypeNode) -> Iterator[str]:
+    """
+    Yield the names of the declared types a type expression refers to.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Reference):
+            yield node.name
+        elif isinstance(node, UnionType):
+            stack.extend(node.members)
+        elif isinstance(node, Array):
+            stack.append(node.element)
+        elif isinstance(node, Tuple):
+            stack.extend(node.elements)
+            if node.rest is not None:
+                stack.append(node.rest)
+        elif isinstance(node, Record):
+            stack.extend((node.key, node.value))
+        elif isinstance(node, Function):
+            stack.extend(node.parameters)
+            stack.append(node.returns)
+        elif isinstance(node, Commented):
+            stack.append(node.type)
+
+
+def get_decl_references(decl: Decl) -> list[str]:
+    """
+    Get the names of the declared types a declaration refers to, in order of first reference.
+    """
+    if isinstance(decl, StructDecl):
+        nodes = [fd.type for fd in decl.fields]
+    elif isinstance(decl, AliasDecl):
+        nodes = [decl.type]
+    else:
+        return []
+    names: dict[str, None] = {}
+    for node in nodes:
+        names.update(dict.fromkeys(iter_references(node)))
+    names.pop(decl.name, None)
+    return list(names)
+
+
+@dataclasses.dataclass(frozen=True)
+class CompiledWorld:
+    """
+    A world compiled into declarations, which can be rendered (many times, with different options)
+    without introspecting any types. Picklable, so it can be cached.
+    """
+
+    # The world's types, in output order.
+    decls: tuple[Decl, ...]
+    # Type aliases for hoisted anonymous types (see `TypeScriptOptions.hoist_min_occurrences`).
+    hoisted_decls: tuple[AliasDecl, ...] = ()
+    # Utility types required by the declarations.
+    utility_decls: tuple[Decl, ...] = ()
+
+    def dependency_graph(self) -> DependencyGraph:
+        """
+        Get the reference graph of the declarations, as they refer to each other in their compiled form.
+
+        (Unlike `World.dependency_graph`, types rendered inline, such as inline named tuples, aren't dependencies.)
+        """
+        decls = (*self.decls, *self.hoisted_decls)
+        names = {decl.name for decl in decls}
+        return DependencyGraph(
+            {decl.name: tuple(name for name in get_decl_references(decl) if name in names) for decl in decls},
+        )
+
+    def get_reachable_names(self, roots: Iterable[str]) -> set[str]:
+        graph = self.dependency_graph()
+        seen = {name for name in roots if name in graph}
+        queue = deque(seen)
+        while queue:
+            for dep in graph.dependencies(queue.popleft()):
+                if dep not in seen:
+                    seen.add(dep)
+                    queue.append(dep)
+        return seen
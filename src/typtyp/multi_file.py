@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import dataclasses
+import io
+import os
+import pathlib
+from typing import Callable
+
+from typtyp.output import write_if_changed
+from typtyp.type_info import TypeInfo
+from typtyp.typescript import (
+    TypeScriptOptions,
+    find_hoisted_types,
+    get_ordered_type_infos,
+    make_context,
+    render_fragments,
+    write_hoisted_type,
+    write_type,
+)
+from typtyp.world import World
+
+UTILITY_TYPES_GROUP = "_utility_types"
+
+
+def partition_by_module(type_info: TypeInfo) -> str:
+    return getattr(type_info.type, "__module__", None) or "types"
+
+
+def _export_also(exported_types: set[str] | bool, names: set[str]) -> set[str] | bool:
+    if exported_types is True:
+        return True
+    if exported_types is False:
+        return set(names)
+    return exported_types | names
+
+
+def render_ts_files(
+    world: World,
+    *,
+    partition: Callable[[TypeInfo], str] | None = None,
+    options: TypeScriptOptions | None = None,
+    utility_types_group: str = UTILITY_TYPES_GROUP,
+) -> dict[str, str]:
+    """
+    Render the world into one TypeScript file per group of types; by default, per Python module.
+
+    Types referring to types in other groups import them with `import type` statements,
+    and utility types (e.g. `UUID`) are imported from a shared file.
+    Types configured with `import_from` are imported directly wherever they're needed.
+    Repeated anonymous types (see `TypeScriptOptions.hoist_min_occurrences`) are hoisted per file.
+
+    Returns a mapping of file names to their contents.
+    """
+    if partition is None:
+        partition = partition_by_module
+    if options is None:
+        options = TypeScriptOptions()
+    type_infos = get_ordered_type_infos(world, options)
+
+    groups: dict[str, list[TypeInfo]] = {}
+    group_by_name: dict[str, str] = {}
+    for type_info in type_infos:
+        if type_info.import_from:
+            continue
+        group = partition(type_info)
+        groups.setdefault(group, []).append(type_info)
+        group_by_name[type_info.name] = group
+
+    # Types referred to from other groups need to be imported there (and exported here).
+    imports_by_group: dict[str, dict[str, TypeInfo]] = {}
+    cross_referenced: set[str] = set()
+    for group, group_type_infos in groups.items():
+        imports = imports_by_group[group] = {}
+        for type_info in group_type_infos:
+            for name in world.get_referenced_names(type_info):
+                ref_info = world.get_type_info(name)
+                if ref_info.import_from:
+                    imports[name] = ref_info
+                elif (ref_group := group_by_name[name]) != group:
+                    imports[name] = dataclasses.replace(
+                        ref_info,
+                        import_from=(f"./{ref_group}", name),
+                        field_overrides={},
+                        doc=None,
+                    )
+                    cross_referenced.add(name)
+    options = dataclasses.replace(
+        options,
+        type_only_imports=True,
+        exported_types=_export_also(options.exported_types, cross_referenced),
+    )
+
+    files: dict[str, str] = {}
+    utility_types: dict[str, type] = {}
+    for group, group_type_infos in groups.items():
+        group_world = World(incremental=False, introspection_cache=world._struct_fields)
+        for type_info in [*imports_by_group[group].values(), *group_type_infos]:
+            group_world.add_type_info(type_info)
+        ctx = make_context(io.StringIO(), group_world, options)
+        hoisted = find_hoisted_types(ctx, group_type_infos) if options.hoist_min_occurrences else {}
+        ctx = ctx.sub(type_aliases={key: hoisted_type.name for key, hoisted_type in hoisted.items()})
+        fragments = render_fragments(ctx, list(group_world))
+        # Hoisted types are written last, but their utility types need to be imported first
+        hoisted_ctx = ctx.sub(fp=io.StringIO(), required_utility_types={})
+        for hoisted_type in sorted(set(hoisted.values()), key=lambda hoisted_type: hoisted_type.name):
+            write_hoisted_type(hoisted_ctx, hoisted_type)
+        group_utility_types: dict[str, type] = dict(hoisted_ctx.required_utility_types)
+        for fragment in fragments:
+            group_utility_types.update(fragment.utility_types)
+        for name, typ in sorted(group_utility_types.items()):
+            write_type(ctx, TypeInfo(name=name, type=typ, import_from=(f"./{utility_types_group}", name)))
+        for fragment in fragments:
+            ctx.write(fragment.text)
+        ctx.write(hoisted_ctx.fp.getvalue())  # type: ignore[attr-defined]
+        files[f"{group}.ts"] = ctx.fp.getvalue()  # type: ignore[attr-defined]
+        utility_types.update(group_utility_types)
+
+    if utility_types:
+        ctx = make_context(io.StringIO(), World(incremental=False), dataclasses.replace(options, exported_types=True))
+        for name, typ in sorted(utility_types.items()):
+            write_type(ctx, TypeInfo(name=name, type=typ))
+        files[f"{utility_types_group}.ts"] = ctx.fp.getvalue()  # type: ignore[attr-defined]
+    return files
+
+
+def write_ts_files(directory: str | os.PathLike[str], world: World, **render_ts_files_kwargs) -> dict[str, bool]:
+    """
+    Render the world into multiple files (see `render_ts_files`) in `directory`.
+
+    Files whose content hasn't changed are not rewritten.
+    Returns a mapping of file names to whether they were written.
+    """
+    directory = pathlib.Path(directory)
+    return {
+        name: write_if_changed(directory / name, content)
+        for name, content in render_ts_files(world, **render_ts_files_kwargs).items()
+    }
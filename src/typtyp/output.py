@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import secrets
+import stat
+from collections.abc import Iterable
+from typing import Any
+
+DEFAULT_SINK_BUFFER_SIZE = 1 << 20
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class FileSink:
+    """
+    A minimal text file writing to a file descriptor in large batches:
+    written strings are buffered until about `buffer_size` characters have accumulated,
+    then encoded and written at once.
+
+    If a `hasher` (e.g. `hashlib.sha256()`) is given, it's updated with the encoded data as it's written.
+
+    Use as a context manager (or call `close`) to flush the rest; the file descriptor is not closed.
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        *,
+        buffer_size: int = DEFAULT_SINK_BUFFER_SIZE,
+        encoding: str = "utf-8",
+        hasher: Any = None,
+    ) -> None:
+        self.fd = fd
+        self.buffer_size = buffer_size
+        self.encoding = encoding
+        self.hasher = hasher
+        self.bytes_written = 0
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write(self, s: str) -> int:
+        self._parts.append(s)
+        self._size += len(s)
+        if self._size >= self.buffer_size:
+            self.flush()
+        return len(s)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        if not self._parts:
+            return
+        data = "".join(self._parts).encode(self.encoding)
+        self._parts.clear()
+        self._size = 0
+        if self.hasher is not None:
+            self.hasher.update(data)
+        self.bytes_written += len(data)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view) :]
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> FileSink:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _get_file_digest(path: pathlib.Path) -> bytes:
+    hasher = hashlib.sha256()
+    with path.open("rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            hasher.update(block)
+    return hasher.digest()
+
+
+def _has_content(path: pathlib.Path, size: int, digest: bytes) -> bool:
+    try:
+        if path.stat().st_size != size:  # (no need to read the file, then)
+            return False
+        return _get_file_digest(path) == digest
+    except FileNotFoundError:
+        return False
+
+
+def has_content(path: str | os.PathLike[str], content: str | Iterable[str]) -> bool:
+    """
+    Check whether the file at `path` exists and has exactly the given content (a string, or an iterable of chunks).
+
+    The file and the content are compared by hash, without reading either fully into memory.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in [content] if isinstance(content, str) else content:
+        data = chunk.encode("utf-8")
+        hasher.update(data)
+        size += len(data)
+    return _has_content(pathlib.Path(path), size, hasher.digest())
+
+
+_TEMP_FILE_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+
+
+def _create_temp_file(path: pathlib.Path) -> tuple[int, str]:
+    """
+    Create a new temporary file next to `path`, returning its descriptor and name.
+
+    Unlike `tempfile.mkstemp`, the file gets the same permissions (subject to the umask) as any new file would.
+    """
+    while True:
+        name = str(path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp"))
+        try:
+            return os.open(name, _TEMP_FILE_FLAGS, 0o666), name
+        except FileExistsError:
+            continue
+
+
+def write_if_changed(path: str | os.PathLike[str], content: str | Iterable[str]) -> bool:
+    """
+    Write `content` (a string, or an iterable of chunks, e.g. from `World.iter_typescript`) to `path`,
+    unless the file already has exactly that content, in which case it's not touched at all
+    (so its modification time doesn't change, and file watchers aren't triggered).
+
+    The content is streamed into a temporary file next to `path` while being hashed, and the temporary file
+    replaces `path` atomically only if the hashes differ, so readers never see a partially written file.
+
+    Returns whether the file was written.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = _create_temp_file(path)
+    try:
+        try:
+            with FileSink(fd, hasher=hashlib.sha256()) as sink:
+                sink.writelines([content] if isinstance(content, str) else content)
+        finally:
+            os.close(fd)
+        if _has_content(path, sink.bytes_written, sink.hasher.digest()):
+            os.unlink(tmp_name)
+            return False
+        try:
+            os.chmod(tmp_name, stat.S_IMODE(path.stat().st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return True
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import typing
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from typtyp.field_info import FieldInfo
+
+
+def iter_annotation_leaves(annotation: Any) -> Iterator[Any]:
+    """
+    Yield the leaf types (i.e. those with no type arguments) of a type annotation.
+
+    `Annotated` metadata and `Literal` values are not types, so they're skipped.
+    """
+    if isinstance(annotation, typing.NewType):
+        yield from iter_annotation_leaves(annotation.__supertype__)
+        return
+    origin = typing.get_origin(annotation)
+    if origin is None:
+        yield annotation
+        return
+    if origin is typing.Literal:
+        return
+    args = typing.get_args(annotation)
+    if origin is typing.Annotated:
+        args = args[:1]
+    for arg in args:
+        if isinstance(arg, list):  # Callable argument lists
+            for sub in arg:
+                yield from iter_annotation_leaves(sub)
+        else:
+            yield from iter_annotation_leaves(arg)
+
+
+def iter_field_leaves(fields: Iterable[FieldInfo]) -> Iterator[Any]:
+    for fi in fields:
+        yield from iter_annotation_leaves(fi.type)
+
+
+def get_annotation_depth(annotation: Any) -> int:
+    """
+    Get the nesting depth of a type annotation; e.g. 1 for `int`, 3 for `list[dict[str, int]]`.
+    """
+    if isinstance(annotation, typing.NewType):
+        return 1 + get_annotation_depth(annotation.__supertype__)
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) is typing.Annotated:
+        return get_annotation_depth(args[0])
+    depth = 0
+    for arg in args:
+        if isinstance(arg, list):  # Callable argument lists
+            depth = max(depth, *(get_annotation_depth(sub) for sub in arg), 0)
+        else:
+            depth = max(depth, get_annotation_depth(arg))
+    return 1 + depth
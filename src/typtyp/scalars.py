@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import dataclasses
+import enum
+from typing import Any, Callable
+
+RECORD_KEY_TS_TYPE = "string | number | symbol"
+
+
+@dataclasses.dataclass(frozen=True)
+class ScalarMapping:
+    # The TypeScript type to emit.
+    ts_type: str
+
+    # A comment to add after the type; either a fixed string,
+    # or a function that gets passed the actual Python type being mapped.
+    comment: str | Callable[[type], str] | None = None
+
+    # If set, `ts_type` is the name of a utility type alias for this Python type,
+    # emitted once at the end of the output (e.g. `type UUID = string`).
+    utility_type: type | None = None
+
+    def get_comment(self, typ: type) -> str | None:
+        if callable(self.comment):
+            return self.comment(typ)
+        return self.comment
+
+
+class ScalarRegistry:
+    """
+    Maps Python classes to TypeScript scalar types.
+
+    Lookups walk the class's MRO, so subclasses inherit the mapping of their nearest registered
+    base class. The result is cached per class, so repeated lookups are a dict hit.
+    """
+
+    def __init__(self, mappings: dict[type, ScalarMapping | None] | None = None) -> None:
+        self._mappings: dict[type, ScalarMapping | None] = dict(mappings or {})
+        self._resolved: dict[type, ScalarMapping | None] = {}
+        # Incremented on every registration, so users of the registry can tell when it has changed
+        self.version = 0
+
+    def register(self, typ: type, mapping: ScalarMapping | None) -> None:
+        """
+        Register a mapping for `typ` and its subclasses.
+
+        Registering `None` marks the type (and its subclasses) as not being a scalar.
+        """
+        self._mappings[typ] = mapping
+        self._resolved.clear()
+        self.version += 1
+
+    def copy(self) -> ScalarRegistry:
+        return ScalarRegistry(self._mappings)
+
+    def resolve(self, typ: type) -> ScalarMapping | None:
+        try:
+            return self._resolved[typ]
+        except KeyError:
+            pass
+        mapping = None
+        if isinstance(typ, type) and issubclass(typ, enum.Enum) and typ not in self._mappings:
+            # Enums are never implicitly scalars, even if they derive from `int` or `str`;
+            # they need to be registered in the world (or explicitly here).
+            pass
+        else:
+            for klass in getattr(typ, "__mro__", ()):
+                if klass in self._mappings:
+                    mapping = self._mappings[klass]
+                    break
+        self._resolved[typ] = mapping
+        return mapping
+
+
+def _class_name(typ: type) -> str:
+    return typ.__name__
+
+
+def _dict_subclass_name(typ: type) -> str:
+    return typ.__name__ if typ is not dict else ""
+
+
+def _make_default_scalars() -> ScalarRegistry:
+    # These modules are imported only once the default registry is first needed,
+    # so importing typtyp (e.g. just to declare types) stays cheap.
+    import collections
+    import datetime
+    import decimal
+    import ipaddress
+    import pathlib
+    import re
+    import uuid
+
+    return ScalarRegistry(
+        {
+            bytes: ScalarMapping("unknown", comment=_class_name),
+            bytearray: ScalarMapping("unknown", comment=_class_name),
+            memoryview: ScalarMapping("unknown", comment=_class_name),
+            bool: ScalarMapping("boolean"),
+            complex: ScalarMapping("[number, number]", comment="complex"),
+            pathlib.Path: ScalarMapping("string", comment=_class_name),
+            ipaddress._IPAddressBase: ScalarMapping("string", comment=_class_name),
+            re.Pattern: ScalarMapping("string", comment=_class_name),
+            int: ScalarMapping("number"),
+            float: ScalarMapping("number"),
+            decimal.Decimal: ScalarMapping("number"),
+            datetime.timedelta: ScalarMapping("number"),
+            uuid.UUID: ScalarMapping("UUID", utility_type=str),
+            str: ScalarMapping("string"),
+            datetime.date: ScalarMapping("ISO8601Date", utility_type=str),
+            datetime.time: ScalarMapping("ISO8601Time", utility_type=str),
+            datetime.datetime: ScalarMapping("ISO8601", utility_type=str),
+            collections.Counter: ScalarMapping(f"Record<{RECORD_KEY_TS_TYPE}, number>", comment="Counter"),
+            dict: ScalarMapping(f"Record<{RECORD_KEY_TS_TYPE}, unknown>", comment=_dict_subclass_name),
+        },
+    )
+
+
+_default_scalars: ScalarRegistry | None = None
+
+
+def get_default_scalars() -> ScalarRegistry:
+    """
+    Get the default scalar registry, creating it on first use.
+    """
+    global _default_scalars
+    if _default_scalars is None:
+        _default_scalars = _make_default_scalars()
+    return _default_scalars
+
+
+def __getattr__(name: str) -> Any:
+    if name == "default_scalars":
+        return get_default_scalars()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def register_scalar(typ: type, mapping: ScalarMapping | None) -> None:
+    """
+    Register a scalar mapping in the default registry.
+    """
+    get_default_scalars().register(typ, mapping)
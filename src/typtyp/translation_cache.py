@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import collections
+from typing import TYPE_CHECKING, Any, Hashable, NamedTuple
+
+if TYPE_CHECKING:
+    from typtyp.ir import TypeNode
+
+
+class CacheEntry(NamedTuple):
+    node: TypeNode
+    # Utility types (e.g. `UUID`) registered while translating the type;
+    # these are replayed into the context on a cache hit.
+    utility_types: dict[str, type]
+
+
+def get_cache_key(field_type: Any) -> Hashable:
+    """
+    Get an order-sensitive cache key for a type annotation.
+
+    Plain annotation equality is not enough, since e.g. `int | str == str | int`
+    and `Literal[1, True] == Literal[True, 1]`, yet their TypeScript renderings differ.
+
+    Raises TypeError (when hashed) for annotations that aren't hashable.
+    """
+    args = getattr(field_type, "__args__", None)
+    if type(args) is not tuple:
+        return (type(field_type), field_type)
+    return (field_type, tuple(get_cache_key(arg) for arg in args))
+
+
+class TranslationCache:
+    """
+    Bounded LRU cache for type annotation -> TypeScript type expression translations.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[Hashable, CacheEntry] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
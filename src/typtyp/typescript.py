@@ -3,36 +3,38 @@ from __future__ import annotations
 import collections
 import collections.abc
 import dataclasses
-import datetime
-import decimal
 import enum
-import ipaddress
+import io
 import json
-import pathlib
-import re
 import textwrap
+import time
 import types
 import typing
-import uuid
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from typing import TYPE_CHECKING, Any, ForwardRef, NamedTuple, TextIO, TypeVar
 
+from typtyp import ir
 from typtyp.annotations import Comment
 from typtyp.consts import COLLECTION_ORIGINS, MAPPING_ORIGINS
 from typtyp.enums import get_enum_labels, get_enum_members
 from typtyp.excs import UnreferrableTypeError
-from typtyp.field_info import FieldInfo, FieldInfoDict
+from typtyp.extractors import default_struct_extractors
+from typtyp.field_info import FieldInfo, merge_overrides
 from typtyp.helpers import unique_in_order
+from typtyp.hoisting import HoistedType, find_repeated_types, get_alias_key, strip_none
+from typtyp.incremental import Fragment, FragmentCache
+from typtyp.instrumentation import GenerationStats, StatsCollector, TypeStats, WriteObserver
+from typtyp.references import get_annotation_depth
+from typtyp.scalars import ScalarRegistry, get_default_scalars
+from typtyp.translation_cache import CacheEntry, TranslationCache, get_cache_key
 from typtyp.type_info import TypeInfo
 from typtyp.write_options import WriteOptions
 
 if TYPE_CHECKING:
+    from typtyp.disk_cache import DiskCache
     from typtyp.world import World
 
 
-RECORD_KEY_TS_TYPE = "string | number | symbol"
-
-
 class TypeAndKind(NamedTuple):
     type: type
     kind: str | None
@@ -45,6 +47,27 @@ class TypeScriptOptions(WriteOptions):
     # If a set of type names, only those types are exported.
     exported_types: set[str] | bool = True
 
+    # Maximum number of entries in the per-generation type translation cache.
+    # Set to 0 to disable the cache.
+    translation_cache_size: int = 4096
+
+    # Registry of scalar type mappings (e.g. `uuid.UUID` -> `UUID`) to use.
+    # If None, the default registry (see `typtyp.scalars.register_scalar`) is used.
+    scalars: ScalarRegistry | None = None
+
+    # Emit `import type { ... }` rather than `import { ... }` for types configured with `import_from`.
+    type_only_imports: bool = False
+
+    # If set, only these types (by name) and the types reachable from them are emitted;
+    # other types are not rendered (or even introspected) at all.
+    roots: set[str] | None = None
+
+    # If nonzero, anonymous types (e.g. unions of literals, or `Record<string, Array<...>>`, also within other types)
+    # that occur at least this many times in fields, and whose rendering is at least `hoist_min_length`
+    # characters long, are emitted once as a named type alias that the fields refer to.
+    hoist_min_occurrences: int = 0
+    hoist_min_length: int = 24
+
 
 @dataclasses.dataclass(frozen=True)
 class TypeScriptContext:
@@ -53,6 +76,10 @@ class TypeScriptContext:
     options: TypeScriptOptions
     null_is_undefined: bool = False
     required_utility_types: dict[str, type] = dataclasses.field(default_factory=dict)
+    translation_cache: TranslationCache | None = None
+    observer: WriteObserver | None = None
+    # Alias keys (see `typtyp.hoisting.get_alias_key`) of hoisted anonymous types, mapped to their alias names.
+    type_aliases: dict[Any, str] = dataclasses.field(default_factory=dict)
 
     def sub(self, **replacements):
         return dataclasses.replace(self, **replacements)
@@ -60,19 +87,22 @@ class TypeScriptContext:
     def write(self, s: str) -> None:
         self.fp.write(s)
 
+    @property
+    def scalars(self) -> ScalarRegistry:
+        return self.options.scalars or get_default_scalars()
+
     def get_export_modifier(self, type_info: TypeInfo) -> str:
-        exported = self.options.exported_types
-        if exported is False:
-            return ""
-        if exported is True or type_info.name in exported:
-            return "export "
-        return ""
+        return get_export_modifier(self.options, type_info.name)
 
 
-@dataclasses.dataclass(frozen=True)
-class TSTypeAndComment:
-    name: str
-    comments: list[str] = dataclasses.field(default_factory=list)
+def _with_comments(node: ir.TypeNode, comments: Iterable[str]) -> ir.TypeNode:
+    comments = tuple(c for c in comments if c.strip())
+    if not comments:
+        return node
+    if isinstance(node, ir.Commented):
+        # Merge into a single comment
+        return ir.Commented(node.type, (*comments, *node.comments))
+    return ir.Commented(node, comments)
 
 
 def map_plain_type_ref(
@@ -80,88 +110,51 @@ def map_plain_type_ref(
     ts_context: TypeScriptContext,
     *,
     elide_any_comment=False,
-) -> str | TSTypeAndComment:
+) -> ir.TypeNode:
     try:
         # This will handle enums as well – they need to have been registered
-        return ts_context.world.get_name_for_type(field_type)
+        return ir.Reference(ts_context.world.get_name_for_type(field_type))
     except KeyError:
         pass
 
     # Special types
 
     if isinstance(field_type, ForwardRef):
-        return TSTypeAndComment("unknown", [f"forward reference: {field_type.__forward_arg__}"])
+        return _with_comments(ir.Keyword("unknown"), [f"forward reference: {field_type.__forward_arg__}"])
     if type(field_type) is TypeVar:
-        return TSTypeAndComment("unknown", [f"type: {field_type}"])
+        return _with_comments(ir.Keyword("unknown"), [f"type: {field_type}"])
     if type(field_type) is type(Ellipsis):
-        return TSTypeAndComment("unknown", ["..."])
+        return _with_comments(ir.Keyword("unknown"), ["..."])
     if field_type is Any:
-        return TSTypeAndComment("unknown", ["any" if not elide_any_comment else ""])
-
-    if issubclass(field_type, (bytes, bytearray, memoryview)):
-        return TSTypeAndComment("unknown", [field_type.__name__])
-
-    if issubclass(field_type, bool):
-        return "boolean"
-
-    if issubclass(field_type, complex):
-        return TSTypeAndComment("[number, number]", ["complex"])
-
-    if issubclass(field_type, (pathlib.Path, ipaddress._IPAddressBase, re.Pattern)):
-        return TSTypeAndComment("string", [field_type.__name__])
-
-    if issubclass(field_type, (int, float, decimal.Decimal, datetime.timedelta)) and not issubclass(
-        field_type,
-        enum.Enum,
-    ):
-        return "number"
-
-    if issubclass(field_type, uuid.UUID):
-        ts_context.required_utility_types["UUID"] = str
-        return "UUID"
-
-    if issubclass(field_type, str) and not issubclass(field_type, enum.Enum):
-        return "string"
-
-    if issubclass(field_type, type(None)):
-        if ts_context.null_is_undefined:
-            return "undefined"
-        return "null"
-
-    if field_type is datetime.date:
-        ts_context.required_utility_types["ISO8601Date"] = str
-        return "ISO8601Date"
+        return _with_comments(ir.Keyword("unknown"), ["any" if not elide_any_comment else ""])
 
-    if field_type is datetime.time:
-        ts_context.required_utility_types["ISO8601Time"] = str
-        return "ISO8601Time"
+    if field_type is type(None):
+        return ir.Null()
 
-    if field_type is datetime.datetime:
-        ts_context.required_utility_types["ISO8601"] = str
-        return "ISO8601"
-
-    if issubclass(field_type, collections.Counter):
-        return TSTypeAndComment(f"Record<{RECORD_KEY_TS_TYPE}, number>", ["Counter"])
-
-    if issubclass(field_type, dict):
-        comment = field_type.__name__ if field_type is not dict else ""
-        return TSTypeAndComment(f"Record<{RECORD_KEY_TS_TYPE}, unknown>", [comment])
+    if (scalar := ts_context.scalars.resolve(field_type)) is not None:
+        if scalar.utility_type is not None:
+            ts_context.required_utility_types[scalar.ts_type] = scalar.utility_type
+        if (comment := scalar.get_comment(field_type)) is not None:
+            return _with_comments(ir.Keyword(scalar.ts_type), [comment])
+        return ir.Keyword(scalar.ts_type)
 
     raise UnreferrableTypeError(f"Unable to refer to the type {field_type!r}; if it's a struct, add it to the world")
 
 
-def to_ts_function_declaration(field_type: type, ts_context: TypeScriptContext) -> str:
+def compile_function_type(field_type: type, ts_context: TypeScriptContext) -> ir.TypeNode:
     tps = typing.get_args(field_type)
     if len(tps) == 2:
         args_list, retval = tps
-        arglist = ", ".join(f"_{i}: {to_ts_type(arg, ts_context)}" for i, arg in enumerate(args_list))
-        return f"({arglist}) => {to_ts_type(retval, ts_context)}"
+        return ir.Function(
+            tuple(compile_type(arg, ts_context) for arg in args_list),
+            compile_type(retval, ts_context),
+        )
     if len(tps) == 0:
-        return "Function"
+        return ir.Keyword("Function")
     raise AssertionError(f"Expected Callable with 0 or 2 types, got {tps}")
 
 
-def format_comment(comments: list[str]) -> str:
+def format_comment(comments: Iterable[str]) -> str:
     comments = [c.strip() for c in comments if c.strip()]
     if not comments:
         return ""
@@ -169,15 +162,147 @@ def format_comment(comments: list[str]) -> str:
     return f" /* {comment_string} */"
 
 
-def maybe_add_comments(expr, comments: list[str]) -> str:
-    formatted_comments = format_comment(comments)
-    return f"{expr}{formatted_comments}"
+# Precedences of rendered type expressions, for deciding how to nest them.
+# A bare alphanumeric name, which can be suffixed with `[]`
+PREC_NAME = 1
+# Anything else (unions, comments, generics, arrays, tuples, functions...), which is wrapped in `Array<>`
+PREC_OTHER = 0
+
+
+def render_type(node: ir.TypeNode, *, null_is_undefined: bool = False) -> str:
+    """
+    Render a type expression as TypeScript.
+    """
+    parts: list[str] = []
+    render_type_into(parts, node, null_is_undefined=null_is_undefined)
+    return "".join(parts)
+
+
+def render_type_into(parts: list[str], node: ir.TypeNode, *, null_is_undefined: bool = False) -> int:  # noqa: C901, PLR0911, PLR0912
+    """
+    Render a type expression as TypeScript into `parts`, and return its precedence (`PREC_*`).
+    """
+    if isinstance(node, ir.Reference):
+        parts.append(node.name)
+        # (Only alphanumeric names are suffixed with `[]`, as they always have been.)
+        return PREC_NAME if node.name.isalnum() else PREC_OTHER
+    if isinstance(node, ir.Keyword):
+        parts.append(node.name)
+        # (Keywords may also be arbitrary type expressions configured for scalars.)
+        return PREC_NAME if node.name.isalnum() else PREC_OTHER
+    if isinstance(node, ir.Null):
+        parts.append("undefined" if null_is_undefined else "null")
+        return PREC_NAME
+    if isinstance(node, ir.Commented):
+        render_type_into(parts, node.type, null_is_undefined=null_is_undefined)
+        parts.append(format_comment(node.comments))
+        return PREC_OTHER
+    if isinstance(node, ir.Literal):
+        for i, value in enumerate(node.values):
+            if i:
+                parts.append(" | ")
+            parts.append(value)
+        return PREC_NAME if len(node.values) == 1 and node.values[0].isalnum() else PREC_OTHER
+    if isinstance(node, ir.UnionType):
+        for i, member in enumerate(unique_in_order(node.members)):
+            if i:
+                parts.append(" | ")
+            render_type_into(parts, member, null_is_undefined=null_is_undefined)
+        return PREC_OTHER
+    if isinstance(node, ir.Array):
+        start = len(parts)
+        if render_type_into(parts, node.element, null_is_undefined=null_is_undefined) == PREC_NAME:
+            parts.insert(start, "(")
+            parts.append(")[]")
+        else:
+            parts.insert(start, "Array<")
+            parts.append(">")
+        return PREC_OTHER
+    if isinstance(node, ir.Tuple):
+        if node.rest is not None:
+            parts.append("[...")
+            render_type_into(parts, node.rest, null_is_undefined=null_is_undefined)
+            parts.append("[]]")
+            return PREC_OTHER
+        parts.append("[")
+        for i, element in enumerate(node.elements):
+            if i:
+                parts.append(", ")
+            render_type_into(parts, element, null_is_undefined=null_is_undefined)
+        parts.append("]")
+        return PREC_OTHER
+    if isinstance(node, ir.Record):
+        parts.append("Record<")
+        render_type_into(parts, node.key, null_is_undefined=null_is_undefined)
+        parts.append(", ")
+        render_type_into(parts, node.value, null_is_undefined=null_is_undefined)
+        parts.append(">")
+        return PREC_OTHER
+    if isinstance(node, ir.Function):
+        parts.append("(")
+        for i, arg in enumerate(node.parameters):
+            parts.append(f", _{i}: " if i else f"_{i}: ")
+            render_type_into(parts, arg, null_is_undefined=null_is_undefined)
+        parts.append(") => ")
+        render_type_into(parts, node.returns, null_is_undefined=null_is_undefined)
+        return PREC_OTHER
+    raise TypeError(f"Unknown type node {node!r}")  # pragma: no cover
+
+
+def split_optional(node: ir.TypeNode) -> ir.TypeNode | None:
+    """
+    If the type expression is a union including `None` (possibly commented), return it without the `None`.
+    """
+    if isinstance(node, ir.Commented):
+        inner = split_optional(node.type)
+        return ir.Commented(inner, node.comments) if inner is not None else None
+    if isinstance(node, ir.UnionType) and len(node.members) > 1 and any(isinstance(m, ir.Null) for m in node.members):
+        members = tuple(m for m in node.members if not isinstance(m, ir.Null))
+        return members[0] if len(members) == 1 else ir.UnionType(members)
+    return None
+
+
+def to_ts_type(field_type: type, ts_context: TypeScriptContext) -> str:
+    return render_type(compile_type(field_type, ts_context), null_is_undefined=ts_context.null_is_undefined)
+
+
+def _to_ts_type(field_type: type, ts_context: TypeScriptContext) -> str:
+    return render_type(_compile_type(field_type, ts_context), null_is_undefined=ts_context.null_is_undefined)
+
+
+def compile_type(field_type: type, ts_context: TypeScriptContext) -> ir.TypeNode:
+    """
+    Compile a type annotation into a type expression, using the translation cache and hoisted aliases, if any.
+    """
+    cache = ts_context.translation_cache
+    if cache is None and not ts_context.type_aliases:
+        return _compile_type(field_type, ts_context)
+    key = (get_cache_key(field_type), ts_context.null_is_undefined)
+    try:
+        if (alias := ts_context.type_aliases.get(key)) is not None:
+            return ir.Reference(alias)
+        entry = cache.get(key) if cache is not None else None
+    except TypeError:  # Unhashable annotation (e.g. `Annotated` with unhashable metadata)
+        return _compile_type(field_type, ts_context)
+    if cache is None:
+        return _compile_type(field_type, ts_context)
+    if entry is None:
+        # Record the utility types required by this type (and its subtypes) separately,
+        # so they can be replayed when the entry is hit later on.
+        recording_context = ts_context.sub(required_utility_types={})
+        entry = CacheEntry(
+            node=_compile_type(field_type, recording_context),
+            utility_types=recording_context.required_utility_types,
+        )
+        cache.put(key, entry)
+    ts_context.required_utility_types.update(entry.utility_types)
+    return entry.node
 
 
-def to_ts_type(field_type: type, ts_context: TypeScriptContext) -> str:  # noqa: C901, PLR0911, PLR0912
+def _compile_type(field_type: type, ts_context: TypeScriptContext) -> ir.TypeNode:  # noqa: C901, PLR0911, PLR0912
     if isinstance(field_type, typing.NewType):
-        tp = to_ts_type(field_type.__supertype__, ts_context)  # pyright: ignore
-        return f"{tp} /* {field_type.__name__} */"
+        tp = compile_type(field_type.__supertype__, ts_context)  # pyright: ignore
+        return ir.Commented(tp, (field_type.__name__,))
 
     origin = typing.get_origin(field_type)
 
@@ -191,30 +316,32 @@ def to_ts_type(field_type: type, ts_context: TypeScriptContext) -> str:  # noqa:
     comments = [c.comment for c in annotations if isinstance(c, Comment)]
 
     if origin is collections.abc.Callable:
-        return maybe_add_comments(
-            to_ts_function_declaration(field_type, ts_context),
-            comments,
-        )
+        return _with_comments(compile_function_type(field_type, ts_context), comments)
 
     if origin in (typing.Union, types.UnionType):
-        expr = " | ".join(unique_in_order(to_ts_type(sub, ts_context) for sub in typing.get_args(field_type)))
-        return maybe_add_comments(expr, comments)
+        if ts_context.type_aliases and len(typing.get_args(field_type)) > 2 and (rest := strip_none(field_type)):
+            # An optional hoisted union? (Other optional hoisted types are found as the union is rendered.)
+            alias = ts_context.type_aliases.get(get_alias_key(rest, ts_context.null_is_undefined))
+            if alias is not None:
+                return _with_comments(ir.UnionType((ir.Reference(alias), ir.Null())), comments)
+        node: ir.TypeNode = ir.UnionType(tuple(compile_type(sub, ts_context) for sub in typing.get_args(field_type)))
+        return _with_comments(node, comments)
 
     if origin is tuple:
         tps = typing.get_args(field_type)
         if tps and tps[-1] is Ellipsis:
             if len(tps) != 2:
                 raise AssertionError(f"Expected tuple with one type and Ellipsis, got {tps}")
-            expr = f"[...{to_ts_type(tps[0], ts_context)}[]]"
+            node = ir.Tuple((), rest=compile_type(tps[0], ts_context))
         else:
-            expr = f"[{', '.join(to_ts_type(tp, ts_context) for tp in tps)}]"
-        return maybe_add_comments(expr, comments)
+            node = ir.Tuple(tuple(compile_type(tp, ts_context) for tp in tps))
+        return _with_comments(node, comments)
 
     if origin is typing.Literal:
-        expr = " | ".join(unique_in_order(json.dumps(arg) for arg in typing.get_args(field_type)))
-        if not expr:
+        values = tuple(unique_in_order(json.dumps(arg) for arg in typing.get_args(field_type)))
+        if not values:
             raise AssertionError(f"Literal with no arguments is not allowed: {field_type!r}")
-        return maybe_add_comments(expr, comments)
+        return _with_comments(ir.Literal(values), comments)
 
     if origin in COLLECTION_ORIGINS:  # TODO: Smells like this could be done better with the ABCs...
         if origin is not list:
@@ -222,19 +349,13 @@ def to_ts_type(field_type: type, ts_context: TypeScriptContext) -> str:  # noqa:
         tps = typing.get_args(field_type)
         if len(tps) != 1:
             raise AssertionError(f"Expected list with one type, got {tps}")
-        inner = to_ts_type(tps[0], ts_context)
-        if inner.rstrip("[]").isalnum():
-            expr = f"({inner})[]"
-        else:
-            expr = f"Array<{inner}>"
-        return maybe_add_comments(expr, comments)
+        return _with_comments(ir.Array(compile_type(tps[0], ts_context)), comments)
 
     if origin is collections.Counter:
         tps = typing.get_args(field_type)
         if len(tps) != 1:
             raise AssertionError(f"Expected Counter with one type, got {tps}")
-        expr = f"Record<{to_ts_type(tps[0], ts_context)}, number>"
-        return maybe_add_comments(expr, comments)
+        return _with_comments(ir.Record(compile_type(tps[0], ts_context), ir.Keyword("number")), comments)
 
     if origin in MAPPING_ORIGINS:  # TODO: Smells like this could be done better with the ABCs...
         if origin is not dict:
@@ -242,8 +363,8 @@ def to_ts_type(field_type: type, ts_context: TypeScriptContext) -> str:  # noqa:
         tps = typing.get_args(field_type)
         if len(tps) != 2:
             raise AssertionError(f"Expected dict with two types, got {tps}")
-        expr = f"Record<{to_ts_type(tps[0], ts_context)}, {to_ts_type(tps[1], ts_context)}>"
-        return maybe_add_comments(expr, comments)
+        node = ir.Record(compile_type(tps[0], ts_context), compile_type(tps[1], ts_context))
+        return _with_comments(node, comments)
 
     if origin is not None:
         raise NotImplementedError(f"Unknown origin {origin!r} for {field_type!r}")  # pragma: no cover
@@ -252,166 +373,613 @@ def to_ts_type(field_type: type, ts_context: TypeScriptContext) -> str:  # noqa:
         # NamedTuple defined inline? I guess, why not...
         comments.insert(0, field_type.__name__)
         fields: list[str] = field_type._fields  # pyright: ignore
-        contents = (f"unknown /* {name} */" for name in fields)
-        expr = f"[{', '.join(contents)}]"
-        return maybe_add_comments(expr, comments)
+        node = ir.Tuple(tuple(ir.Commented(ir.Keyword("unknown"), (name,)) for name in fields))
+        return _with_comments(node, comments)
 
-    plain_ref_ret = map_plain_type_ref(
+    plain_ref = map_plain_type_ref(
         field_type,
         ts_context,
         elide_any_comment=bool(
             comments,  # If we have comments, we expect them to explain the situation better than "any"
         ),
     )
-    if isinstance(plain_ref_ret, str):
-        type_name = plain_ref_ret
-    else:
-        type_name = plain_ref_ret.name
-        comments.extend(plain_ref_ret.comments)
-    return maybe_add_comments(type_name, comments)
+    return _with_comments(plain_ref, comments)
 
 
 def get_struct_types(tp) -> list[FieldInfo] | None:
-    if dataclasses.is_dataclass(tp):
-        return [FieldInfo(name=f.name, type=f.type) for f in dataclasses.fields(tp)]
+    return default_struct_extractors.get_fields(tp)
 
-    if typing.is_typeddict(tp):
-        # TODO: support __total__
-        # TODO: support __required_keys__
-        # TODO: support __optional_keys__
-        return [
-            FieldInfo(name=name, type=type) for (name, type) in typing.get_type_hints(tp, include_extras=True).items()
-        ]
 
-    try:
-        from typtyp.pydantic import get_pydantic_fields, is_pydantic_model
+def maybe_write_doc(fp: TextIO, doc: str | None) -> None:
+    if not doc:
+        return
+    lines = textwrap.dedent(doc).strip().splitlines()
+    if len(lines) > 1:
+        fp.write("/**\n")
+        for line in lines:
+            fp.write(f" * {line}\n")
+        fp.write(" */\n")
+    else:
+        fp.write(f"/** {lines[0]} */\n")
 
-        if is_pydantic_model(tp):
-            return list(get_pydantic_fields(tp))
-    except ImportError:  # pragma: no cover  # TODO: handle ImportError better
-        pass
 
-    try:
-        from typtyp.drf import get_serializer_fields, is_drf_serializer
+def compile_decl(ctx: TypeScriptContext, type_info: TypeInfo) -> ir.Decl:
+    """
+    Compile a type into a declaration; the utility types it requires are recorded in the context.
+    """
+    decl_ctx = ctx.sub(required_utility_types={})
+    decl = _compile_decl(decl_ctx, type_info)
+    if decl_ctx.required_utility_types:
+        ctx.required_utility_types.update(decl_ctx.required_utility_types)
+        decl = dataclasses.replace(decl, utility_types=tuple(sorted(decl_ctx.required_utility_types)))
+    return decl
 
-        if is_drf_serializer(tp):
-            return list(get_serializer_fields(tp))
-    except ImportError:  # pragma: no cover  # TODO: handle ImportError better
-        pass
 
-    try:
-        from typtyp.django import get_model_fields, is_django_model
+def _compile_decl(ctx: TypeScriptContext, type_info: TypeInfo) -> ir.Decl:
+    name = type_info.name
+    doc = type_info.doc
 
-        if is_django_model(tp):
-            return list(get_model_fields(tp))
-    except ImportError:  # pragma: no cover  # TODO: handle ImportError better
-        pass
+    if type_info.import_from:
+        mod, orig_name = type_info.import_from
+        return ir.ImportDecl(name=name, doc=doc, module=str(mod), original_name=orig_name)
 
-    return None
+    if isinstance(type_info.type, type) and issubclass(type_info.type, enum.Enum):
+        labels = get_enum_labels(type_info.type, type_info.enum_labels_field) if type_info.enum_labels_field else None
+        return ir.EnumDecl(
+            name=name,
+            doc=doc,
+            members=tuple((name, json.dumps(value.value)) for name, value in get_enum_members(type_info.type)),  # type: ignore
+            labels_name=f"{name}{type_info.enum_labels_type_suffix}" if labels else None,
+            labels=tuple((name, json.dumps(label)) for name, label in labels.items()) if labels else (),
+        )
 
+    if (field_infos := ctx.world.get_struct_fields(type_info.type)) is not None:
+        ctx = ctx.sub(null_is_undefined=type_info.null_is_undefined)
+        fields: Iterable[FieldInfo] = merge_overrides(field_infos, type_info.field_overrides)
+        order_fields_by = type_info.order_fields_by or ctx.options.order_fields_by
+        if order_fields_by is not None:
+            fields = sorted(fields, key=order_fields_by)
+        return ir.StructDecl(
+            name=name,
+            doc=doc,
+            fields=tuple(ir.FieldDecl(fi.name, compile_type(fi.type, ctx), fi.doc) for fi in fields),
+            null_is_undefined=type_info.null_is_undefined,
+        )
 
-def maybe_write_doc(ctx: TypeScriptContext, doc: str | None) -> None:
-    if not doc:
-        return
-    lines = textwrap.dedent(doc).strip().splitlines()
-    if len(lines) > 1:
-        ctx.write("/**\n")
-        for line in lines:
-            ctx.write(f" * {line}\n")
-        ctx.write(" */\n")
+    return ir.AliasDecl(
+        name=name,
+        doc=doc,
+        type=compile_type(type_info.type, ctx),
+        null_is_undefined=ctx.null_is_undefined,
+    )
+
+
+def get_export_modifier(options: TypeScriptOptions, name: str) -> str:
+    exported = options.exported_types
+    if exported is False:
+        return ""
+    if exported is True or name in exported:
+        return "export "
+    return ""
+
+
+def write_structlike(fp: TextIO, decl: ir.StructDecl, options: TypeScriptOptions, null_is_undefined: bool) -> None:
+    fp.write(f"{get_export_modifier(options, decl.name)}interface {decl.name} {{\n")
+    for fd in decl.fields:
+        maybe_write_doc(fp, fd.doc)
+        parts = [fd.name]
+        field_type = fd.type
+        # `None` is `undefined` for these, which is better expressed as an optional field
+        if null_is_undefined and (required_type := split_optional(field_type)) is not None:
+            field_type = required_type
+            parts.append("?")
+        parts.append(": ")
+        render_type_into(parts, field_type, null_is_undefined=null_is_undefined)
+        parts.append("\n")
+        fp.write("".join(parts))
+    fp.write("}\n")
+
+
+def write_enum(fp: TextIO, decl: ir.EnumDecl, options: TypeScriptOptions) -> None:
+    type_name = decl.name
+    export_modifier = get_export_modifier(options, type_name)
+
+    fp.write(f"{export_modifier}const enum {type_name} {{\n")
+    for name, value in decl.members:
+        fp.write(f"{name} = {value},\n")
+    fp.write("}\n")
+
+    if decl.labels_name:
+        fp.write(f"{export_modifier}const {decl.labels_name}")
+        fp.write(f": Record<{type_name}, string> = {{\n")
+        for name, label in decl.labels:
+            fp.write(f"[{type_name}.{name}]: {label},\n")
+        fp.write("}\n")
+
+
+def write_decl(
+    fp: TextIO,
+    decl: ir.Decl,
+    options: TypeScriptOptions,
+    *,
+    null_is_undefined: bool | None = None,
+) -> None:
+    """
+    Write a declaration as TypeScript.
+
+    If `null_is_undefined` is given, it overrides the declaration's own setting.
+    """
+    maybe_write_doc(fp, decl.doc)
+
+    if isinstance(decl, ir.ImportDecl):
+        import_keyword = "import type" if options.type_only_imports else "import"
+        if decl.name == decl.original_name:
+            fp.write(f"{import_keyword} {{ {decl.original_name} }} from {decl.module!r}\n")
+        else:
+            fp.write(f"{import_keyword} {{ {decl.original_name} as {decl.name} }} from {decl.module!r}\n")
+    elif isinstance(decl, ir.EnumDecl):
+        write_enum(fp, decl, options)
+    elif isinstance(decl, ir.StructDecl):
+        write_structlike(
+            fp,
+            decl,
+            options,
+            decl.null_is_undefined if null_is_undefined is None else null_is_undefined,
+        )
+    elif isinstance(decl, ir.AliasDecl):
+        expr = render_type(
+            decl.type,
+            null_is_undefined=decl.null_is_undefined if null_is_undefined is None else null_is_undefined,
+        )
+        fp.write(f"{get_export_modifier(options, decl.name)}type {decl.name} = {expr}\n")
+    else:  # pragma: no cover
+        raise TypeError(f"Unknown declaration {decl!r}")
+
+
+def write_type(ctx: TypeScriptContext, type_info: TypeInfo) -> None:
+    if ctx.observer is not None:
+        _write_type_observed(ctx, type_info, ctx.observer)
+    else:
+        _write_type(ctx, type_info)
+
+
+def _write_type_observed(ctx: TypeScriptContext, type_info: TypeInfo, observer: WriteObserver) -> None:
+    fields = None
+    typ = type_info.type
+    if not type_info.import_from and not (isinstance(typ, type) and issubclass(typ, enum.Enum)):
+        fields = ctx.world.get_struct_fields(typ)  # Memoized, so the rendering below won't introspect again
+    introspected = time.perf_counter()
+    sio = io.StringIO()
+    _write_type(ctx.sub(fp=sio), type_info)
+    text = sio.getvalue()
+    rendered = time.perf_counter()
+    ctx.write(text)
+    if fields is not None:
+        depth = max((get_annotation_depth(fi.type) for fi in fields), default=0)
+    elif type_info.import_from:
+        depth = 0
     else:
-        ctx.write(f"/** {lines[0]} */\n")
+        depth = get_annotation_depth(typ)
+    observer.type_written(
+        TypeStats(
+            name=type_info.name,
+            introspection_time=ctx.world.get_introspection_time(typ),
+            render_time=rendered - introspected,
+            output_bytes=len(text.encode("utf-8")),
+            depth=depth,
+        ),
+    )
 
 
-_NO_OVERRIDE = object()
+def _write_type(ctx: TypeScriptContext, type_info: TypeInfo) -> None:
+    write_decl(ctx.fp, compile_decl(ctx, type_info), ctx.options)
 
 
-def merge_overrides(
-    field_infos: Iterable[FieldInfo],
-    field_overrides: dict[str, FieldInfo | FieldInfoDict | None],
-) -> Iterable[FieldInfo]:
-    for fi in field_infos:
-        try:
-            override = field_overrides[fi.name]
-        except KeyError:
-            yield fi  # No override
-        else:
-            if override is None:  # Skip the field
-                continue
-            if isinstance(override, FieldInfo):  # Full override
-                yield override
-                continue
-            if isinstance(override, dict):  # Merge override
-                yield dataclasses.replace(fi, **override)
-                continue
-            raise TypeError(f"Expected FieldInfo or FieldInfoDict, got {override!r} for field {fi.name!r}")
-
-
-def write_structlike(ctx: TypeScriptContext, type_info: TypeInfo, field_infos: Iterable[FieldInfo]) -> None:
-    ctx = ctx.sub(null_is_undefined=type_info.null_is_undefined)
-    ctx.write(f"{ctx.get_export_modifier(type_info)}interface {type_info.name} {{\n")
-    fields: Iterable[FieldInfo] = merge_overrides(field_infos, type_info.field_overrides)
-    order_fields_by = type_info.order_fields_by or ctx.options.order_fields_by
-    if order_fields_by is not None:
-        fields = sorted(fields, key=order_fields_by)
-    for fi in fields:
-        ts_type = to_ts_type(fi.type, ts_context=ctx).strip()
-        field_suffix = ""
-        if "| undefined" in ts_type:
-            ts_type = ts_type.replace("| undefined", "")
-            field_suffix = "?"
-        maybe_write_doc(ctx, fi.doc)
-        ctx.write(f"{fi.name}{field_suffix}: {ts_type}\n")
-    ctx.write("}\n")
-
-
-def write_enum(ctx: TypeScriptContext, type_info: TypeInfo) -> None:
-    type_name = type_info.name
-    export_modifier = ctx.get_export_modifier(type_info)
-
-    ctx.write(f"{export_modifier}const enum {type_name} {{\n")
-    for name, value in get_enum_members(type_info.type):  # type: ignore
-        ctx.write(f"{name} = {json.dumps(value.value)},\n")
-    ctx.write("}\n")
-
-    if type_info.enum_labels_field:
-        if labels := get_enum_labels(type_info.type, type_info.enum_labels_field):
-            ctx.write(f"{export_modifier}const {type_name}{type_info.enum_labels_type_suffix}")
-            ctx.write(f": Record<{type_name}, string> = {{\n")
-            for name, label in labels.items():
-                ctx.write(f"[{type_name}.{name}]: {json.dumps(label)},\n")
-            ctx.write("}\n")
+def render_fragment(ctx: TypeScriptContext, type_info: TypeInfo, *, fingerprint: str = "") -> Fragment:
+    """
+    Render a single type into a standalone fragment, along with the utility types it requires.
+    """
+    fragment_ctx = ctx.sub(fp=io.StringIO(), required_utility_types={})
+    write_type(fragment_ctx, type_info)
+    return Fragment(
+        fingerprint=fingerprint,
+        text=fragment_ctx.fp.getvalue(),  # type: ignore[attr-defined]
+        utility_types=fragment_ctx.required_utility_types,
+    )
 
 
-def write_type(ctx: TypeScriptContext, type_info: TypeInfo) -> None:
-    maybe_write_doc(ctx, type_info.doc)
+_worker_context: TypeScriptContext | None = None
 
-    if type_info.import_from:
-        mod, orig_name = type_info.import_from
-        if type_info.name == orig_name:
-            ctx.write(f"import {{ {orig_name} }} from {str(mod)!r}\n")
+
+def _init_render_worker(world: World, options: TypeScriptOptions, type_aliases: dict[Any, str], observe: bool) -> None:
+    global _worker_context
+    _worker_context = make_context(io.StringIO(), world, options).sub(type_aliases=type_aliases)
+    if observe:
+        # Statistics are collected here and relayed to the actual observer by the main process.
+        _worker_context = _worker_context.sub(observer=StatsCollector())
+
+
+def _render_chunk(
+    items: list[tuple[str, str | None]],
+    fingerprint: bool,
+) -> tuple[list[Fragment | None], list[TypeStats]]:
+    ctx = _worker_context
+    assert ctx is not None
+    fragments: list[Fragment | None] = []
+    for name, known_fingerprint in items:
+        type_info = ctx.world._types_by_name[name]
+        type_fingerprint = ctx.world.get_fingerprint(type_info) if fingerprint else ""
+        if known_fingerprint is not None and type_fingerprint == known_fingerprint:
+            fragments.append(None)  # The caller already has this one
         else:
-            ctx.write(f"import {{ {orig_name} as {type_info.name} }} from {str(mod)!r}\n")
-        return
+            fragments.append(render_fragment(ctx, type_info, fingerprint=type_fingerprint))
+    stats: list[TypeStats] = []
+    if isinstance(ctx.observer, StatsCollector):
+        stats, ctx.observer.type_stats = ctx.observer.type_stats, []
+    return fragments, stats
 
-    if isinstance(type_info.type, type) and issubclass(type_info.type, enum.Enum):
-        write_enum(ctx, type_info)
-        return
 
-    if (nt := get_struct_types(type_info.type)) is not None:
-        write_structlike(ctx, type_info, nt)
-    else:
-        ctx.write(f"{ctx.get_export_modifier(type_info)}type {type_info.name} = {to_ts_type(type_info.type, ctx)}\n")
+def render_fragments_in_processes(
+    ctx: TypeScriptContext,
+    type_infos: list[TypeInfo],
+    *,
+    jobs: int,
+    fingerprint: bool = False,
+    known_fingerprints: list[str | None] | None = None,
+) -> list[Fragment | None]:
+    """
+    Render fragments for the given types in a pool of `jobs` processes, returning them in the same order.
+
+    With `fingerprint`, the workers also fingerprint the types (introspecting them in parallel, too),
+    and don't render those whose fingerprint is the one given in `known_fingerprints`; None is returned for those.
+
+    The platform's default start method is used (except that a process is never forked off a thread other
+    than the main thread, which is unsafe). Unless the workers are forked, the world and options must be picklable.
+    """
+    import concurrent.futures
+    import itertools
+    import multiprocessing
+    import threading
+
+    mp_context: multiprocessing.context.BaseContext = multiprocessing.get_context()
+    if mp_context.get_start_method() == "fork" and threading.current_thread() is not threading.main_thread():
+        mp_context = multiprocessing.get_context("spawn")
+    if known_fingerprints is None:
+        known_fingerprints = [None] * len(type_infos)
+    items = [(ti.name, known) for ti, known in zip(type_infos, known_fingerprints)]
+    # Several chunks per worker, to even out differences in rendering cost
+    chunk_size = max(1, -(-len(items) // (jobs * 4)))
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(jobs, len(chunks)),
+        mp_context=mp_context,
+        initializer=_init_render_worker,
+        initargs=(ctx.world, ctx.options, ctx.type_aliases, ctx.observer is not None),
+    ) as executor:
+        fragments = []
+        for chunk_fragments, chunk_stats in executor.map(_render_chunk, chunks, itertools.repeat(fingerprint)):
+            fragments.extend(chunk_fragments)
+            if ctx.observer is not None:
+                for stats in chunk_stats:
+                    ctx.observer.type_written(stats)
+        return fragments
+
+
+def _observe_cached_fragment(ctx: TypeScriptContext, type_info: TypeInfo, fragment: Fragment) -> None:
+    if ctx.observer is not None:
+        ctx.observer.type_written(
+            TypeStats(
+                name=type_info.name,
+                introspection_time=0.0,
+                render_time=0.0,
+                output_bytes=len(fragment.text.encode("utf-8")),
+                depth=0,
+                cached=True,
+            ),
+        )
 
 
-def write_ts(fp: typing.TextIO, world: World, *, options: TypeScriptOptions | None = None) -> None:
-    if options is None:
-        options = TypeScriptOptions()
-    ctx = TypeScriptContext(fp=fp, world=world, options=options)
-    type_infos: Iterable[TypeInfo] = ctx.world
+def render_fragments(
+    ctx: TypeScriptContext,
+    type_infos: list[TypeInfo],
+    *,
+    fragment_cache: FragmentCache | None = None,
+    jobs: int = 1,
+) -> list[Fragment]:
+    """
+    Render fragments for the given types, in order.
+
+    If a fragment cache is given, fragments for types whose fingerprint hasn't changed are reused from it,
+    and only the rest are rendered (and stored in the cache).
+    With `jobs` > 1, fingerprinting and rendering both happen in worker processes.
+    """
+    if fragment_cache is not None:
+        fragment_cache.set_environment(
+            (ctx.options, ctx.scalars, ctx.scalars.version, frozenset(ctx.type_aliases.items())),
+        )
+    if jobs > 1 and len(type_infos) > 1:
+        fragments = _render_fragments_in_processes(ctx, type_infos, fragment_cache=fragment_cache, jobs=jobs)
+    else:
+        fragments = []
+        for type_info in type_infos:
+            fragment = None
+            if fragment_cache is not None:
+                fingerprint = ctx.world.get_fingerprint(type_info)
+                if (fragment := fragment_cache.get(type_info.name, fingerprint)) is not None:
+                    _observe_cached_fragment(ctx, type_info, fragment)
+                else:
+                    fragment = render_fragment(ctx, type_info, fingerprint=fingerprint)
+                    fragment_cache.put(type_info.name, fragment)
+            else:
+                fragment = render_fragment(ctx, type_info)
+            fragments.append(fragment)
+    if fragment_cache is not None:
+        fragment_cache.prune(type_info.name for type_info in type_infos)
+    return fragments
+
+
+def _render_fragments_in_processes(
+    ctx: TypeScriptContext,
+    type_infos: list[TypeInfo],
+    *,
+    fragment_cache: FragmentCache | None,
+    jobs: int,
+) -> list[Fragment]:
+    stored = [fragment_cache.peek(ti.name) if fragment_cache is not None else None for ti in type_infos]
+    rendered = render_fragments_in_processes(
+        ctx,
+        type_infos,
+        jobs=jobs,
+        fingerprint=fragment_cache is not None,
+        known_fingerprints=[fragment.fingerprint if fragment is not None else None for fragment in stored],
+    )
+    fragments = []
+    for type_info, fragment, stored_fragment in zip(type_infos, rendered, stored):
+        if fragment is None:
+            assert fragment_cache is not None
+            assert stored_fragment is not None
+            fragment_cache.hits += 1
+            _observe_cached_fragment(ctx, type_info, stored_fragment)
+            fragment = stored_fragment
+        elif fragment_cache is not None:
+            fragment_cache.misses += 1
+            fragment_cache.put(type_info.name, fragment)
+        fragments.append(fragment)
+    return fragments
+
+
+def get_ordered_type_infos(world: World, options: TypeScriptOptions) -> list[TypeInfo]:
+    """
+    Get the world's types to emit, in output order, as determined by the
+    `roots`, `order_by` and `dependency_order` options.
+    """
+    type_infos: Iterable[TypeInfo] = world
+    graph = None
+    if options.roots is not None:
+        graph = world.dependency_graph(sorted(options.roots))
+        type_infos = [type_info for type_info in type_infos if type_info.name in graph]
     if options.order_by is not None:
         type_infos = sorted(type_infos, key=options.order_by)
+    if not options.dependency_order:
+        return list(type_infos)
+    imports = []
+    by_name = {}
+    for type_info in type_infos:
+        if type_info.import_from:
+            imports.append(type_info)
+        else:
+            by_name[type_info.name] = type_info
+    order = (graph or world.dependency_graph()).topological_order(by_name)
+    return [*imports, *(by_name[name] for name in order)]
+
+
+def make_context(fp: typing.TextIO, world: World, options: TypeScriptOptions) -> TypeScriptContext:
+    return TypeScriptContext(
+        fp=fp,
+        world=world,
+        options=options,
+        translation_cache=TranslationCache(options.translation_cache_size) if options.translation_cache_size else None,
+    )
+
+
+def find_hoisted_types(ctx: TypeScriptContext, type_infos: list[TypeInfo]) -> dict[Any, HoistedType]:
+    """
+    Find the repeated anonymous field types to hoist into type aliases, per the `hoist_*` options.
+    """
+    # Measure renderings without any caching or aliasing, so neither is polluted by the measurements.
+    measuring_ctx = ctx.sub(translation_cache=None, type_aliases={}, required_utility_types={}, observer=None)
+    structs = []
     for type_info in type_infos:
-        write_type(ctx, type_info)
+        typ = type_info.type
+        if type_info.import_from or (isinstance(typ, type) and issubclass(typ, enum.Enum)):
+            continue
+        if (fields := ctx.world.get_struct_fields(typ)) is not None:
+            structs.append((type_info, merge_overrides(fields, type_info.field_overrides)))
+    return find_repeated_types(
+        structs,
+        min_occurrences=ctx.options.hoist_min_occurrences,
+        min_length=ctx.options.hoist_min_length,
+        measure=lambda annotation, null_is_undefined: len(
+            _to_ts_type(annotation, measuring_ctx.sub(null_is_undefined=null_is_undefined)),
+        ),
+        taken_names={type_info.name for type_info in ctx.world},
+    )
+
+
+def compile_hoisted_type(ctx: TypeScriptContext, hoisted: HoistedType) -> ir.AliasDecl:
+    decl_ctx = ctx.sub(null_is_undefined=hoisted.null_is_undefined, required_utility_types={})
+    # Not `compile_type`, which would just refer to the alias itself
+    node = _compile_type(hoisted.type, decl_ctx)
+    ctx.required_utility_types.update(decl_ctx.required_utility_types)
+    return ir.AliasDecl(
+        name=hoisted.name,
+        type=node,
+        null_is_undefined=hoisted.null_is_undefined,
+        utility_types=tuple(sorted(decl_ctx.required_utility_types)),
+    )
+
+
+def write_hoisted_type(ctx: TypeScriptContext, hoisted: HoistedType) -> None:
+    write_decl(ctx.fp, compile_hoisted_type(ctx, hoisted), ctx.options)
+
+
+def write_ts(
+    fp: typing.TextIO,
+    world: World,
+    *,
+    options: TypeScriptOptions | None = None,
+    fragment_cache: FragmentCache | None = None,
+    jobs: int = 1,
+    observer: WriteObserver | None = None,
+    disk_cache: DiskCache | None = None,
+) -> None:
+    """
+    Write TypeScript definitions for all types in the world.
+
+    If a fragment cache is given, only types that have changed since the previous generation are rendered.
+    With `jobs` > 1, types are rendered in that many worker processes; the output is identical either way.
+    If an observer is given, it's notified of per-type timings and sizes, and of cache statistics at the end.
+    If a disk cache is given, fragments stored by previous runs are reused without introspecting their types.
+    """
+    for chunk in iter_ts(
+        world,
+        options=options,
+        fragment_cache=fragment_cache,
+        jobs=jobs,
+        observer=observer,
+        disk_cache=disk_cache,
+    ):
+        fp.write(chunk)
+
+
+def _take(sio: io.StringIO) -> str:
+    text = sio.getvalue()
+    sio.seek(0)
+    sio.truncate()
+    return text
+
+
+def iter_ts(
+    world: World,
+    *,
+    options: TypeScriptOptions | None = None,
+    fragment_cache: FragmentCache | None = None,
+    jobs: int = 1,
+    observer: WriteObserver | None = None,
+    disk_cache: DiskCache | None = None,
+) -> Iterator[str]:
+    """
+    Generate TypeScript definitions for all types in the world (see `write_ts`), yielding the output type by type,
+    so the whole output never needs to be held in memory.
+
+    With a fragment cache, a disk cache or `jobs` > 1, every type is rendered into a fragment before the first
+    one is yielded (and a fragment cache keeps them all), so only the default path streams type by type.
+
+    The observer (if any) is notified of the generation finishing once the iterator is exhausted.
+    """
+    if options is None:
+        options = TypeScriptOptions()
+    start = time.perf_counter()
+    fragment_cache_before = (fragment_cache.hits, fragment_cache.misses) if fragment_cache is not None else (0, 0)
+    sio = io.StringIO()
+    ctx = make_context(sio, world, options).sub(observer=observer)
+    type_infos = get_ordered_type_infos(world, options)
+    hoisted: dict[Any, HoistedType] = {}
+    if options.hoist_min_occurrences:
+        hoisted = find_hoisted_types(ctx, type_infos)
+        ctx = ctx.sub(type_aliases={key: hoisted_type.name for key, hoisted_type in hoisted.items()})
+    if disk_cache is not None:
+        fragments = disk_cache.render_fragments(ctx, type_infos, fragment_cache=fragment_cache, jobs=jobs)
+    elif fragment_cache is not None or jobs > 1:
+        fragments = render_fragments(ctx, type_infos, fragment_cache=fragment_cache, jobs=jobs)
+    else:
+        fragments = None
+        for type_info in type_infos:
+            write_type(ctx, type_info)
+            yield _take(sio)
+    if fragments is not None:
+        for fragment in fragments:
+            ctx.required_utility_types.update(fragment.utility_types)
+            yield fragment.text
+    for hoisted_type in sorted(set(hoisted.values()), key=lambda hoisted_type: hoisted_type.name):
+        write_hoisted_type(ctx, hoisted_type)
+        yield _take(sio)
     for name, typ in sorted(ctx.required_utility_types.items()):
         write_type(ctx, TypeInfo(name=name, type=typ))
+        yield _take(sio)
+    if observer is not None:
+        translation_cache = ctx.translation_cache
+        fragment_cache_after = (fragment_cache.hits, fragment_cache.misses) if fragment_cache is not None else (0, 0)
+        observer.generation_finished(
+            GenerationStats(
+                type_count=len(type_infos),
+                total_time=time.perf_counter() - start,
+                translation_cache_hits=translation_cache.hits if translation_cache is not None else 0,
+                translation_cache_misses=translation_cache.misses if translation_cache is not None else 0,
+                fragment_cache_hits=fragment_cache_after[0] - fragment_cache_before[0],
+                fragment_cache_misses=fragment_cache_after[1] - fragment_cache_before[1],
+                introspection_cache_size=len(world._struct_fields),
+            ),
+        )
+
+
+def compile_world(world: World, options: TypeScriptOptions | None = None) -> ir.CompiledWorld:
+    """
+    Compile the world's types (all of them, or those reachable from `roots`) into declarations,
+    so `write_compiled` can render them, many times over, without introspecting anything again.
+
+    The `scalars`, `order_by`, `order_fields_by` and hoisting options apply here, at compile time.
+    """
+    if options is None:
+        options = TypeScriptOptions()
+    ctx = make_context(io.StringIO(), world, options)
+    type_infos = get_ordered_type_infos(world, dataclasses.replace(options, dependency_order=False))
+    hoisted: dict[Any, HoistedType] = {}
+    if options.hoist_min_occurrences:
+        hoisted = find_hoisted_types(ctx, type_infos)
+        ctx = ctx.sub(type_aliases={key: hoisted_type.name for key, hoisted_type in hoisted.items()})
+    decls = tuple(compile_decl(ctx, type_info) for type_info in type_infos)
+    hoisted_decls = tuple(
+        compile_hoisted_type(ctx, hoisted_type)
+        for hoisted_type in sorted(set(hoisted.values()), key=lambda hoisted_type: hoisted_type.name)
+    )
+    utility_decls = tuple(
+        compile_decl(ctx, TypeInfo(name=name, type=typ)) for name, typ in sorted(ctx.required_utility_types.items())
+    )
+    return ir.CompiledWorld(decls=decls, hoisted_decls=hoisted_decls, utility_decls=utility_decls)
+
+
+def write_compiled(
+    fp: typing.TextIO,
+    compiled: ir.CompiledWorld,
+    options: TypeScriptOptions | None = None,
+    *,
+    null_is_undefined: bool | None = None,
+) -> None:
+    """
+    Write TypeScript definitions for a compiled world (see `compile_world`).
+
+    Of the options, `exported_types`, `type_only_imports`, `roots` and `dependency_order` apply here;
+    the rest were applied when compiling. If `null_is_undefined` is given, it overrides the types' own settings.
+    """
+    if options is None:
+        options = TypeScriptOptions()
+    decls: Iterable[ir.Decl] = compiled.decls
+    hoisted_decls: Iterable[ir.Decl] = compiled.hoisted_decls
+    if options.roots is not None:
+        reachable = compiled.get_reachable_names(options.roots)
+        decls = [decl for decl in decls if decl.name in reachable]
+        hoisted_decls = [decl for decl in hoisted_decls if decl.name in reachable]
+    if options.dependency_order:
+        imports = [decl for decl in decls if isinstance(decl, ir.ImportDecl)]
+        by_name = {decl.name: decl for decl in decls if not isinstance(decl, ir.ImportDecl)}
+        # Hoisted aliases are included in the ordering, so dependencies through them are respected.
+        order = compiled.dependency_graph().topological_order([*by_name, *(decl.name for decl in hoisted_decls)])
+        decls = [*imports, *(by_name[name] for name in order if name in by_name)]
+    written = [*decls, *hoisted_decls]
+    required_utility_types = {name for decl in written for name in decl.utility_types}
+    written.extend(
+        decl for decl in compiled.utility_decls if options.roots is None or decl.name in required_utility_types
+    )
+    for decl in written:
+        write_decl(fp, decl, options, null_is_undefined=null_is_undefined)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import importlib
+import pathlib
+import sys
+import threading
+import time
+import types
+from collections.abc import Iterable
+from typing import Any, Callable
+
+from typtyp.cli import Config, WorldConfig, build_world, render_world, select_worlds
+from typtyp.field_info import FieldInfo
+from typtyp.graph import DependencyGraph
+from typtyp.output import write_if_changed
+from typtyp.references import iter_annotation_leaves, iter_field_leaves
+from typtyp.world import World
+
+
+def _get_module_file(module_name: str) -> pathlib.Path | None:
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    return pathlib.Path(path).resolve() if path else None
+
+
+def _stat(path: pathlib.Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _is_in_package(module_name: str, package: str) -> bool:
+    return module_name == package or module_name.startswith(f"{package}.")
+
+
+class Watcher:
+    """
+    Keeps the configured worlds (and their introspection results and rendered fragments) in memory,
+    and regenerates their outputs when the source files of their types change.
+
+    Changed modules, and modules that import from them, are reloaded; only the worlds that contain types
+    from those modules are rebuilt, and only types whose fields changed are re-rendered.
+    New modules in the worlds' packages are noticed too, and rebuild the worlds of those packages.
+    Only source files within the configuration file's directory are watched (by polling their modification
+    times, so no extra dependencies are needed).
+
+    Reloading relies on the modules being safe to re-execute; Django models, for one, aren't.
+    """
+
+    def __init__(self, config: Config, *, world_names: Iterable[str] | None = None) -> None:
+        self.config = config
+        self.root = config.path.parent
+        self.world_configs = select_worlds(config, world_names)
+        self.introspection_cache: dict[Any, list[FieldInfo] | None] = {}
+        self.worlds: dict[str, World] = {}
+        # Names of the (watched) modules each world's types come from
+        self.world_modules: dict[str, set[str]] = {}
+        # Last seen modification time and size of each watched source file, and its module name
+        self.file_stats: dict[pathlib.Path, tuple[tuple[int, int] | None, str]] = {}
+        # Source files seen in the directories of the worlds' packages, so new modules can be noticed
+        self.package_files: set[pathlib.Path] = set()
+
+    def build(self) -> dict[pathlib.Path, bool]:
+        """
+        Build and write all worlds. Returns a mapping of output files to whether they were written.
+        """
+        return self._rebuild(self.world_configs)
+
+    def _rebuild(self, world_configs: Iterable[WorldConfig]) -> dict[pathlib.Path, bool]:
+        written = {}
+        for world_config in world_configs:
+            old_world = self.worlds.get(world_config.name)
+            world = build_world(
+                world_config,
+                introspection_cache=self.introspection_cache,
+                index_path=self.config.index_path,
+                incremental=True,
+            )
+            if old_world is not None:
+                # Fragments of types whose fields didn't change are reused
+                world.fragment_cache = old_world.fragment_cache
+            self.worlds[world_config.name] = world
+            self.world_modules[world_config.name] = modules = self._get_watched_modules(world_config, world)
+            for module_name in modules:
+                if (path := _get_module_file(module_name)) is not None:
+                    self.file_stats[path] = (_stat(path), module_name)
+            for path, content in render_world(world, world_config).items():
+                written[path] = write_if_changed(path, content)
+        self.package_files.update(self._scan_packages())
+        return written
+
+    def _scan_packages(self) -> dict[pathlib.Path, str]:
+        """
+        Find the source files in the (watched) directories of the worlds' packages, mapped to their module names.
+        """
+        found = {}
+        for package in {package for world_config in self.world_configs for package in world_config.packages}:
+            for location in getattr(sys.modules.get(package), "__path__", ()):
+                directory = pathlib.Path(location).resolve()
+                if not directory.is_relative_to(self.root) or "site-packages" in directory.parts:
+                    continue
+                for path in directory.rglob("*.py"):
+                    parts = path.relative_to(directory).with_suffix("").parts
+                    if parts[-1] == "__init__":
+                        parts = parts[:-1]
+                    found[path] = ".".join((package, *parts))
+        return found
+
+    def _is_watched(self, module_name: str) -> bool:
+        path = _get_module_file(module_name)
+        return path is not None and path.is_relative_to(self.root) and "site-packages" not in path.parts
+
+    def _get_watched_modules(self, world_config: WorldConfig, world: World) -> set[str]:
+        objects: list[Any] = []
+        for type_info in world:
+            typ = type_info.type
+            objects.extend(getattr(typ, "__mro__", (typ,)))
+            fields = self.introspection_cache.get(typ)
+            objects.extend(iter_annotation_leaves(typ) if fields is None else iter_field_leaves(fields))
+        module_names = {getattr(obj, "__module__", None) for obj in objects}
+        module_names.update(world_config.modules)
+        module_names.update(
+            name for name in sys.modules for package in world_config.packages if _is_in_package(name, package)
+        )
+        return {name for name in module_names if isinstance(name, str) and self._is_watched(name)}
+
+    def poll(self) -> set[str]:
+        """
+        Find the names of the watched modules whose source files have changed since they were last seen,
+        and of new modules in the worlds' packages.
+        """
+        changed = set()
+        for path, (stat, module_name) in self.file_stats.items():
+            if (new_stat := _stat(path)) != stat:
+                self.file_stats[path] = (new_stat, module_name)
+                changed.add(module_name)
+        for path, module_name in self._scan_packages().items():
+            if path not in self.package_files:
+                self.package_files.add(path)
+                changed.add(module_name)
+        return changed
+
+    def _get_imported_modules(self, module_name: str) -> set[str]:
+        """
+        Get the names of the modules a module imports (or imports anything from).
+        """
+        imported = set()
+        for value in vars(sys.modules[module_name]).values():
+            if isinstance(value, types.ModuleType):
+                imported.add(value.__name__)
+            elif isinstance(source := getattr(value, "__module__", None), str):
+                imported.add(source)
+        imported.discard(module_name)
+        return imported
+
+    def _find_importers(self, module_names: set[str]) -> DependencyGraph:
+        """
+        Find the watched modules that (transitively) import anything from the given modules,
+        as a graph of which of them import which.
+        """
+        imports = {
+            name: self._get_imported_modules(name)
+            for name in {module_name for _, module_name in self.file_stats.values()} | module_names
+            if name in sys.modules
+        }
+        found = set(module_names) & imports.keys()
+        while new := {name for name, imported in imports.items() if name not in found and imported & found}:
+            found |= new
+        return DependencyGraph({name: tuple(sorted(imports[name] & found)) for name in sorted(found)})
+
+    def refresh(self, changed_modules: set[str]) -> dict[pathlib.Path, bool]:
+        """
+        Reload the changed modules (and those importing from them), and rebuild and write the affected worlds.
+        """
+        import_graph = self._find_importers(changed_modules)
+        to_reload = set(import_graph.edges)
+        # Modules not imported yet are new ones, to be discovered by rebuilding the worlds of their packages
+        if new_modules := {name for name in changed_modules if name not in sys.modules}:
+            importlib.invalidate_caches()
+        # Forget introspection results for the types being replaced
+        for typ in [typ for typ in self.introspection_cache if getattr(typ, "__module__", None) in to_reload]:
+            del self.introspection_cache[typ]
+        # Modules are reloaded after the modules they import from, so they pick up the new objects
+        for name in import_graph.topological_order():
+            importlib.reload(sys.modules[name])
+        return self._rebuild(
+            world_config
+            for world_config in self.world_configs
+            if self.world_modules[world_config.name] & to_reload
+            or any(_is_in_package(name, package) for name in new_modules for package in world_config.packages)
+        )
+
+    def run(
+        self,
+        *,
+        interval: float = 0.2,
+        on_refresh: Callable[[dict[pathlib.Path, bool], float], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        stop: threading.Event | None = None,
+    ) -> None:
+        """
+        Poll for changes every `interval` seconds, and refresh the affected worlds, until `stop` is set.
+
+        Errors while reloading or generating (e.g. syntax errors in edited files) are passed to `on_error`
+        (if not given, they're raised); the failed changes are retried along with the next change.
+        """
+        stop = stop or threading.Event()
+        pending: set[str] = set()
+        while not stop.wait(interval):
+            if not (changed := self.poll()):
+                continue
+            changed |= pending
+            start = time.perf_counter()
+            try:
+                written = self.refresh(changed)
+            except Exception as exc:
+                if on_error is None:
+                    raise
+                pending = changed
+                on_error(exc)
+                continue
+            pending = set()
+            if on_refresh is not None:
+                on_refresh(written, time.perf_counter() - start)
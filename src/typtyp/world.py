@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import collections
 import dataclasses
+import enum
+import importlib
 import io
+import os
+import sys
+import time
+import types
+from collections.abc import AsyncIterator, Iterator
 from inspect import cleandoc
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
+from typtyp.field_info import FieldInfo, merge_overrides
+from typtyp.graph import DependencyGraph
+from typtyp.incremental import FragmentCache, combine_fingerprints, get_local_fingerprint
+from typtyp.references import iter_annotation_leaves, iter_field_leaves
 from typtyp.type_configuration import TypeConfiguration
 from typtyp.type_info import TypeInfo
 
+if TYPE_CHECKING:
+    from typtyp.ir import CompiledWorld
+
 
 class _Sentinel:
     pass
@@ -23,10 +38,52 @@ def get_doc(typ: type) -> str | None:
     return cleandoc(getattr(typ, "__doc__", None) or "")
 
 
+def _make_type_info(
+    typ: type,
+    *,
+    name: str | None = None,
+    doc: str | None | _Sentinel = NOT_SET,
+    configuration: TypeConfiguration | None = None,
+) -> TypeInfo:
+    if name is None:
+        name = typ.__name__
+    if isinstance(doc, _Sentinel):
+        # You're not a real doc...
+        real_doc = get_doc(typ)
+    else:
+        real_doc = doc
+    assert name  # noqa: S101
+    return TypeInfo(
+        name=name,
+        type=typ,
+        doc=real_doc,
+        **(dataclasses.asdict(configuration) if configuration else {}),
+    )
+
+
 class World:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        incremental: bool = False,
+        introspection_cache: dict[Any, list[FieldInfo] | None] | None = None,
+    ) -> None:
         self._types_by_name: dict[str, TypeInfo] = {}
         self._types_by_type: dict[type, TypeInfo] = {}
+        # Memoized struct introspection results, per type; may be shared between worlds
+        self._struct_fields: dict[Any, list[FieldInfo] | None] = (
+            introspection_cache if introspection_cache is not None else {}
+        )
+        # Seconds spent introspecting each type in `get_struct_fields`, for instrumentation
+        self._introspection_times: dict[Any, float] = {}
+        # Memoized local fingerprints, per type name; valid as long as the TypeInfo is the same object
+        self._local_fingerprints: dict[str, tuple[TypeInfo, str]] = {}
+        # Incremented whenever the set of types changes (or caches are cleared),
+        # to invalidate derived data (e.g. the dependency graph)
+        self._version = 0
+        self._dependency_graph: tuple[int, DependencyGraph] | None = None
+        # Rendered fragments from previous generations, if incremental generation is enabled
+        self.fragment_cache: FragmentCache | None = FragmentCache() if incremental else None
 
     def add(
         self,
@@ -36,25 +93,29 @@ class World:
         name: str | None = None,
         doc: str | None | _Sentinel = NOT_SET,
         configuration: TypeConfiguration | None = None,
+        follow_references: bool = False,
     ) -> TypeInfo:
-        if name is None:
-            name = typ.__name__
-        if isinstance(doc, _Sentinel):
-            # You're not a real doc...
-            real_doc = get_doc(typ)
-        else:
-            real_doc = doc
-        assert name  # noqa: S101
-        if name in self._types_by_name:
-            raise KeyError(f"Type {name} already exists")
-        info = TypeInfo(
-            name=name,
-            type=typ,
-            doc=real_doc,
-            **(dataclasses.asdict(configuration) if configuration else {}),
-        )
-        self._types_by_name[name] = info
-        self._types_by_type[typ] = info
+        """
+        Add a type to the world.
+
+        With `follow_references`, the struct-like types and enums it refers to (transitively)
+        are added too, with their default names; see `add_referenced_types`.
+        """
+        info = self.add_type_info(_make_type_info(typ, name=name, doc=doc, configuration=configuration))
+        if follow_references:
+            try:
+                self.add_referenced_types([info])
+            except KeyError:  # Name clash; don't leave the type added either
+                self.remove(info.name)
+                raise
+        return info
+
+    def add_type_info(self, info: TypeInfo) -> TypeInfo:
+        if info.name in self._types_by_name:
+            raise KeyError(f"Type {info.name} already exists")
+        self._types_by_name[info.name] = info
+        self._types_by_type[info.type] = info
+        self._version += 1
         return info
 
     def add_many(
@@ -63,6 +124,7 @@ class World:
         *,
         doc: str | None | _Sentinel = NOT_SET,
         configuration: TypeConfiguration | None = None,
+        follow_references: bool = False,
     ) -> dict[type, TypeInfo]:
         types_it: Iterable[tuple[str | None, type]]
         if isinstance(types, dict):
@@ -72,11 +134,268 @@ class World:
         ret = {}
         for name, typ in types_it:
             ret[typ] = self.add(typ, name=name, doc=doc, configuration=configuration)
+        if follow_references:
+            try:
+                self.add_referenced_types(ret.values())
+            except KeyError:  # Name clash; don't leave the types added either
+                for info in ret.values():
+                    self.remove(info.name)
+                raise
         return ret
 
+    def add_referenced_types(self, type_infos: Iterable[TypeInfo]) -> dict[type, TypeInfo]:
+        """
+        Add the struct-like types and enums the given types refer to, and those they refer to, and so on.
+
+        Every type is introspected (once; see `get_struct_fields`) and visited only once,
+        so this is linear in the number of types and references, and handles cycles.
+        Returns the newly added types.
+
+        If any of the types to add has the same name as another type (in the world, or to be added),
+        a KeyError is raised, and nothing is added.
+        """
+        from typtyp.extractors import default_struct_extractors
+
+        added: dict[type, TypeInfo] = {}
+        seen: set[Any] = set()
+        queue = collections.deque(type_infos)
+        while queue:
+            type_info = queue.popleft()
+            typ = type_info.type
+            if type_info.import_from or (isinstance(typ, type) and issubclass(typ, enum.Enum)):
+                continue
+            fields = self.get_struct_fields(typ)
+            if fields is None:
+                leaves = iter_annotation_leaves(typ)
+            else:
+                leaves = iter_field_leaves(merge_overrides(fields, type_info.field_overrides))
+            for leaf in leaves:
+                try:
+                    if leaf in seen or leaf in self._types_by_type:
+                        continue
+                    seen.add(leaf)
+                except TypeError:  # Unhashable; can't be registered anyway
+                    continue
+                if isinstance(leaf, type) and (
+                    issubclass(leaf, enum.Enum) or default_struct_extractors.is_struct(leaf)
+                ):
+                    added[leaf] = ref_info = _make_type_info(leaf)
+                    queue.append(ref_info)
+        # Check for name clashes before adding anything, so the world isn't left half-updated
+        types_by_name: dict[str, Any] = {}
+        for typ, ref_info in added.items():
+            if ref_info.name in self._types_by_name:
+                raise KeyError(f"Referenced type {typ!r} can't be added: type {ref_info.name} already exists")
+            if (other_type := types_by_name.setdefault(ref_info.name, typ)) is not typ:
+                raise KeyError(f"Referenced types {other_type!r} and {typ!r} would both be named {ref_info.name}")
+        for ref_info in added.values():
+            self.add_type_info(ref_info)
+        return added
+
+    def add_module(
+        self,
+        module: types.ModuleType | str,
+        *,
+        predicate: Callable[[type], bool] | None = None,
+        doc: str | None | _Sentinel = NOT_SET,
+        configuration: TypeConfiguration | None = None,
+        follow_references: bool = False,
+    ) -> dict[type, TypeInfo]:
+        """
+        Add the convertible types (struct-like types and enums) defined in a module, in definition order.
+
+        Types already in the world, and those for which `predicate` returns False, are skipped.
+        """
+        from typtyp.discovery import discover_module_types
+
+        if isinstance(module, str):
+            module = importlib.import_module(module)
+        return self._add_discovered(
+            discover_module_types(module),
+            predicate,
+            doc=doc,
+            configuration=configuration,
+            follow_references=follow_references,
+        )
+
+    def add_package(
+        self,
+        package: types.ModuleType | str,
+        *,
+        predicate: Callable[[type], bool] | None = None,
+        module_predicate: Callable[[str], bool] | None = None,
+        index_path: str | os.PathLike[str] | None = None,
+        index_read_only: bool = False,
+        doc: str | None | _Sentinel = NOT_SET,
+        configuration: TypeConfiguration | None = None,
+        follow_references: bool = False,
+    ) -> dict[type, TypeInfo]:
+        """
+        Add the convertible types defined in a package and all of its submodules, recursively.
+
+        Modules for which `module_predicate` returns False are not imported.
+        If `index_path` is given, a discovery index is kept there, and modules that are known
+        to define no convertible types are not imported again, unless they have changed.
+        If `index_read_only` is set, the index is used but not updated.
+        """
+        from typtyp.discovery import DiscoveryIndex, discover_package_types
+
+        if isinstance(package, types.ModuleType):
+            package = package.__name__
+        discovered = discover_package_types(
+            package,
+            index=DiscoveryIndex(index_path, read_only=index_read_only) if index_path is not None else None,
+            module_predicate=module_predicate,
+        )
+        return self._add_discovered(
+            discovered,
+            predicate,
+            doc=doc,
+            configuration=configuration,
+            follow_references=follow_references,
+        )
+
+    def _add_discovered(
+        self,
+        discovered: Iterable[type],
+        predicate: Callable[[type], bool] | None,
+        **add_many_kwargs,
+    ) -> dict[type, TypeInfo]:
+        return self.add_many(
+            [typ for typ in discovered if typ not in self._types_by_type and (predicate is None or predicate(typ))],
+            **add_many_kwargs,
+        )
+
+    def remove(self, typ_or_name: type | str) -> TypeInfo:
+        if isinstance(typ_or_name, str):
+            info = self._types_by_name.pop(typ_or_name)
+        else:
+            info = self._types_by_type[typ_or_name]
+            del self._types_by_name[info.name]
+        del self._types_by_type[info.type]
+        self._struct_fields.pop(info.type, None)
+        self._introspection_times.pop(info.type, None)
+        self._local_fingerprints.pop(info.name, None)
+        self._version += 1
+        return info
+
+    def get_type_info(self, name: str) -> TypeInfo:
+        return self._types_by_name[name]
+
     def get_name_for_type(self, t: type) -> str:
         return self._types_by_type[t].name
 
+    def get_struct_fields(self, typ: Any) -> list[FieldInfo] | None:
+        """
+        Get the (unmerged) fields of a struct-like type, or None if it isn't one.
+
+        The result is memoized, so each type is only introspected once.
+        """
+        try:
+            return self._struct_fields[typ]
+        except KeyError:
+            pass
+        from typtyp.extractors import default_struct_extractors
+
+        start = time.perf_counter()
+        fields = self._struct_fields[typ] = default_struct_extractors.get_fields(typ)
+        self._introspection_times[typ] = time.perf_counter() - start
+        return fields
+
+    def get_introspection_time(self, typ: Any) -> float:
+        """
+        Get the number of seconds spent introspecting a type's fields, or 0 if it hasn't been introspected.
+        """
+        return self._introspection_times.get(typ, 0.0)
+
+    def get_referenced_names(self, type_info: TypeInfo) -> list[str]:
+        """
+        Get the names of the registered types the given type refers to, in order of first reference.
+        """
+        typ = type_info.type
+        if type_info.import_from or (isinstance(typ, type) and issubclass(typ, enum.Enum)):
+            return []
+        fields = self.get_struct_fields(typ)
+        if fields is None:
+            leaves = iter_annotation_leaves(typ)
+        else:
+            leaves = iter_field_leaves(merge_overrides(fields, type_info.field_overrides))
+        names: dict[str, None] = {}
+        for leaf in leaves:
+            try:
+                ref_info = self._types_by_type.get(leaf)
+            except TypeError:  # Unhashable; can't be registered anyway
+                continue
+            if ref_info is not None and ref_info is not type_info:
+                names[ref_info.name] = None
+        return list(names)
+
+    def dependency_graph(self, roots: Iterable[str] | None = None) -> DependencyGraph:
+        """
+        Get the reference graph of the types in the world.
+
+        The graph is built in one pass over the types' (memoized) fields, and reused until types are added or removed.
+
+        If `roots` are given, the graph only contains the types reachable from those roots,
+        and only those types are introspected.
+        """
+        if roots is not None:
+            edges: dict[str, tuple[str, ...]] = {}
+            queue = collections.deque(roots)
+            while queue:
+                name = queue.popleft()
+                if name not in edges:
+                    edges[name] = deps = tuple(self.get_referenced_names(self.get_type_info(name)))
+                    queue.extend(deps)
+            return DependencyGraph(edges=edges)
+        if self._dependency_graph is not None and self._dependency_graph[0] == self._version:
+            return self._dependency_graph[1]
+        graph = DependencyGraph(
+            edges={type_info.name: tuple(self.get_referenced_names(type_info)) for type_info in self},
+        )
+        self._dependency_graph = (self._version, graph)
+        return graph
+
+    def _get_local_fingerprint(self, type_info: TypeInfo) -> str:
+        cached = self._local_fingerprints.get(type_info.name)
+        if cached is not None and cached[0] is type_info:
+            return cached[1]
+        fields = None if type_info.import_from else self.get_struct_fields(type_info.type)
+        fingerprint = get_local_fingerprint(type_info, fields)
+        self._local_fingerprints[type_info.name] = (type_info, fingerprint)
+        return fingerprint
+
+    def get_fingerprint(self, type_info: TypeInfo) -> str:
+        """
+        Fingerprint a type by its fields, configuration and documentation, and those of the types it refers to.
+
+        If the fingerprint of a type is unchanged, so is its rendered output.
+        """
+        return combine_fingerprints(
+            self._get_local_fingerprint(type_info),
+            (
+                (name, self._get_local_fingerprint(self.get_type_info(name)))
+                for name in self.get_referenced_names(type_info)
+            ),
+        )
+
+    def clear_caches(self) -> None:
+        """
+        Forget memoized introspection results and rendered fragments,
+        e.g. if types have been modified in place.
+
+        Extractors' own caches (i.e. DRF serializer fields, which are cached per class) are cleared too.
+        """
+        if (drf := sys.modules.get("typtyp.drf")) is not None:  # (Not imported just to clear it)
+            drf.clear_serializer_fields_cache()
+        self._struct_fields.clear()
+        self._introspection_times.clear()
+        self._local_fingerprints.clear()
+        self._dependency_graph = None
+        self._version += 1
+        if self.fragment_cache is not None:
+            self.fragment_cache.clear()
+
     def __iter__(self):
         # Iterate over types in a sensible order; imported types first, then the rest.
         types = self._types_by_type.values()
@@ -92,5 +411,52 @@ class World:
         from typtyp.typescript import write_ts
 
         sio = io.StringIO()
+        write_ts_kwargs.setdefault("fragment_cache", self.fragment_cache)
         write_ts(sio, self, **write_ts_kwargs)
         return sio.getvalue()
+
+    def iter_typescript(self, **iter_ts_kwargs) -> Iterator[str]:
+        """
+        Generate TypeScript for the world, yielding it in chunks (one per type), e.g. to stream it into a file
+        (see `typtyp.output.FileSink`) or a response without holding the whole output in memory.
+
+        Unlike `get_typescript`, this doesn't use the world's fragment cache by default,
+        since that would keep every type's output in memory (see `iter_ts`).
+        """
+        from typtyp.typescript import iter_ts
+
+        return iter_ts(self, **iter_ts_kwargs)
+
+    def write_typescript(self, path: str | os.PathLike[str], **iter_ts_kwargs) -> bool:
+        """
+        Stream TypeScript for the world into a file, unless it already has exactly that content
+        (see `typtyp.output.write_if_changed`). Returns whether the file was written.
+        """
+        from typtyp.output import write_if_changed
+
+        return write_if_changed(path, self.iter_typescript(**iter_ts_kwargs))
+
+    def compile(self, **compile_world_kwargs) -> CompiledWorld:
+        from typtyp.typescript import compile_world
+
+        return compile_world(self, **compile_world_kwargs)
+
+    async def aget_typescript(self, **aget_typescript_kwargs) -> str:
+        from typtyp.async_api import aget_typescript
+
+        return await aget_typescript(self, **aget_typescript_kwargs)
+
+    def aiter_typescript(self, **aiter_typescript_kwargs) -> AsyncIterator[str]:
+        from typtyp.async_api import aiter_typescript
+
+        return aiter_typescript(self, **aiter_typescript_kwargs)
+
+    def get_typescript_files(self, **render_ts_files_kwargs) -> dict[str, str]:
+        from typtyp.multi_file import render_ts_files
+
+        return render_ts_files(self, **render_ts_files_kwargs)
+
+    def write_typescript_files(self, directory: str | os.PathLike[str], **render_ts_files_kwargs) -> dict[str, bool]:
+        from typtyp.multi_file import write_ts_files
+
+        return write_ts_files(directory, self, **render_ts_files_kwargs)
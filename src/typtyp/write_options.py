@@ -13,6 +13,10 @@ class WriteOptions:
     # If None, types are emitted in their registration order.
     order_by: Callable[[TypeInfo], Any] | None = None
 
+    # If True, types are emitted after the types they refer to (after ordering with `order_by`, if set),
+    # with mutually dependent types kept together. Imported types are always emitted first.
+    dependency_order: bool = False
+
     # Default sort key function for ordering fields within struct-like types.
     # Can be overridden per-type via TypeConfiguration.order_fields_by.
     # If None, fields are emitted in their original order.
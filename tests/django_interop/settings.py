@@ -3,6 +3,7 @@ INSTALLED_APPS = [
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "tests.django_interop",
+    "typtyp.django_app",
 ]
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
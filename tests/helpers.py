@@ -34,7 +34,7 @@ def check_with_tsc(code, *, extra_files: dict[str, str] | None = None):
         return True
 
 
-def world_from_types(*types) -> typtyp.World:
-    w = typtyp.World()
+def world_from_types(*types, **world_kwargs) -> typtyp.World:
+    w = typtyp.World(**world_kwargs)
     w.add_many(types)
     return w
@@ -0,0 +1,90 @@
+import asyncio
+import dataclasses
+import uuid
+
+import typtyp
+from tests.common import HairColor
+from typtyp.typescript import TypeScriptOptions
+
+
+@dataclasses.dataclass
+class Head:
+    id: uuid.UUID
+    hair_color: HairColor
+
+
+@dataclasses.dataclass
+class Person:
+    head: Head
+    nickname: str | None
+
+
+def make_counting_world(monkeypatch) -> tuple[typtyp.World, list[int]]:
+    w = typtyp.World()
+    w.add_many((Person, Head, HairColor))
+    calls = []
+    get_typescript = w.get_typescript
+
+    def counting_get_typescript(**kwargs):
+        calls.append(1)
+        return get_typescript(**kwargs)
+
+    monkeypatch.setattr(w, "get_typescript", counting_get_typescript)
+    return w, calls
+
+
+def test_aget_typescript_coalesces_and_caches(monkeypatch):
+    w, calls = make_counting_world(monkeypatch)
+    expected = typtyp.World()
+    expected.add_many((Person, Head, HairColor))
+    expected_code = expected.get_typescript()
+
+    async def main():
+        results = await asyncio.gather(*(w.aget_typescript() for _ in range(5)))
+        assert results == [expected_code] * 5
+        assert len(calls) == 1
+        assert await w.aget_typescript() == expected_code
+        assert len(calls) == 1  # cached
+        assert await w.aget_typescript(options=TypeScriptOptions(exported_types=False)) != expected_code
+        assert len(calls) == 2  # different arguments
+        w.add(uuid.UUID, name="UUIDAlias")
+        assert "UUIDAlias" in await w.aget_typescript()
+        assert len(calls) == 3  # the world changed
+        w.clear_caches()
+        await w.aget_typescript()
+        assert len(calls) == 4
+
+    asyncio.run(main())
+
+
+def test_aiter_typescript(monkeypatch):
+    w, calls = make_counting_world(monkeypatch)
+    expected_code = w.get_typescript()
+    calls.clear()
+
+    async def main():
+        chunks = [chunk async for chunk in w.aiter_typescript(chunk_size=10)]
+        assert len(chunks) > 1
+        assert "".join(chunks) == expected_code
+        # The streamed result is cached, too
+        assert await w.aget_typescript() == expected_code
+        assert [chunk async for chunk in w.aiter_typescript(chunk_size=10_000)] == [expected_code]
+        assert not calls  # (streaming doesn't go through `get_typescript`)
+
+    asyncio.run(main())
+
+
+def test_aget_typescript_does_not_cache_by_closure(monkeypatch):
+    w, calls = make_counting_world(monkeypatch)
+
+    def by(names):
+        return lambda type_info: names.index(type_info.name)
+
+    async def main():
+        head_first = await w.aget_typescript(options=TypeScriptOptions(order_by=by(["Head", "Person", "HairColor"])))
+        person_first = await w.aget_typescript(options=TypeScriptOptions(order_by=by(["Person", "Head", "HairColor"])))
+        assert head_first.index("interface Head") < head_first.index("interface Person")
+        assert person_first.index("interface Person") < person_first.index("interface Head")
+        assert len(calls) == 2
+
+    asyncio.run(main())
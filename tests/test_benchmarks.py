@@ -0,0 +1,39 @@
+import json
+
+from benchmarks.run import PHASES, find_regressions, main, run_benchmark
+from benchmarks.synthetic import generate_types, get_available_kinds
+from tests.helpers import check_with_tsc, world_from_types
+
+
+def test_synthetic_world_is_deterministic():
+    code = world_from_types(*generate_types(60, seed=42)).get_typescript()
+    assert code == world_from_types(*generate_types(60, seed=42)).get_typescript()
+    assert code != world_from_types(*generate_types(60, seed=43)).get_typescript()
+    for kind in get_available_kinds():
+        assert f" {kind.title()}0" in code
+    assert check_with_tsc(code)
+
+
+def test_run_benchmark():
+    timings = run_benchmark(20, repeat=1)
+    assert set(timings) == set(PHASES)
+    assert all(timing > 0 for timing in timings.values())
+
+
+def test_find_regressions():
+    baseline = {"100": {"add_many": 0.1, "write_ts": 0.001}}
+    results = {"100": {"add_many": 0.2, "write_ts": 0.004}, "1000": {"add_many": 1.0}}
+    assert find_regressions(results, baseline, threshold=0.25) == [
+        "add_many @ 100: 0.2000s vs. baseline 0.1000s (+100%)",
+    ]
+    assert find_regressions(results, baseline, threshold=1.5) == []
+
+
+def test_main(tmp_path):
+    output = tmp_path / "results.json"
+    assert main(["--sizes", "10", "--repeat", "1", "--output", str(output)]) == 0
+    results = json.loads(output.read_text())["results"]
+    assert set(results["10"]) == set(PHASES)
+    results["10"] = {phase: 1e-9 for phase in PHASES}  # impossibly fast, but below the noise floor
+    output.write_text(json.dumps({"results": results}))
+    assert main(["--sizes", "10", "--repeat", "1", "--baseline", str(output)]) == 0
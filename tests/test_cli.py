@@ -0,0 +1,168 @@
+import dataclasses
+import sys
+import textwrap
+
+import pytest
+
+from typtyp.cli import OPTION_TYPES, UNCONFIGURABLE_OPTIONS, find_config, generate, load_config, main
+from typtyp.excs import ConfigError
+from typtyp.typescript import TypeScriptOptions
+
+MODELS = """
+    import dataclasses
+    import enum
+
+
+    class Color(enum.Enum):
+        RED = "red"
+        BLUE = "blue"
+
+
+    @dataclasses.dataclass
+    class Widget:
+        name: str
+        color: Color
+
+
+    @dataclasses.dataclass
+    class Box:
+        widgets: list[Widget]
+"""
+
+PYPROJECT = """
+    [project]
+    name = "example"
+
+    [tool.typtyp]
+    python_path = ["src"]
+
+    [tool.typtyp.worlds.widgets]
+    modules = ["cli_example_models"]
+    output = "out/widgets.ts"
+    options = { dependency_order = true }
+
+    [tool.typtyp.worlds.boxes]
+    types = ["cli_example_models:Box"]
+    follow_references = true
+    output_dir = "out/boxes"
+    options = { exported_types = ["Box"] }
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "cli_example_models.py").write_text(textwrap.dedent(MODELS))
+    (tmp_path / "pyproject.toml").write_text(textwrap.dedent(PYPROJECT))
+    (tmp_path / "sub").mkdir()
+    monkeypatch.chdir(tmp_path / "sub")
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    yield tmp_path
+    sys.modules.pop("cli_example_models", None)
+
+
+def test_load_config(project):
+    config = load_config(find_config())
+    assert config.path == project / "pyproject.toml"
+    assert [wc.name for wc in config.worlds] == ["widgets", "boxes"]
+    widgets, boxes = config.worlds
+    assert widgets.output == project / "out" / "widgets.ts"
+    assert widgets.options.dependency_order
+    assert boxes.options.exported_types == {"Box"}
+
+
+def test_generate_and_check(project, capsys):
+    assert main(["--check"]) == 1
+    assert "Out of date: ../out/widgets.ts" in capsys.readouterr().err
+    assert not (project / "out").exists()  # --check doesn't write anything
+
+    assert main([]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "Wrote ../out/widgets.ts",
+        "Wrote ../out/boxes/cli_example_models.ts",
+    ]
+    widgets_ts = (project / "out" / "widgets.ts").read_text()
+    assert widgets_ts.index("export const enum Color") < widgets_ts.index("export interface Widget")
+    assert "export interface Box" in (project / "out" / "boxes" / "cli_example_models.ts").read_text()
+
+    assert main(["--check"]) == 0
+    assert main([]) == 0
+    assert capsys.readouterr().out == ""  # nothing changed, nothing written
+
+    (project / "out" / "widgets.ts").write_text("// stale\n")
+    assert main(["--check", "--world", "boxes"]) == 0
+    assert main(["--check"]) == 1
+
+
+def test_worlds_share_introspection(project, monkeypatch):
+    from typtyp import world as world_module
+
+    caches = []
+    original_init = world_module.World.__init__
+
+    def init(self, **kwargs):
+        original_init(self, **kwargs)
+        caches.append(self._struct_fields)
+
+    monkeypatch.setattr(world_module.World, "__init__", init)
+    config = load_config(find_config())
+    sys.path.insert(0, str(project / "src"))
+    generate(config)
+    assert caches[0] is caches[1]  # (multi-file output may create more worlds for utility types)
+
+
+@pytest.mark.parametrize(
+    ("world_table", "message"),
+    [
+        ('modules = ["x"]', "exactly one of output or output_dir"),
+        ('output = "x.ts"\nbogus = 1', "unknown keys: bogus"),
+        ('output = "x.ts"\noptions = { order_by = "name" }', "unsupported options: order_by"),
+        ('output = "x.ts"\nmodules = "x"', "modules must be a list of strings"),
+        ("output = 1", "output must be a string"),
+        ('output = "x.ts"\nfollow_references = "false"', "follow_references must be a boolean"),
+        ('output = "x.ts"\noptions = 1', "options must be a table"),
+        ('output = "x.ts"\noptions = { exported_types = "Box" }', "exported_types must be a boolean or a list"),
+        ('output = "x.ts"\noptions = { roots = [1] }', "roots must be a list of strings"),
+        ('output = "x.ts"\noptions = { hoist_min_length = true }', "hoist_min_length must be an integer"),
+        ('output = "x.ts"\noptions = { translation_cache_size = "1" }', "translation_cache_size must be an integer"),
+        ('output = "x.ts"\noptions = { dependency_order = 1 }', "dependency_order must be a boolean"),
+        ('output = "x.ts"\noptions = { type_only_imports = "yes" }', "type_only_imports must be a boolean"),
+    ],
+)
+def test_config_errors(tmp_path, world_table, message):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(f"[tool.typtyp.worlds.w]\n{world_table}\n")
+    with pytest.raises(ConfigError, match=message):
+        load_config(path)
+
+
+def test_all_options_configurable():
+    fields = {field.name for field in dataclasses.fields(TypeScriptOptions)}
+    assert set(OPTION_TYPES) == fields - UNCONFIGURABLE_OPTIONS
+
+
+def test_check_writes_nothing(project):
+    pyproject = project / "pyproject.toml"
+    pyproject.write_text(
+        pyproject.read_text().replace(
+            'python_path = ["src"]\n',
+            'python_path = ["src"]\nindex = "cache/index.json"\ncache_dir = "cache/fragments"\n',
+        )
+        + '[tool.typtyp.worlds.package]\npackages = ["cli_example_package"]\noutput = "out/package.ts"\n',
+    )
+    (project / "src" / "cli_example_package").mkdir()
+    (project / "src" / "cli_example_package" / "__init__.py").write_text(textwrap.dedent(MODELS))
+    try:
+        assert main(["--check"]) == 1
+        assert sorted(path.name for path in project.iterdir()) == ["pyproject.toml", "src", "sub"]
+        assert main(["-q"]) == 0
+        assert (project / "cache" / "index.json").exists()
+        assert main(["--check"]) == 0
+    finally:
+        sys.modules.pop("cli_example_package", None)
+
+
+def test_missing_config(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert main([]) == 2
+    assert "No pyproject.toml with a [tool.typtyp] table" in capsys.readouterr().err
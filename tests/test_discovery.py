@@ -0,0 +1,130 @@
+import os
+import sys
+import textwrap
+
+import pytest
+
+import typtyp
+
+PACKAGE_FILES = {
+    "__init__.py": "",
+    "models.py": """
+        import dataclasses
+        import enum
+        import uuid
+
+        from typing import TypedDict
+
+
+        class Color(enum.Enum):
+            RED = "red"
+            BLUE = "blue"
+
+
+        @dataclasses.dataclass
+        class Widget:
+            id: uuid.UUID
+            color: Color
+
+
+        class WidgetDict(TypedDict):
+            widget: Widget
+
+
+        @dataclasses.dataclass
+        class _Private:
+            pass
+
+
+        class NotAStruct:
+            pass
+    """,
+    "utils.py": """
+        import dataclasses
+
+        from discovered_pkg.models import Widget  # imported, not defined here
+
+
+        def frobnicate(widget: Widget) -> None:
+            pass
+    """,
+    "api/__init__.py": "",
+    "api/responses.py": """
+        import dataclasses
+
+        from discovered_pkg.models import Widget
+
+
+        @dataclasses.dataclass
+        class WidgetResponse:
+            widgets: list[Widget]
+    """,
+}
+
+
+@pytest.fixture
+def package_dir(tmp_path, monkeypatch):
+    for name, content in PACKAGE_FILES.items():
+        path = tmp_path / "discovered_pkg" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(content))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path / "discovered_pkg"
+    forget_modules()
+
+
+def forget_modules():
+    for name in list(sys.modules):
+        if name.startswith("discovered_pkg"):
+            del sys.modules[name]
+
+
+def test_add_module(package_dir):
+    w = typtyp.World()
+    added = w.add_module("discovered_pkg.models")
+    assert [ti.name for ti in added.values()] == ["Color", "Widget", "WidgetDict"]
+    assert w.add_module("discovered_pkg.utils") == {}
+    assert "export interface WidgetDict" in w.get_typescript()
+
+
+def test_add_package(package_dir):
+    w = typtyp.World()
+    w.add_package("discovered_pkg", predicate=lambda typ: typ.__name__ != "WidgetDict")
+    assert [ti.name for ti in w] == ["WidgetResponse", "Color", "Widget"]
+    # Already-registered types are skipped
+    assert w.add_package("discovered_pkg", module_predicate=lambda name: "api" not in name).keys() == {
+        sys.modules["discovered_pkg.models"].WidgetDict,
+    }
+
+
+def test_add_package_with_index(package_dir, tmp_path):
+    index_path = tmp_path / "index.json"
+    w = typtyp.World()
+    w.add_package("discovered_pkg", index_path=index_path)
+    assert len(list(w)) == 4
+    assert index_path.exists()
+
+    # Modules known to have no types aren't imported again...
+    forget_modules()
+    w = typtyp.World()
+    w.add_package("discovered_pkg", index_path=index_path)
+    assert len(list(w)) == 4
+    assert "discovered_pkg.utils" not in sys.modules
+    assert "discovered_pkg.models" in sys.modules
+
+    # ... even if touched...
+    utils_path = package_dir / "utils.py"
+    stat = utils_path.stat()
+    os.utime(utils_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+    forget_modules()
+    typtyp.World().add_package("discovered_pkg", index_path=index_path)
+    assert "discovered_pkg.utils" not in sys.modules
+
+    # ... unless changed.
+    utils_path.write_text(
+        textwrap.dedent(PACKAGE_FILES["utils.py"]) + "\n@dataclasses.dataclass\nclass Gadget:\n    name: str\n",
+    )
+    forget_modules()
+    w = typtyp.World()
+    w.add_package("discovered_pkg", index_path=index_path)
+    assert "Gadget" in w.get_typescript()
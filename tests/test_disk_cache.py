@@ -0,0 +1,161 @@
+import importlib
+import sys
+import textwrap
+
+import pytest
+
+import typtyp
+from typtyp.disk_cache import DiskCache
+from typtyp.typescript import TypeScriptOptions
+
+MODULE_SOURCE = """
+    import dataclasses
+    import enum
+    import uuid
+
+
+    class Color(enum.Enum):
+        RED = "red"
+        BLUE = "blue"
+
+
+    @dataclasses.dataclass
+    class Widget:
+        id: uuid.UUID
+        color: Color
+"""
+
+
+@pytest.fixture
+def module_path(tmp_path, monkeypatch):
+    path = tmp_path / "src" / "disk_cached_models.py"
+    path.parent.mkdir()
+    path.write_text(textwrap.dedent(MODULE_SOURCE))
+    monkeypatch.syspath_prepend(str(path.parent))
+    yield path
+    sys.modules.pop("disk_cached_models", None)
+
+
+def make_world() -> typtyp.World:
+    sys.modules.pop("disk_cached_models", None)
+    module = importlib.import_module("disk_cached_models")
+    w = typtyp.World()
+    w.add_many((module.Widget, module.Color))
+    return w
+
+
+def test_disk_cache_hit(module_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    code = make_world().get_typescript(disk_cache=DiskCache(cache_dir))
+    w = make_world()
+    cache = DiskCache(cache_dir)
+    assert w.get_typescript(disk_cache=cache) == code
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert not {ti.type for ti in w} & set(w._struct_fields)  # the types weren't introspected
+
+    # Different options are cached separately.
+    cache = DiskCache(cache_dir)
+    make_world().get_typescript(disk_cache=cache, options=TypeScriptOptions(exported_types=False))
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_disk_cache_bypassed_by_functions(module_path, tmp_path):
+    def make_options(reverse: bool) -> TypeScriptOptions:
+        return TypeScriptOptions(order_fields_by=lambda fi: fi.name if reverse else "")
+
+    cache_dir = tmp_path / "cache"
+    code = make_world().get_typescript(disk_cache=DiskCache(cache_dir), options=make_options(False))
+    # The same function with a different closure isn't mistaken for the first one
+    cache = DiskCache(cache_dir)
+    assert make_world().get_typescript(disk_cache=cache, options=make_options(True)) != code
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert not cache_dir.exists()
+
+
+def test_disk_cache_invalidated_by_source_change(module_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    make_world().get_typescript(disk_cache=DiskCache(cache_dir))
+    module_path.write_text(textwrap.dedent(MODULE_SOURCE) + "    name: str\n")
+    cache = DiskCache(cache_dir)
+    code = make_world().get_typescript(disk_cache=cache)
+    assert "name: string" in code
+    assert (cache.hits, cache.misses) == (0, 2)  # both types are defined in the changed module
+
+
+CONSTS_SOURCE = """
+    from typing import Literal
+
+    Status = Literal["a", "b"]
+"""
+
+DOCUMENTED_SOURCE = """
+    import dataclasses
+
+    from disk_cached_consts import Status
+
+
+    @dataclasses.dataclass
+    class Ticket:
+        \"""A ticket.\"""
+
+        status: Status
+"""
+
+
+def test_disk_cache_invalidated_by_alias_change(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "disk_cached_consts.py").write_text(textwrap.dedent(CONSTS_SOURCE))
+    (src / "disk_cached_documented.py").write_text(textwrap.dedent(DOCUMENTED_SOURCE))
+    monkeypatch.syspath_prepend(str(src))
+    cache_dir = tmp_path / "cache"
+
+    def generate() -> str:
+        for name in ("disk_cached_consts", "disk_cached_documented"):
+            sys.modules.pop(name, None)
+        w = typtyp.World()
+        w.add(importlib.import_module("disk_cached_documented").Ticket)
+        return w.get_typescript(disk_cache=DiskCache(cache_dir))
+
+    try:
+        assert 'status: "a" | "b"\n' in generate()
+        (src / "disk_cached_consts.py").write_text(textwrap.dedent(CONSTS_SOURCE).replace('"b"', '"b", "c"'))
+        assert 'status: "a" | "b" | "c"\n' in generate()
+    finally:
+        for name in ("disk_cached_consts", "disk_cached_documented"):
+            sys.modules.pop(name, None)
+
+
+def test_read_only_disk_cache(module_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = DiskCache(cache_dir, read_only=True)
+    code = make_world().get_typescript(disk_cache=cache)
+    assert not cache_dir.exists()
+    make_world().get_typescript(disk_cache=DiskCache(cache_dir))
+    cache = DiskCache(cache_dir, read_only=True)
+    assert make_world().get_typescript(disk_cache=cache) == code
+    assert (cache.hits, cache.misses) == (2, 0)
+
+
+@pytest.mark.parametrize("damage", ["truncate", "flip", "garbage"])
+def test_disk_cache_evicts_corrupt_files(module_path, tmp_path, damage):
+    cache_dir = tmp_path / "cache"
+    code = make_world().get_typescript(disk_cache=DiskCache(cache_dir))
+    (cache_file,) = cache_dir.iterdir()
+    data = cache_file.read_bytes()
+    if damage == "truncate":
+        cache_file.write_bytes(data[: len(data) // 2])
+    elif damage == "flip":
+        cache_file.write_bytes(data[:-1] + bytes([data[-1] ^ 1]))
+    else:
+        cache_file.write_bytes(b"not a cache file")
+    cache = DiskCache(cache_dir)
+    assert make_world().get_typescript(disk_cache=cache) == code
+    assert (cache.hits, cache.misses) == (0, 2)
+    # The cache file has been rewritten...
+    cache = DiskCache(cache_dir)
+    assert make_world().get_typescript(disk_cache=cache) == code
+    assert (cache.hits, cache.misses) == (2, 0)
+    # ... and can be cleared.
+    cache.clear()
+    assert not list(cache_dir.iterdir())
@@ -1,3 +1,5 @@
+import uuid
+
 import pytest
 
 from tests.helpers import world_from_types
@@ -21,3 +23,36 @@ def test_django(checked_ts_snapshot):
         User,
     )
     assert checked_ts_snapshot(w)
+
+
+def test_field_type_resolution(monkeypatch):
+    from django.db import models
+
+    from typtyp import django as typtyp_django
+
+    monkeypatch.setattr(typtyp_django, "FIELD_TYPE_RESOLVERS", dict(typtyp_django.FIELD_TYPE_RESOLVERS))
+    monkeypatch.setattr(typtyp_django, "_resolver_cache", {})
+
+    class RomanNumeralField(models.CharField):
+        pass
+
+    class ArrayField(models.Field):  # Stand-in for the Postgres one, which needs psycopg to import
+        __module__ = "django.contrib.postgres.fields.array"
+        __qualname__ = "ArrayField"
+
+        def __init__(self, base_field, **kwargs):
+            self.base_field = base_field
+            super().__init__(**kwargs)
+
+    def get_type(field):
+        return typtyp_django.get_django_field_type(field, model_type=PetMedication)
+
+    assert get_type(RomanNumeralField()) == (str, None)  # via the MRO
+    typtyp_django.register_field_type(RomanNumeralField, int, comment="roman numeral")
+    assert get_type(RomanNumeralField()) == (int, "roman numeral")
+    assert get_type(models.CharField()) == (str, None)
+    assert get_type(ArrayField(models.UUIDField())) == (list[uuid.UUID], None)
+    typtyp_django.register_field_type(ArrayField, resolver=lambda field, model_type: None)
+    assert get_type(ArrayField(models.UUIDField())) is None
+    with pytest.raises(TypeError):
+        typtyp_django.register_field_type(ArrayField)
@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("django")
+
+from django.core.management import CommandError, call_command
+
+
+def test_generate_typescript_per_app(tmp_path, capsys):
+    call_command("generate_typescript", "django_interop", output_dir=str(tmp_path), verbosity=2)
+    out = capsys.readouterr().out
+    assert "Generated django_interop in" in out
+    assert "4 written, 0 unchanged" in out
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "_utility_types.ts",
+        "auth.ts",
+        "contenttypes.ts",
+        "django_interop.ts",
+    ]
+    gigs_ts = (tmp_path / "django_interop.ts").read_text()
+    assert "export interface PetSittingGig" in gigs_ts
+    assert "import type { User } from './auth'" in gigs_ts
+
+    call_command("generate_typescript", "django_interop", output_dir=str(tmp_path), check=True)
+    call_command("generate_typescript", "django_interop", output_dir=str(tmp_path))
+    assert "0 written, 4 unchanged" in capsys.readouterr().out
+
+    (tmp_path / "auth.ts").write_text("// stale\n")
+    with pytest.raises(CommandError, match="Out of date: .*auth.ts"):
+        call_command("generate_typescript", "django_interop", output_dir=str(tmp_path), check=True)
+
+
+def test_generate_typescript_from_config(tmp_path, capsys):
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.typtyp.worlds.gigs]\n"
+        'types = ["tests.django_interop.models:PetSittingGig"]\n'
+        "follow_references = true\n"
+        'output = "gigs.ts"\n'
+        "[tool.typtyp.worlds.users]\n"
+        'types = ["django.contrib.auth.models:User"]\n'
+        "follow_references = true\n"
+        'output = "users.ts"\n',
+    )
+    call_command("generate_typescript", config=str(tmp_path / "pyproject.toml"), verbosity=2)
+    out = capsys.readouterr().out
+    assert "Generated gigs in" in out
+    assert "Generated users in" in out
+    assert "export interface User" in (tmp_path / "users.ts").read_text()
+
+
+def test_generate_typescript_errors(tmp_path):
+    with pytest.raises(CommandError, match="--output-dir or --config"):
+        call_command("generate_typescript")
+    with pytest.raises(CommandError, match="No installed app"):
+        call_command("generate_typescript", "nonexistent", output_dir=str(tmp_path))
+
+
+def test_generate_typescript_name_clash(tmp_path, monkeypatch):
+    import dataclasses
+
+    from django.apps import apps
+
+    # Another app with a model named like `auth.User`
+    clashing_user = dataclasses.make_dataclass("User", [("id", int)])
+    monkeypatch.setattr(apps.get_app_config("contenttypes"), "get_models", lambda: [clashing_user])
+    with pytest.raises(CommandError, match="Type User already exists"):
+        call_command("generate_typescript", "auth", "contenttypes", output_dir=str(tmp_path))
@@ -23,3 +23,61 @@ def test_drf(checked_ts_snapshot):
         DifficultyLevel,
     )
     assert checked_ts_snapshot(w)
+
+
+def test_serializer_introspection_is_cached_and_instantiation_free(monkeypatch):
+    from rest_framework import serializers
+
+    from typtyp import drf
+
+    class NoteSerializer(serializers.Serializer):
+        text = serializers.CharField(help_text="The note")
+        author = UserSerializer()
+        word_count = serializers.SerializerMethodField()
+        tags = serializers.ListField(child=serializers.CharField())
+
+        def get_word_count(self, obj) -> int:
+            return len(obj.text.split())
+
+    expected = [
+        ("author", UserSerializer, None),
+        ("tags", list[str], None),
+        ("text", str, "The note"),
+        ("word_count", int, None),
+    ]
+    instantiated = []
+    original_init = serializers.BaseSerializer.__init__
+
+    def counting_init(self, *args, **kwargs):
+        instantiated.append(type(self))
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(serializers.BaseSerializer, "__init__", counting_init)
+    fields = drf.get_serializer_fields(NoteSerializer)
+    assert [(fi.name, fi.type, fi.doc) for fi in fields] == expected
+    assert instantiated == []
+    assert drf.get_serializer_fields(NoteSerializer) is fields
+
+    drf.clear_serializer_fields_cache()
+    drf.get_serializer_fields(UserSerializer)
+    drf.get_serializer_fields(UserSerializer)
+    assert instantiated == [UserSerializer]
+    # Instantiating gives the same results
+    assert [
+        (name, drf.get_drf_field_type(field), field.help_text or None)
+        for name, field in sorted(NoteSerializer().fields.items())
+    ] == expected
+
+
+def test_clear_caches_forgets_serializer_fields():
+    from rest_framework import serializers
+
+    class TagSerializer(serializers.Serializer):
+        name = serializers.CharField()
+
+    w = world_from_types(TagSerializer)
+    assert "color" not in w.get_typescript()
+    # Modified in place
+    TagSerializer._declared_fields["color"] = serializers.CharField()
+    w.clear_caches()
+    assert "color: string\n" in w.get_typescript()
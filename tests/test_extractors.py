@@ -0,0 +1,76 @@
+import importlib.metadata
+import sys
+
+import pytest
+
+from typtyp.extractors import ENTRY_POINT_GROUP, StructExtractor, StructExtractorRegistry
+from typtyp.field_info import FieldInfo
+
+
+class Slotted:
+    __slots__ = ("x", "y")
+
+
+def is_slotted(tp) -> bool:
+    return isinstance(tp, type) and bool(getattr(tp, "__slots__", None))
+
+
+def get_slotted_fields(tp):
+    return [FieldInfo(name=name, type=int) for name in tp.__slots__]
+
+
+slotted_extractor = StructExtractor("slotted", is_struct=is_slotted, get_fields=get_slotted_fields)
+
+
+def test_missing_backend_is_probed_once(monkeypatch):
+    imports = []
+    real_import_module = importlib.import_module
+
+    def import_module(name, *args):
+        imports.append(name)
+        return real_import_module(name, *args)
+
+    monkeypatch.setattr(importlib, "import_module", import_module)
+    extractor = StructExtractor(
+        "nonexistent",
+        module="typtyp_nonexistent_backend",
+        is_struct="is_struct",
+        get_fields="get_fields",
+    )
+    registry = StructExtractorRegistry([extractor], load_entry_points=False)
+    for _ in range(3):
+        assert registry.get_fields(Slotted) is None
+    assert imports == ["typtyp_nonexistent_backend"]
+
+
+def test_required_module_is_checked_first():
+    extractor = StructExtractor(
+        "gated",
+        module="typtyp_nonexistent_backend",
+        is_struct="is_struct",
+        get_fields="get_fields",
+        requires_module="typtyp_nonexistent_library",
+    )
+    registry = StructExtractorRegistry([extractor], load_entry_points=False)
+    assert "typtyp_nonexistent_library" not in sys.modules
+    assert registry.get_fields(Slotted) is None
+    assert extractor._available is None  # never even tried to import the backend
+
+
+def test_entry_point_extractors(monkeypatch):
+    def entry_points(*, group):
+        assert group == ENTRY_POINT_GROUP
+        return [
+            importlib.metadata.EntryPoint(
+                name="slotted",
+                value=f"{__name__}:slotted_extractor",
+                group=ENTRY_POINT_GROUP,
+            ),
+            importlib.metadata.EntryPoint(name="broken", value="typtyp_nonexistent:nope", group=ENTRY_POINT_GROUP),
+        ]
+
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points)
+    registry = StructExtractorRegistry()
+    with pytest.warns(UserWarning, match="broken"):
+        assert registry.get_fields(Slotted) == [FieldInfo("x", int), FieldInfo("y", int)]
+    assert registry.find(Slotted) is slotted_extractor
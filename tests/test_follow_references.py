@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import dataclasses
+import enum
+from typing import TypedDict
+
+import pytest
+
+import typtyp
+
+
+class Species(enum.Enum):
+    CAT = "cat"
+    DOG = "dog"
+
+
+class Collar(TypedDict):
+    color: str
+    owner: Owner | None
+
+
+@dataclasses.dataclass
+class Pet:
+    species: Species
+    collar: Collar
+    best_friend: Pet | None
+    toys: list[Toy]
+
+
+@dataclasses.dataclass
+class Toy:
+    name: str
+    favorite_of: dict[str, Pet]
+
+
+@dataclasses.dataclass
+class Owner:
+    pets: list[Pet]
+
+
+def test_follow_references():
+    w = typtyp.World()
+    w.add(Pet, follow_references=True)
+    assert [ti.name for ti in w] == ["Pet", "Species", "Collar", "Toy", "Owner"]
+    code = w.get_typescript()
+    assert "best_friend: Pet | null\n" in code
+    assert "owner: Owner | null\n" in code
+
+
+def test_follow_references_respects_registered_names():
+    w = typtyp.World()
+    w.add(Toy, name="Plaything")
+    w.add_many([Owner, Collar], follow_references=True)
+    assert [ti.name for ti in w] == ["Plaything", "Owner", "Collar", "Pet", "Species"]
+    assert "toys: (Plaything)[]\n" in w.get_typescript()
+
+
+def test_follow_references_skips_overridden_fields():
+    w = typtyp.World()
+    w.add(
+        Toy,
+        configuration=typtyp.TypeConfiguration(field_overrides={"favorite_of": None}),
+        follow_references=True,
+    )
+    assert [ti.name for ti in w] == ["Toy"]
+
+
+def test_follow_django_references():
+    pytest.importorskip("django")
+    from django.contrib.auth.models import User
+
+    from tests.django_interop.models import PetSittingGig
+
+    w = typtyp.World()
+    w.add(PetSittingGig, follow_references=True)
+    assert {ti.name for ti in w} == {"PetSittingGig", "User", "Group", "Permission", "ContentType"}
+    assert w.get_type_info("User").type is User
+    assert w.get_typescript()
+
+
+def test_follow_references_name_clash_adds_nothing():
+    def make_toy() -> type:
+        return dataclasses.make_dataclass("Toy", [("name", str)])
+
+    shelf = dataclasses.make_dataclass("Shelf", [("species", Species), ("toy", make_toy()), ("other", make_toy())])
+    w = typtyp.World()
+    with pytest.raises(KeyError, match="would both be named Toy"):
+        w.add(shelf, follow_references=True)
+    assert not list(w)  # Nothing (e.g. Species) was added
+
+    w = typtyp.World()
+    w.add(Toy)
+    with pytest.raises(KeyError, match="type Toy already exists"):
+        w.add(dataclasses.make_dataclass("Box", [("toy", make_toy())]), follow_references=True)
+    assert [ti.name for ti in w] == ["Toy"]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import dataclasses
+
+import typtyp
+from typtyp import TypeConfiguration
+from typtyp.graph import DependencyGraph
+from typtyp.typescript import TypeScriptOptions
+
+
+@dataclasses.dataclass
+class Invoice:
+    customer: Customer
+    lines: list[InvoiceLine]
+
+
+@dataclasses.dataclass
+class InvoiceLine:
+    product: Product
+    invoice: Invoice
+
+
+@dataclasses.dataclass
+class Customer:
+    name: str
+
+
+@dataclasses.dataclass
+class Product:
+    name: str
+    vendor: Vendor
+
+
+class Vendor:
+    pass
+
+
+def make_world() -> typtyp.World:
+    w = typtyp.World()
+    w.add_many((Invoice, InvoiceLine, Customer, Product), doc=None)
+    w.add(Vendor, configuration=TypeConfiguration(import_from=("./vendor", "Vendor")))
+    return w
+
+
+def test_dependency_graph():
+    w = make_world()
+    graph = w.dependency_graph()
+    assert graph.edges == {
+        "Vendor": (),
+        "Invoice": ("Customer", "InvoiceLine"),
+        "InvoiceLine": ("Product", "Invoice"),
+        "Customer": (),
+        "Product": ("Vendor",),
+    }
+    assert graph.dependents("Invoice") == ["InvoiceLine"]
+    assert graph.strongly_connected_components() == [["Vendor"], ["Customer"], ["Product"], ["InvoiceLine", "Invoice"]]
+    assert w.dependency_graph() is graph  # Reused...
+    w.remove(Customer)
+    assert w.dependency_graph() is not graph  # ... until the world changes
+
+
+def test_topological_order_is_stable():
+    graph = DependencyGraph(edges={"a": ("c",), "b": (), "c": ("b", "d"), "d": ("c",), "e": ()})
+    assert graph.topological_order() == ["b", "c", "d", "a", "e"]
+    assert graph.topological_order(["e", "d", "c"]) == ["e", "d", "c"]
+    deep = DependencyGraph(edges={str(i): (str(i + 1),) for i in range(10_000)} | {"10000": ()})
+    assert deep.topological_order()[:2] == ["10000", "9999"]  # No recursion limit issues
+
+
+def test_dependency_order_output():
+    code = make_world().get_typescript(options=TypeScriptOptions(dependency_order=True))
+    positions = [code.index(f"interface {name} ") for name in ("Customer", "Product", "Invoice", "InvoiceLine")]
+    assert positions == sorted(positions)
+    assert code.startswith("import { Vendor } from './vendor'\n")
+    code = make_world().get_typescript(options=TypeScriptOptions(dependency_order=True, order_by=lambda ti: ti.name))
+    positions = [code.index(f"interface {name} ") for name in ("Customer", "Product", "Invoice", "InvoiceLine")]
+    assert positions == sorted(positions)
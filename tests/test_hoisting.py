@@ -0,0 +1,90 @@
+import dataclasses
+import uuid
+from typing import Literal
+
+import typtyp
+from typtyp import TypeConfiguration
+from typtyp.typescript import TypeScriptOptions
+
+Status = Literal["draft", "pending_review", "published", "archived"]
+
+
+@dataclasses.dataclass
+class Article:
+    status: Status
+    previous_status: Status | None
+    tags: dict[str, list[tuple[uuid.UUID, str]]]
+    kind: Literal["a", "b"]
+
+
+@dataclasses.dataclass
+class Page:
+    status: Status
+    attachments: dict[str, list[tuple[uuid.UUID, str]]] | None
+    kind: Literal["a", "b"]
+
+
+@dataclasses.dataclass
+class Comment:
+    status: Status | None
+    tags: dict[str, list[tuple[uuid.UUID, str]]]
+
+
+def make_world() -> typtyp.World:
+    w = typtyp.World()
+    w.add_many((Article, Page), doc=None)
+    w.add(Comment, doc=None, configuration=TypeConfiguration(null_is_undefined=True))
+    return w
+
+
+def test_hoisting(checked_ts_snapshot):
+    code = make_world().get_typescript(options=TypeScriptOptions(hoist_min_occurrences=3))
+    assert "export type ArticleStatus = " in code
+    assert "export type ArticleTags = " in code
+    assert "previous_status: ArticleStatus | null\n" in code
+    assert "attachments: ArticleTags | null\n" in code
+    assert "ArticleKind" not in code  # too short to be worth it
+    assert checked_ts_snapshot(code)
+
+
+def test_hoisting_thresholds():
+    w = make_world()
+    assert "ArticleStatus" not in w.get_typescript(options=TypeScriptOptions(hoist_min_occurrences=6))
+    code = w.get_typescript(options=TypeScriptOptions(hoist_min_occurrences=2, hoist_min_length=1))
+    assert "type ArticleKind = " in code
+    assert w.get_typescript() == make_world().get_typescript(options=TypeScriptOptions(hoist_min_occurrences=0))
+
+
+def test_hoisting_parallel():
+    options = TypeScriptOptions(hoist_min_occurrences=3)
+    assert make_world().get_typescript(options=options, jobs=2) == make_world().get_typescript(options=options)
+
+
+@dataclasses.dataclass
+class Queue:
+    history: dict[str, list[Status]]
+    pending: tuple[list[Status], int]
+    lookup: dict[str, uuid.UUID] | list[Status] | None
+    by_owner: list[dict[str, uuid.UUID]]
+    fallback: dict[str, uuid.UUID] | int
+
+
+def test_hoisting_nested():
+    w = typtyp.World()
+    w.add(Queue, doc=None)
+    code = w.get_typescript(options=TypeScriptOptions(hoist_min_occurrences=3, hoist_min_length=10))
+    assert "history: Record<string, QueueHistoryItem>\n" in code
+    assert "pending: [QueueHistoryItem, number]\n" in code
+    assert "lookup: QueueLookupItem | QueueHistoryItem | null\n" in code
+    assert "fallback: QueueLookupItem | number\n" in code
+    assert "export type QueueLookupItem = Record<string, UUID>\n" in code
+    # Status only occurs once outside of other hoisted types, so it's not hoisted itself
+    assert code.count('"draft" | "pending_review"') == 1
+
+
+def test_hoisting_multi_file():
+    files = make_world().get_typescript_files(options=TypeScriptOptions(hoist_min_occurrences=3))
+    code = files["tests.test_hoisting.ts"]
+    assert code.startswith("import type { UUID } from './_utility_types'\n")  # (only used by a hoisted type)
+    assert "previous_status: ArticleStatus | null\n" in code
+    assert "export type ArticleTags = Record<string, Array<[UUID, string]>>\n" in code
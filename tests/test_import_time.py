@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import typtyp
+
+# Generous, so this only catches regressions like `import typtyp` importing everything again
+# (which took tens of milliseconds); it's about 3 ms at the time of writing.
+IMPORT_TIME_BUDGET_US = 25_000
+
+
+def get_import_times(code: str) -> dict[str, int]:
+    """
+    Run `code` in a fresh interpreter and get the cumulative import times (in microseconds) by module.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_is_cheap():
+    times = get_import_times("import typtyp")
+    assert "typtyp" in times
+    assert not {"typtyp.world", "typtyp.field_info", "typtyp.typescript"} & set(times)
+    assert times["typtyp"] < IMPORT_TIME_BUDGET_US
+
+
+def test_default_scalars_are_lazy():
+    code = "import sys, typtyp; typtyp.World(); sys.stdout.write(' '.join(sys.modules))"
+    modules = set(
+        subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split(),
+    )
+    assert "typtyp.world" in modules
+    assert not {"typtyp.typescript", "typtyp.scalars", "ipaddress", "decimal", "uuid"} & modules
+
+
+def test_lazy_attributes():
+    assert set(typtyp.__all__) <= set(dir(typtyp))
+    assert typtyp.World.__module__ == "typtyp.world"
+    assert typtyp.FieldInfo.__module__ == "typtyp.field_info"
+    assert not hasattr(typtyp, "Nonexistent")
@@ -0,0 +1,85 @@
+import dataclasses
+import uuid
+
+from tests.helpers import world_from_types
+from typtyp.typescript import TypeScriptOptions
+
+
+@dataclasses.dataclass
+class Owner:
+    id: uuid.UUID
+    name: str
+
+
+@dataclasses.dataclass
+class Pet:
+    owner: Owner
+    name: str
+
+
+@dataclasses.dataclass
+class Vet:
+    name: str
+
+
+def test_unchanged_world_reuses_fragments():
+    w = world_from_types(Owner, Pet, Vet, incremental=True)
+    code = w.get_typescript()
+    cache = w.fragment_cache
+    assert (cache.hits, cache.misses) == (0, 3)
+    assert w.get_typescript() == code
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_changed_type_is_rerendered():
+    w = world_from_types(Owner, Pet, Vet, incremental=True)
+    w.get_typescript()
+
+    @dataclasses.dataclass
+    class Vet2:  # e.g. a reloaded version of `Vet`
+        name: str
+        clinic: str
+
+    w.remove(Vet)
+    w.add(Vet2, name="Vet", doc=None)
+    cache = w.fragment_cache
+    code = w.get_typescript()
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert "clinic: string\n" in code
+    assert "export type UUID = string\n" in code  # utility types are replayed from cached fragments
+
+
+def test_renamed_type_rerenders_dependents():
+    w = world_from_types(Owner, Pet, Vet, incremental=True)
+    w.get_typescript()
+    w.remove(Owner)
+    w.add(Owner, name="Person", doc=None)
+    cache = w.fragment_cache
+    code = w.get_typescript()
+    assert (cache.hits, cache.misses) == (1, 5)  # Vet is reused; Person and Pet (which refers to it) are not
+    assert "owner: Person\n" in code
+    assert code == w.get_typescript(fragment_cache=None)
+
+
+def test_options_change_invalidates_fragments():
+    w = world_from_types(Owner, Pet, Vet, incremental=True)
+    w.get_typescript()
+    code = w.get_typescript(options=TypeScriptOptions(exported_types={"Pet"}))
+    assert w.fragment_cache.hits == 0
+    assert "export interface Pet" in code
+    assert "export interface Owner" not in code
+
+
+def test_fingerprint_depends_on_references():
+    w = world_from_types(Owner, Pet, Vet)
+    pet_fingerprint = w.get_fingerprint(w._types_by_name["Pet"])
+    assert w.get_referenced_names(w._types_by_name["Pet"]) == ["Owner"]
+    w.remove("Owner")
+    w.add(Owner, doc="Now with a docstring")
+    assert w.get_fingerprint(w._types_by_name["Pet"]) != pet_fingerprint
+
+
+def test_non_incremental_world():
+    w = world_from_types(Owner, Pet, Vet)
+    assert w.fragment_cache is None
+    assert w.get_typescript() == world_from_types(Owner, Pet, Vet, incremental=True).get_typescript()
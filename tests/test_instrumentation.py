@@ -0,0 +1,71 @@
+import dataclasses
+import io
+import uuid
+
+import pytest
+
+import typtyp
+from tests.common import HairColor
+from typtyp.instrumentation import StatsCollector, TimingReporter
+
+
+@dataclasses.dataclass
+class Head:
+    id: uuid.UUID
+    hair_color: HairColor
+    tags: dict[str, list[tuple[int, str]]]
+
+
+@dataclasses.dataclass
+class Person:
+    head: Head
+    nickname: str | None
+
+
+def make_world() -> typtyp.World:
+    w = typtyp.World(incremental=True)
+    w.add_many((Person, Head, HairColor))
+    return w
+
+
+def test_stats_are_collected():
+    w = make_world()
+    collector = StatsCollector()
+    code = w.get_typescript(observer=collector)
+    assert code == make_world().get_typescript()  # Observing doesn't change the output
+    stats = {s.name: s for s in collector.type_stats}
+    assert set(stats) == {"Person", "Head", "HairColor", "UUID"}
+    assert stats["Head"].depth == 4  # dict -> list -> tuple -> int
+    assert stats["Person"].depth == 2
+    assert stats["HairColor"].depth == 1
+    assert sum(s.output_bytes for s in collector.type_stats) == len(code)
+    assert all(s.render_time > 0 and not s.cached for s in collector.type_stats)
+    assert stats["Head"].introspection_time > 0
+    gs = collector.generation_stats
+    assert gs.type_count == 3
+    assert (gs.fragment_cache_hits, gs.fragment_cache_misses) == (0, 3)
+    assert gs.translation_cache_misses > 0
+    assert gs.introspection_cache_size == 4  # including the UUID utility type
+
+    collector = StatsCollector()
+    w.get_typescript(observer=collector)
+    assert [s.cached for s in collector.type_stats] == [True, True, True, False]  # the utility type is rewritten
+    assert (collector.generation_stats.fragment_cache_hits, collector.generation_stats.fragment_cache_misses) == (3, 0)
+
+
+def test_stats_from_worker_processes():
+    collector = StatsCollector()
+    make_world().get_typescript(observer=collector, jobs=2)
+    assert {s.name for s in collector.type_stats} == {"Person", "Head", "HairColor", "UUID"}
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_timing_reporter(incremental):
+    w = typtyp.World(incremental=incremental)
+    w.add_many((Person, Head, HairColor))
+    sio = io.StringIO()
+    w.get_typescript(observer=TimingReporter(top_n=2, file=sio))
+    report = sio.getvalue()
+    assert report.startswith("Slowest 2 of 4 types:\n")
+    assert "Generated 3 types in" in report
+    assert "translation cache:" in report
@@ -0,0 +1,89 @@
+import io
+import pickle
+
+import pytest
+
+import typtyp
+from tests import test_hoisting, test_kitchen_sink
+from typtyp import ir
+from typtyp.typescript import TypeScriptOptions, render_type, write_compiled
+
+
+def make_kitchen_sink_world() -> typtyp.World:
+    ks = test_kitchen_sink
+    w = typtyp.World()
+    w.add(ks.KitchenSink)
+    w.add(ks.Address)
+    w.add_many((ks.Status, ks.UnixPermissions))
+    w.add(ks.NumEnum, name="FavoriteNumberEnum")
+    w.add(ks.Point)
+    w.add(ks.NestedConfig)
+    w.add(ks.Person2)
+    return w
+
+
+def render(compiled: ir.CompiledWorld, options: TypeScriptOptions | None = None, **kwargs) -> str:
+    sio = io.StringIO()
+    write_compiled(sio, compiled, options, **kwargs)
+    return sio.getvalue()
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        TypeScriptOptions(),
+        TypeScriptOptions(exported_types={"Address"}),
+        TypeScriptOptions(type_only_imports=True),
+        TypeScriptOptions(roots={"Person2"}),
+    ],
+)
+def test_compiled_renders_like_world(options):
+    w = make_kitchen_sink_world()
+    compiled = w.compile()
+    assert render(compiled, options) == make_kitchen_sink_world().get_typescript(options=options)
+
+
+def test_compiled_is_picklable():
+    w = make_kitchen_sink_world()
+    compiled = w.compile()
+    struct_fields = dict(w._struct_fields)
+    unpickled = pickle.loads(pickle.dumps(compiled))
+    assert unpickled == compiled
+    code = render(unpickled, TypeScriptOptions(exported_types=False))
+    assert w._struct_fields == struct_fields  # Rendering didn't introspect anything
+    assert code == w.get_typescript(options=TypeScriptOptions(exported_types=False))
+
+
+def test_compiled_hoisting_and_null_is_undefined():
+    options = TypeScriptOptions(hoist_min_occurrences=2, dependency_order=True)
+    compiled = test_hoisting.make_world().compile(options=options)
+    assert [decl.name for decl in compiled.hoisted_decls] == ["ArticleStatus", "ArticleTags"]
+    assert render(compiled, options) == test_hoisting.make_world().get_typescript(options=options)
+    assert "previous_status?:" in render(compiled, options, null_is_undefined=True)
+    assert "status: ArticleStatus | null" in render(compiled, options, null_is_undefined=False)
+
+
+def test_iter_references():
+    node = ir.UnionType((ir.Array(ir.Reference("A")), ir.Record(ir.Keyword("string"), ir.Reference("B")), ir.Null()))
+    assert sorted(ir.iter_references(node)) == ["A", "B"]
+
+
+def test_optional_fields_are_structural():
+    decl = ir.StructDecl(
+        name="Shoe",
+        fields=(
+            ir.FieldDecl("laces", ir.Array(ir.UnionType((ir.Keyword("string"), ir.Null())))),
+            ir.FieldDecl("color", ir.Commented(ir.UnionType((ir.Null(), ir.Keyword("string"))), ("hex",))),
+            ir.FieldDecl("size", ir.UnionType((ir.Keyword("number"), ir.Keyword("string"), ir.Null()))),
+        ),
+        null_is_undefined=True,
+    )
+    code = render(ir.CompiledWorld((decl,)))
+    assert "laces: Array<string | undefined>\n" in code  # (not optional itself)
+    assert "color?: string /* hex */\n" in code
+    assert "size?: number | string\n" in code
+
+
+def test_array_of_non_alphanumeric_reference():
+    assert render_type(ir.Array(ir.Reference("Foo_Bar"))) == "Array<Foo_Bar>"
+    assert render_type(ir.Array(ir.Reference("FooBar"))) == "(FooBar)[]"
@@ -0,0 +1,65 @@
+import dataclasses
+import uuid
+
+import typtyp
+from tests.common import HairColor
+from tests.helpers import check_with_tsc
+from typtyp import TypeConfiguration
+from typtyp.typescript import TypeScriptOptions
+
+
+class Wibblewobble:
+    pass
+
+
+@dataclasses.dataclass
+class Head:
+    id: uuid.UUID
+    hair_color: HairColor
+    wibble: Wibblewobble
+
+
+@dataclasses.dataclass
+class Person:
+    head: Head
+
+
+def make_world() -> typtyp.World:
+    w = typtyp.World()
+    w.add_many((Person, Head, HairColor), doc=None)
+    w.add(Wibblewobble, configuration=TypeConfiguration(import_from=("./webby", "WibWob")))
+    return w
+
+
+def test_multi_file(snapshot):
+    files = make_world().get_typescript_files(options=TypeScriptOptions(exported_types={"Person"}))
+    assert set(files) == {"tests.test_multi_file.ts", "tests.common.ts", "_utility_types.ts"}
+    main = files.pop("tests.test_multi_file.ts")
+    assert "export interface Person" in main
+    assert "interface Head" in main and "export interface Head" not in main
+    assert "export const enum HairColor" in files["tests.common.ts"]  # exported since it's imported elsewhere
+    assert check_with_tsc(main, extra_files={**files, "webby.ts": "export class WibWob {}"})
+    assert files == snapshot
+    assert main == snapshot
+
+
+def test_custom_partition():
+    files = make_world().get_typescript_files(partition=lambda ti: ti.name.lower())
+    assert set(files) == {"person.ts", "head.ts", "haircolor.ts", "_utility_types.ts"}
+    assert "import type { Head } from './head'\n" in files["person.ts"]
+
+
+def test_unchanged_files_are_not_rewritten(tmp_path):
+    w = make_world()
+    assert w.write_typescript_files(tmp_path) == {
+        "tests.test_multi_file.ts": True,
+        "tests.common.ts": True,
+        "_utility_types.ts": True,
+    }
+    assert not any(w.write_typescript_files(tmp_path).values())
+    (tmp_path / "tests.common.ts").write_text("// edited by hand")
+    assert w.write_typescript_files(tmp_path) == {
+        "tests.test_multi_file.ts": False,
+        "tests.common.ts": True,
+        "_utility_types.ts": False,
+    }
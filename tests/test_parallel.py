@@ -0,0 +1,72 @@
+import dataclasses
+
+import pytest
+
+import typtyp
+from tests.test_kitchen_sink import Address, KitchenSink, NestedConfig, NumEnum, Person2, Point, Status, UnixPermissions
+from typtyp.excs import UnreferrableTypeError
+from typtyp.type_info import TypeInfo
+from typtyp.typescript import TypeScriptOptions
+
+
+def by_name(type_info: TypeInfo) -> str:
+    return type_info.name
+
+
+def make_kitchen_sink_world(*, incremental: bool = True) -> typtyp.World:
+    w = typtyp.World(incremental=incremental)
+    w.add(KitchenSink)
+    w.add(Address)
+    w.add_many((Status, UnixPermissions))
+    w.add(NumEnum, name="FavoriteNumberEnum")
+    w.add_many((Point, NestedConfig, Person2))
+    return w
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_parallel_output_is_identical(incremental):
+    serial = make_kitchen_sink_world(incremental=False).get_typescript(
+        options=TypeScriptOptions(order_by=by_name),
+    )
+    w = make_kitchen_sink_world(incremental=incremental)
+    options = TypeScriptOptions(order_by=by_name)
+    assert w.get_typescript(options=options, jobs=3) == serial
+    # Reusing cached fragments (if any) works in parallel mode too
+    assert w.get_typescript(options=options, jobs=3) == serial
+
+
+# (Types and options are defined at module level, so they can be pickled for workers that aren't forked.)
+@dataclasses.dataclass
+class Orphan:
+    pass
+
+
+@dataclasses.dataclass
+class Parent:
+    orphan: Orphan
+
+
+def test_parallel_errors_propagate():
+    w = make_kitchen_sink_world()
+    w.add(Parent)
+    with pytest.raises(UnreferrableTypeError):
+        w.get_typescript(jobs=2)
+
+
+def test_parallel_fingerprints_in_workers():
+    w = make_kitchen_sink_world()
+    code = w.get_typescript(jobs=2)
+    # Types were introspected (and fingerprinted) in the workers
+    assert not {type_info.type for type_info in w} & set(w._struct_fields)
+    assert w.get_typescript(jobs=2) == code
+    assert w.fragment_cache.hits == len(list(w))
+    assert not {type_info.type for type_info in w} & set(w._struct_fields)
+
+
+def test_parallel_off_main_thread():
+    import concurrent.futures
+
+    serial = make_kitchen_sink_world(incremental=False).get_typescript()
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        # (Not forked off this thread; the world is pickled for the workers instead.)
+        assert executor.submit(make_kitchen_sink_world().get_typescript, jobs=2).result() == serial
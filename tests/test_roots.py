@@ -0,0 +1,61 @@
+import dataclasses
+import uuid
+
+import pytest
+
+import typtyp
+from tests.common import HairColor
+from typtyp import TypeConfiguration
+from typtyp.typescript import TypeScriptOptions
+
+
+class Gravatar:
+    pass
+
+
+@dataclasses.dataclass
+class Profile:
+    hair_color: HairColor
+    avatar: Gravatar
+
+
+@dataclasses.dataclass
+class User:
+    id: uuid.UUID
+    profile: Profile
+
+
+@dataclasses.dataclass
+class AuditLogEntry:
+    user: User
+    message: str
+
+
+@dataclasses.dataclass
+class Unrelated:
+    id: uuid.UUID
+
+
+def make_world() -> typtyp.World:
+    w = typtyp.World()
+    w.add(Gravatar, configuration=TypeConfiguration(import_from=("./avatars", "Gravatar")))
+    w.add_many((AuditLogEntry, User, Profile, HairColor, Unrelated), doc=None)
+    return w
+
+
+@pytest.mark.parametrize("dependency_order", [False, True])
+def test_roots(checked_ts_snapshot, dependency_order):
+    w = make_world()
+    code = w.get_typescript(options=TypeScriptOptions(roots={"User"}, dependency_order=dependency_order))
+    assert "AuditLogEntry" not in code
+    assert "Unrelated" not in code
+    assert "import { Gravatar } from './avatars'\n" in code
+    # Unreachable types aren't even introspected
+    assert AuditLogEntry not in w._struct_fields
+    assert Unrelated not in w._struct_fields
+    assert checked_ts_snapshot(code)
+
+
+def test_unknown_root():
+    with pytest.raises(KeyError):
+        make_world().get_typescript(options=TypeScriptOptions(roots={"Nope"}))
@@ -0,0 +1,69 @@
+import datetime
+import enum
+from typing import TypedDict
+
+import pytest
+
+import typtyp
+from tests.helpers import world_from_types
+from typtyp.excs import UnreferrableTypeError
+from typtyp.scalars import ScalarMapping, ScalarRegistry, default_scalars
+from typtyp.typescript import TypeScriptOptions
+
+
+class ObjectId:
+    pass
+
+
+class Money(str):
+    pass
+
+
+class LocalDateTime(datetime.datetime):
+    pass
+
+
+class Color(enum.IntEnum):
+    RED = 1
+
+
+class Document(TypedDict):
+    id: ObjectId
+    price: Money
+    created_at: LocalDateTime
+
+
+def test_custom_scalars(checked_ts_snapshot):
+    scalars = default_scalars.copy()
+    scalars.register(ObjectId, ScalarMapping("string", comment="ObjectId"))
+    scalars.register(Money, ScalarMapping("Money", utility_type=str))
+    w = world_from_types(Document)
+    code = w.get_typescript(options=TypeScriptOptions(scalars=scalars))
+    assert "price: Money\n" in code
+    assert "export type Money = string\n" in code
+    assert checked_ts_snapshot(code)
+    # The default registry is left untouched.
+    assert default_scalars.resolve(ObjectId) is None
+    assert default_scalars.resolve(Money) == ScalarMapping("string")
+
+
+def test_resolve_walks_mro():
+    registry = ScalarRegistry({int: ScalarMapping("number"), bool: ScalarMapping("boolean")})
+    assert registry.resolve(bool) == ScalarMapping("boolean")
+    assert registry.resolve(Color) is None  # enums must be explicitly registered
+    registry.register(Color, ScalarMapping("number", comment="Color"))
+    assert registry.resolve(Color) == ScalarMapping("number", comment="Color")
+    registry.register(int, None)
+    assert registry.resolve(int) is None
+    assert registry.resolve(bool) == ScalarMapping("boolean")
+
+
+def test_unregistered_enum_is_unreferrable():
+    class Wrapper(TypedDict):
+        color: Color
+
+    with pytest.raises(UnreferrableTypeError):
+        world_from_types(Wrapper).get_typescript()
+    w = typtyp.World()
+    w.add_many((Wrapper, Color))
+    assert "color: Color\n" in w.get_typescript()
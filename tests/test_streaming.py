@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from tests.test_ir import make_kitchen_sink_world
+from typtyp.incremental import FragmentCache
+from typtyp.output import FileSink, has_content, write_if_changed
+from typtyp.typescript import TypeScriptOptions
+
+
+@pytest.mark.parametrize("fragment_cache", [False, True])
+def test_iter_typescript(fragment_cache):
+    w = make_kitchen_sink_world()
+    w.fragment_cache = None
+    options = TypeScriptOptions(hoist_min_occurrences=2)
+    chunks = list(w.iter_typescript(options=options, fragment_cache=FragmentCache() if fragment_cache else None))
+    assert len(chunks) >= len(list(w))  # at least one chunk per type
+    assert all(chunks)
+    assert "".join(chunks) == make_kitchen_sink_world().get_typescript(options=options)
+
+
+def test_iter_typescript_streams():
+    w = make_kitchen_sink_world()
+    chunks = w.iter_typescript()
+    first = next(chunks)
+    introspected = len(w._struct_fields)
+    assert "".join([first, *chunks]) == make_kitchen_sink_world().get_typescript()
+    assert introspected < len(w._struct_fields)  # (types were rendered as they were yielded)
+    assert not w.fragment_cache  # the world's fragment cache wasn't used
+
+
+def test_file_sink(tmp_path):
+    w = make_kitchen_sink_world()
+    path = tmp_path / "types.ts"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    try:
+        with FileSink(fd, buffer_size=100) as sink:
+            sink.writelines(w.iter_typescript())
+            sink.write("// ünïcode\n")
+    finally:
+        os.close(fd)
+    assert path.read_text(encoding="utf-8") == w.get_typescript() + "// ünïcode\n"
+
+
+def test_write_typescript_only_when_changed(tmp_path):
+    w = make_kitchen_sink_world()
+    path = tmp_path / "out" / "types.ts"
+    assert w.write_typescript(path)
+    assert path.read_text(encoding="utf-8") == w.get_typescript()
+    mode = path.stat().st_mode
+    os.utime(path, ns=(0, 0))
+    assert not w.write_typescript(path)
+    assert path.stat().st_mtime_ns == 0  # untouched
+    assert has_content(path, w.iter_typescript())
+    assert w.write_typescript(path, options=TypeScriptOptions(exported_types=False))
+    assert not has_content(path, w.get_typescript())
+    assert path.stat().st_mode == mode
+    assert os.listdir(path.parent) == ["types.ts"]  # no temporary files left behind
+
+
+def test_write_if_changed_failure_leaves_file_intact(tmp_path):
+    path = tmp_path / "types.ts"
+    assert write_if_changed(path, "old\n")
+
+    def chunks():
+        yield "new"
+        raise RuntimeError("nope")
+
+    with pytest.raises(RuntimeError):
+        write_if_changed(path, chunks())
+    assert path.read_text(encoding="utf-8") == "old\n"
+    assert os.listdir(tmp_path) == ["types.ts"]
+
+
+def test_write_if_changed_modes(tmp_path):
+    (tmp_path / "plain.ts").write_text("")
+    assert write_if_changed(tmp_path / "new.ts", "new\n")
+    # New files get the usual permissions, and existing files keep theirs
+    assert (tmp_path / "new.ts").stat().st_mode == (tmp_path / "plain.ts").stat().st_mode
+    os.chmod(tmp_path / "new.ts", 0o600)
+    assert write_if_changed(tmp_path / "new.ts", "changed\n")
+    assert (tmp_path / "new.ts").stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,74 @@
+import dataclasses
+import datetime
+import io
+import uuid
+from typing import Annotated, Literal, Optional
+
+import typtyp
+from tests.helpers import world_from_types
+from typtyp.translation_cache import CacheEntry, TranslationCache, get_cache_key
+from typtyp.typescript import TypeScriptContext, TypeScriptOptions, to_ts_type
+
+
+@dataclasses.dataclass
+class Event:
+    starts_at: Optional[datetime.datetime]
+    attendees: list[uuid.UUID]
+    kind: int | str
+
+
+@dataclasses.dataclass
+class Meeting:
+    starts_at: Optional[datetime.datetime]
+    attendees: list[uuid.UUID]
+    kind: str | int
+
+
+def test_cache_lru_eviction():
+    cache = TranslationCache(maxsize=2)
+    cache.put("a", CacheEntry("A", {}))
+    cache.put("b", CacheEntry("B", {}))
+    assert cache.get("a") == ("A", {})  # "a" is now the most recently used
+    cache.put("c", CacheEntry("C", {}))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert len(cache) == 2
+
+
+def test_cache_key_is_order_sensitive():
+    assert (int | str) == (str | int)
+    assert get_cache_key(int | str) != get_cache_key(str | int)
+    assert get_cache_key(Literal[1, True]) != get_cache_key(Literal[True, 1])
+    assert get_cache_key(list[int | str]) != get_cache_key(list[str | int])
+    assert get_cache_key(Optional[int]) == get_cache_key(Optional[int])
+
+
+def test_cached_output_matches_uncached():
+    w = world_from_types(Event, Meeting)
+    cached = w.get_typescript()
+    uncached = w.get_typescript(options=TypeScriptOptions(translation_cache_size=0))
+    assert cached == uncached
+    assert "kind: number | string\n" in cached
+    assert "kind: string | number\n" in cached
+
+
+def test_cache_hit_replays_utility_types():
+    w = world_from_types(Event, Meeting)
+    cache = TranslationCache()
+    ctx = TypeScriptContext(fp=io.StringIO(), world=w, options=TypeScriptOptions(), translation_cache=cache)
+    assert to_ts_type(list[uuid.UUID], ctx) == "(UUID)[]"
+    assert cache.misses == 2  # the list, and the UUID within
+    other_ctx = ctx.sub(required_utility_types={})
+    assert to_ts_type(list[uuid.UUID], other_ctx) == "(UUID)[]"
+    assert cache.hits == 1
+    assert other_ctx.required_utility_types == {"UUID": str}
+
+
+def test_unhashable_annotation_is_not_cached():
+    w = typtyp.World()
+    cache = TranslationCache()
+    ctx = TypeScriptContext(fp=io.StringIO(), world=w, options=TypeScriptOptions(), translation_cache=cache)
+    assert to_ts_type(Annotated[list[int], ["unhashable"]], ctx) == "(number)[]"
+    assert len(cache) == 1  # only the inner `int` got cached
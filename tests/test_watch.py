@@ -0,0 +1,163 @@
+import sys
+import textwrap
+import threading
+
+import pytest
+
+from typtyp.cli import load_config
+from typtyp.watch import Watcher
+
+FILES = {
+    "watch_a.py": """
+        import dataclasses
+        import enum
+
+
+        class Color(enum.Enum):
+            RED = "red"
+            BLUE = "blue"
+
+
+        @dataclasses.dataclass
+        class Widget:
+            name: str
+            color: Color
+    """,
+    "watch_b.py": """
+        import dataclasses
+
+        from watch_a import Widget
+
+
+        @dataclasses.dataclass
+        class Box:
+            widgets: list[Widget]
+    """,
+    "watch_c.py": """
+        import dataclasses
+
+
+        @dataclasses.dataclass
+        class Gadget:
+            name: str
+    """,
+}
+
+PYPROJECT = """
+    [tool.typtyp]
+    python_path = ["src"]
+
+    [tool.typtyp.worlds.ab]
+    modules = ["watch_a", "watch_b"]
+    output = "out/ab.ts"
+
+    [tool.typtyp.worlds.c]
+    modules = ["watch_c"]
+    output = "out/c.ts"
+"""
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    for name, content in FILES.items():
+        path = tmp_path / "src" / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(textwrap.dedent(content))
+    (tmp_path / "pyproject.toml").write_text(textwrap.dedent(PYPROJECT))
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    yield Watcher(load_config(tmp_path / "pyproject.toml"))
+    for name in FILES:
+        sys.modules.pop(name.removesuffix(".py"), None)
+
+
+def add_field(watcher, module_name, class_name, field):
+    path = watcher.root / "src" / f"{module_name}.py"
+    path.write_text(path.read_text().replace(f"class {class_name}:\n", f"class {class_name}:\n    {field}\n"))
+
+
+def test_refresh_only_affected(watcher):
+    out = watcher.root / "out"
+    assert watcher.build() == {out / "ab.ts": True, out / "c.ts": True}
+    assert {path.name for path in watcher.file_stats} == {"watch_a.py", "watch_b.py", "watch_c.py"}
+    assert watcher.poll() == set()
+
+    world_c = watcher.worlds["c"]
+    fragment_cache = watcher.worlds["ab"].fragment_cache
+    hits = fragment_cache.hits
+    add_field(watcher, "watch_a", "Widget", "size: int")
+    assert watcher.poll() == {"watch_a"}
+    assert watcher.refresh({"watch_a"}) == {out / "ab.ts": True}
+    assert "size: number" in (out / "ab.ts").read_text()
+    assert watcher.worlds["c"] is world_c  # not rebuilt
+    # The reloaded importer refers to the reloaded type
+    assert sys.modules["watch_b"].Widget is sys.modules["watch_a"].Widget
+    assert fragment_cache.hits == hits + 1  # the unchanged enum was not re-rendered
+
+
+def test_run(watcher):
+    watcher.build()
+    refreshed = threading.Event()
+    failed = threading.Event()
+    stop = threading.Event()
+    results = []
+    errors = []
+
+    def on_refresh(written, duration):
+        results.append(written)
+        refreshed.set()
+
+    def on_error(exc):
+        errors.append(exc)
+        failed.set()
+
+    thread = threading.Thread(
+        target=watcher.run,
+        kwargs={"interval": 0.01, "on_refresh": on_refresh, "on_error": on_error, "stop": stop},
+    )
+    thread.start()
+    try:
+        path = watcher.root / "src" / "watch_c.py"
+        source = path.read_text()
+        path.write_text("class Gadget(\n")
+        assert failed.wait(5)
+        assert isinstance(errors[0], SyntaxError)
+        path.write_text(source)
+        add_field(watcher, "watch_b", "Box", "label: str")
+        assert refreshed.wait(5)
+    finally:
+        stop.set()
+        thread.join()
+    assert "label: string" in (watcher.root / "out" / "ab.ts").read_text()
+
+
+PACKAGE_PYPROJECT = """
+    [tool.typtyp]
+    python_path = ["src"]
+
+    [tool.typtyp.worlds.pkg]
+    packages = ["watch_pkg"]
+    output = "out/pkg.ts"
+"""
+
+
+def test_new_package_module(tmp_path, monkeypatch):
+    package_dir = tmp_path / "src" / "watch_pkg"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "one.py").write_text(textwrap.dedent(FILES["watch_c.py"]))
+    (tmp_path / "pyproject.toml").write_text(textwrap.dedent(PACKAGE_PYPROJECT))
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    try:
+        watcher = Watcher(load_config(tmp_path / "pyproject.toml"))
+        watcher.build()
+        assert watcher.poll() == set()
+        (package_dir / "sub").mkdir()
+        (package_dir / "sub" / "__init__.py").write_text("")
+        (package_dir / "sub" / "two.py").write_text(textwrap.dedent(FILES["watch_c.py"]).replace("Gadget", "Gizmo"))
+        assert watcher.poll() == {"watch_pkg.sub", "watch_pkg.sub.two"}
+        assert watcher.poll() == set()
+        assert watcher.refresh({"watch_pkg.sub", "watch_pkg.sub.two"}) == {tmp_path / "out" / "pkg.ts": True}
+        assert "interface Gizmo" in (tmp_path / "out" / "pkg.ts").read_text()
+    finally:
+        for name in [name for name in sys.modules if name.startswith("watch_pkg")]:
+            del sys.modules[name]